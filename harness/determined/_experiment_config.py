@@ -20,6 +20,9 @@ class ExperimentConfig(dict):
     def averaging_training_metrics_enabled(self) -> bool:
         return bool(self["optimizations"]["average_training_metrics"])
 
+    def async_checkpoint_uploads(self) -> int:
+        return int(self.get("optimizations", {}).get("async_checkpoint_uploads") or 0)
+
     def slots_per_trial(self) -> int:
         return int(self["resources"]["slots_per_trial"])
 
@@ -35,6 +38,9 @@ class ExperimentConfig(dict):
 
         return self["profiling"]["begin_on_batch"], self["profiling"].get("end_after_batch", None)
 
+    def profiling_output_dir(self) -> Optional[str]:
+        return cast(Optional[str], self.get("profiling", {}).get("output_dir"))
+
     def get_data_layer_type(self) -> str:
         return cast(str, self["data_layer"]["type"])
 
@@ -3,7 +3,7 @@ import logging
 import shutil
 import socket
 import tempfile
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, cast
 
 import determined as det
 from determined import constants, horovod, ipc
@@ -373,6 +373,38 @@ class DistributedContext:
             self._local_worker_zmq = ipc.ZMQBroadcastClient(pub_url, pull_url)
             self._local_worker_zmq.safe_start()
 
+        if self._info.cross_size < 2:
+            # No cross-machine broadcasting necessary.
+            return
+
+        # Cross-machine broadcast server, connecting the chief to the local chief of every other
+        # machine, for hierarchical gathers.
+        cross_pub_port = constants.CROSS_MACHINE_COMM_PORT_1 + self._unique_port_offset
+        cross_pull_port = constants.CROSS_MACHINE_COMM_PORT_2 + self._unique_port_offset
+        if self._is_chief:
+            logging.debug(
+                f"Chief setting up cross-machine server with ports "
+                f"{cross_pub_port}/{cross_pull_port}."
+            )
+            self._cross_chief_zmq = ipc.ZMQBroadcastServer(
+                num_connections=self._info.cross_size - 1,
+                pub_url=f"tcp://*:{cross_pub_port}",
+                pull_url=f"tcp://*:{cross_pull_port}",
+            )
+            self._cross_chief_zmq.safe_start(lambda: None)
+
+        elif self._is_local_chief:
+            chief_ip_address = self._rendezvous_info.get_ip_addresses()[0]
+            logging.debug(
+                f"Local Chief {self._info.rank} setting up cross-machine comm to "
+                f"{chief_ip_address} w/ ports {cross_pub_port}/{cross_pull_port}."
+            )
+            self._cross_worker_zmq = ipc.ZMQBroadcastClient(
+                srv_pub_url=f"tcp://{chief_ip_address}:{cross_pub_port}",
+                srv_pull_url=f"tcp://{chief_ip_address}:{cross_pull_port}",
+            )
+            self._cross_worker_zmq.safe_start()
+
     def close(self) -> None:
         # if statements in close() mirror the if statements of _init_ipc().
         if self._info.size < 2:
@@ -396,6 +428,15 @@ class DistributedContext:
         else:
             self._local_worker_zmq.close()
 
+        if self._info.cross_size < 2:
+            return
+
+        # Cross-machine broadcast server.
+        if self._is_chief:
+            self._cross_chief_zmq.close()
+        elif self._is_local_chief:
+            self._cross_worker_zmq.close()
+
     def get_rank(self) -> int:
         """
         Return the rank of the process in the trial. The rank of a process is a
@@ -466,6 +507,56 @@ class DistributedContext:
         logging.debug(f"Worker {self.get_rank()} finished zmq gather local.")
         return out
 
+    def _zmq_gather_hierarchical(
+        self, stuff: Any, reduce_fn: Optional[Callable[[List], Any]] = None
+    ) -> Optional[Any]:
+        """
+        Gather stuff to the chief in two levels: first to the local chief of each machine, then
+        from the local chiefs to the chief, so that the chief only receives one message per
+        machine.
+
+        Without reduce_fn, the chief returns a list of all stuff, like _zmq_gather(). Otherwise,
+        each local chief applies reduce_fn to the list gathered on its machine, and the chief
+        returns reduce_fn applied to the list of per-machine results, so reduce_fn must accept a
+        list of its own outputs. Workers return None.
+        """
+        if self._info.cross_size < 2 or self._info.local_size < 2:
+            gathered = self._zmq_gather(stuff)
+            if gathered is None or reduce_fn is None:
+                return gathered
+            return reduce_fn(gathered)
+
+        local_stuff = self._zmq_gather_local(stuff)
+        if not self._is_local_chief:
+            return None
+        local_stuff = cast(List, local_stuff)
+        machine_result = local_stuff if reduce_fn is None else reduce_fn(local_stuff)
+
+        logging.debug(f"Worker {self.get_rank()} beginning zmq cross-machine gather.")
+        if self._is_chief:
+            other_results, _ = self._cross_chief_zmq.gather_with_polling(lambda: None)
+            self._cross_chief_zmq.broadcast(None)
+            all_results = [machine_result, *other_results]
+            if reduce_fn is None:
+                out = [x for result in all_results for x in result]  # type: Optional[Any]
+            else:
+                out = reduce_fn(all_results)
+        else:
+            self._cross_worker_zmq.send(machine_result)
+            # Synchronize with the chief, as in _zmq_gather().
+            _ = self._cross_worker_zmq.recv()
+            out = None
+        logging.debug(f"Worker {self.get_rank()} finished zmq cross-machine gather.")
+        return out
+
+    def _zmq_allgather_hierarchical(
+        self, stuff: Any, reduce_fn: Optional[Callable[[List], Any]] = None
+    ) -> Any:
+        """
+        Like _zmq_gather_hierarchical(), except that every worker gets the chief's result.
+        """
+        return self._zmq_broadcast(self._zmq_gather_hierarchical(stuff, reduce_fn))
+
     def _zmq_allgather(self, stuff: Any) -> List:
         """
         Gather stuff to the chief and broadcast all of it back to the workers.
@@ -1,18 +1 @@
-from . import (
-    agent,
-    checkpoint,
-    cli,
-    command,
-    experiment,
-    master,
-    model,
-    notebook,
-    remote,
-    render,
-    resources,
-    shell,
-    template,
-    tensorboard,
-    trial,
-    user,
-)
+# Subcommand modules are imported on demand by determined.cli.cli, to keep CLI startup fast.
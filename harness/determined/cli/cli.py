@@ -7,28 +7,12 @@ from typing import Any, Dict, List, Union, cast
 
 import argcomplete
 import argcomplete.completers
-import OpenSSL
 import requests
 import tabulate
 from termcolor import colored
 
 import determined
-import determined.cli
-from determined.cli import checkpoint, experiment, render
-from determined.cli.agent import args_description as agent_args_description
-from determined.cli.master import args_description as master_args_description
-from determined.cli.model import args_description as model_args_description
-from determined.cli.notebook import args_description as notebook_args_description
-from determined.cli.oauth import args_description as oauth_args_description
-from determined.cli.remote import args_description as remote_args_description
-from determined.cli.resources import args_description as resources_args_description
-from determined.cli.shell import args_description as shell_args_description
-from determined.cli.sso import args_description as auth_args_description
-from determined.cli.template import args_description as template_args_description
-from determined.cli.tensorboard import args_description as tensorboard_args_description
-from determined.cli.trial import args_description as trial_args_description
-from determined.cli.user import args_description as user_args_description
-from determined.cli.version import args_description as version_args_description
+from determined.cli import render
 from determined.cli.version import check_version
 from determined.common import api, yaml
 from determined.common.api import authentication, certs
@@ -40,8 +24,6 @@ from determined.common.util import (
     get_default_master_address,
     safe_load_yaml_with_exceptions,
 )
-from determined.deploy.cli import DEPLOY_CMD_NAME
-from determined.deploy.cli import args_description as deploy_args_description
 
 from .errors import EnterpriseOnlyError
 
@@ -141,6 +123,11 @@ def preview_search(args: Namespace) -> None:
     print(tabulate.tabulate(values, headers, tablefmt="presto"), flush=False)
 
 
+# Commands described by other modules are only imported when they are used, so that the CLI starts
+# quickly, e.g. for shell completion. Their names and help strings are repeated here to build the
+# top-level parser.
+deploy_cmd = Cmd("d|eploy", None, "manage deployments", "determined.deploy.cli")
+
 # fmt: off
 
 args_description = [
@@ -154,9 +141,24 @@ args_description = [
         action="version", help="print CLI version and exit",
         version="%(prog)s {}".format(determined.__version__)),
 
-    experiment.args_description,
-
-    checkpoint.args_description,
+    Cmd("a|gent", None, "manage agents", "determined.cli.agent"),
+    Cmd("s|lot", None, "manage slots", "determined.cli.agent"),
+    Cmd("auth", None, "manage auth", "determined.cli.sso"),
+    Cmd("c|heckpoint", None, "manage checkpoints", "determined.cli.checkpoint"),
+    Cmd("command cmd", None, "manage commands", "determined.cli.remote"),
+    Cmd("e|xperiment", None, "manage experiments", "determined.cli.experiment"),
+    Cmd("ma|ster", None, "manage master", "determined.cli.master"),
+    Cmd("m|odel", None, "manage models", "determined.cli.model"),
+    Cmd("notebook", None, "manage notebooks", "determined.cli.notebook"),
+    Cmd("oauth", None, "manage OAuth", "determined.cli.oauth"),
+    Cmd("profiler", None, "inspect profiling data", "determined.cli.profiler"),
+    Cmd("res|ources", None, "query historical resource allocation", "determined.cli.resources"),
+    Cmd("shell", None, "manage shells", "determined.cli.shell"),
+    Cmd("template tpl", None, "manage config templates", "determined.cli.template"),
+    Cmd("tensorboard", None, "manage TensorBoard instances", "determined.cli.tensorboard"),
+    Cmd("t|rial", None, "manage trials", "determined.cli.trial"),
+    Cmd("u|ser", None, "manage users", "determined.cli.user"),
+    Cmd("version", None, "show version information", "determined.cli.version"),
 
     Cmd("task", None, "manage tasks (commands, experiments, notebooks, shells, tensorboards)", [
         Cmd("list", list_tasks, "list tasks in cluster", [
@@ -169,36 +171,17 @@ args_description = [
             help="experiment config file (.yaml)")
     ]),
 
-    deploy_args_description,
+    deploy_cmd,
 ]  # type: List[object]
 
 # fmt: on
 
 
-all_args_description = (
-    args_description
-    + master_args_description
-    + model_args_description
-    + agent_args_description
-    + notebook_args_description
-    + resources_args_description
-    + shell_args_description
-    + template_args_description
-    + tensorboard_args_description
-    + trial_args_description
-    + remote_args_description
-    + user_args_description
-    + version_args_description
-    + auth_args_description
-    + oauth_args_description
-)
-
-
 def make_parser() -> ArgumentParser:
     parser = ArgumentParser(
         description="Determined command-line client", formatter_class=ArgumentDefaultsHelpFormatter
     )
-    add_args(parser, all_args_description)
+    add_args(parser, args_description)
     return parser
 
 
@@ -227,7 +210,7 @@ def main(args: List[str] = sys.argv[1:]) -> None:
 
         try:
             # For `det deploy`, skip interaction with master.
-            if v.get("_command") == DEPLOY_CMD_NAME:
+            if v.get("_command") == deploy_cmd.name:
                 parsed_args.func(parsed_args)
                 return
 
@@ -241,6 +224,8 @@ def main(args: List[str] = sys.argv[1:]) -> None:
                 addr = api.parse_master_address(parsed_args.master)
                 check_not_none(addr.hostname)
                 check_not_none(addr.port)
+                import OpenSSL
+
                 try:
                     ctx = OpenSSL.SSL.Context(OpenSSL.SSL.TLSv1_2_METHOD)
                     conn = OpenSSL.SSL.Connection(ctx, socket.socket())
@@ -124,7 +124,9 @@ def _parse_config_file_or_exit(config_file: io.FileIO) -> Dict:
 @authentication.required
 def submit_experiment(args: Namespace) -> None:
     experiment_config = _parse_config_file_or_exit(args.config_file)
-    model_context = context.Context.from_local(args.model_def, constants.MAX_CONTEXT_SIZE)
+    model_context = context.ArchiveContext(
+        args.model_def, constants.MAX_CONTEXT_SIZE, digest_cache=context.DigestCache()
+    )
 
     additional_body_fields = {}
     if args.git:
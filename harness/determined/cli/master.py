@@ -55,7 +55,7 @@ def logs(args: Namespace) -> None:
 # fmt: off
 
 args_description = [
-    Cmd("m|aster", None, "manage master", [
+    Cmd("ma|ster", None, "manage master", [
         Cmd("config", config, "fetch master config as JSON", []),
         Cmd("logs", logs, "fetch master logs", [
             Arg("-f", "--follow", action="store_true",
@@ -0,0 +1,92 @@
+from argparse import Namespace
+from typing import Any, List
+
+import numpy as np
+
+from determined import profiler
+from determined.cli import render
+from determined.common.api import TrialProfilerMetricsColumns
+from determined.common.declarative_argparse import Arg, Cmd
+
+
+def read_files(paths: List[str]) -> List[TrialProfilerMetricsColumns]:
+    series = []  # type: List[TrialProfilerMetricsColumns]
+    for path in paths:
+        series.extend(profiler.read_profiler_file(path))
+    return series
+
+
+def summarize(args: Namespace) -> None:
+    series = read_files(args.files)
+
+    timings = profiler.timing_breakdown(series)
+    headers = ["Timing", "Count", "Total (s)", "Mean (ms)", "p50 (ms)", "p95 (ms)", "Max (ms)", "%"]
+    values = [
+        [
+            row["name"],
+            row["count"],
+            round(row["total_s"], 3),
+            round(row["mean_ms"], 3),
+            round(row["p50_ms"], 3),
+            round(row["p95_ms"], 3),
+            round(row["max_ms"], 3),
+            round(row["percent"], 1),
+        ]
+        for row in timings
+    ]
+    render.tabulate_or_csv(headers, values, args.csv)
+
+    metrics = [s for s in series if s.labels.get("metricType") != profiler.MetricType.TIMING.value]
+    if not metrics:
+        return
+    if not args.csv:
+        print()
+    headers = ["Metric", "GPU", "Count", "Mean", "Min", "Max"]
+    values = [
+        [
+            s.labels["name"],
+            s.labels.get("gpuUuid") or "",
+            len(s.values),
+            round(float(np.mean(s.values)), 3),
+            round(float(np.min(s.values)), 3),
+            round(float(np.max(s.values)), 3),
+        ]
+        for s in sorted(metrics, key=lambda s: (s.labels["name"], s.labels.get("gpuUuid") or ""))
+        if len(s.values)
+    ]
+    render.tabulate_or_csv(headers, values, args.csv)
+
+
+def report(args: Namespace) -> None:
+    bottleneck_report = profiler.bottleneck_report(read_files(args.files))
+    if bottleneck_report is None:
+        print("No timings were found; the report needs the timings of a PyTorchTrial.")
+        return
+    print(bottleneck_report)
+
+
+args_description = [
+    Cmd(
+        "profiler",
+        None,
+        "inspect profiling data",
+        [
+            Cmd(
+                "summarize",
+                summarize,
+                "summarize profiler files written with profiling.output_dir",
+                [
+                    Arg("files", nargs="+", help="profiler files (*.detprof) to summarize"),
+                    Arg("--csv", action="store_true", help="print as CSV"),
+                ],
+            ),
+            Cmd(
+                "report",
+                report,
+                "classify the bottleneck of a trial from profiler files written with "
+                "profiling.output_dir and suggest how to relieve it",
+                [Arg("files", nargs="+", help="profiler files (*.detprof) to analyze")],
+            ),
+        ],
+    )
+]  # type: List[Any]
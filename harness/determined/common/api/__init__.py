@@ -29,6 +29,8 @@ from determined.common.api.request import (
 )
 from determined.common.api.profiler import (
     post_trial_profiler_metrics_batches,
+    post_trial_profiler_metrics_columns,
     TrialProfilerMetricsBatch,
+    TrialProfilerMetricsColumns,
     get_trial_profiler_available_series,
 )
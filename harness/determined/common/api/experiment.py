@@ -4,13 +4,14 @@ import random
 import sys
 import time
 import uuid
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Union
 from urllib.parse import urlencode
 
 import simplejson
 from termcolor import colored
 
 from determined.common import api, constants, context, yaml
+from determined.common.api import errors
 from determined.common.api import request as req
 
 
@@ -204,10 +205,38 @@ def follow_test_experiment_logs(master_url: str, exp_id: int) -> None:
             time.sleep(0.2)
 
 
+def upload_model_definition(
+    master_url: str, model_context: context.ArchiveContext, check_exists: bool = True
+) -> bool:
+    """
+    Stream a model definition to the master as a gzipped tarball, unless check_exists is set and
+    the master already has a model definition with the same content hash. Returns False if the
+    master does not support model definition uploads.
+    """
+    path = "model_definitions/{}".format(model_context.content_hash)
+    if check_exists:
+        try:
+            req.do_request("HEAD", master_url, path)
+            return True
+        except errors.NotFoundException:
+            pass
+
+    try:
+        req.put(
+            master_url,
+            path,
+            data=model_context.chunks(),
+            headers={"Content-Type": "application/gzip"},
+        )
+    except errors.NotFoundException:
+        return False
+    return True
+
+
 def create_experiment(
     master_url: str,
     config: Dict[str, Any],
-    model_context: context.Context,
+    model_context: Union[context.Context, context.ArchiveContext],
     template: Optional[str] = None,
     validate_only: bool = False,
     archived: bool = False,
@@ -216,9 +245,18 @@ def create_experiment(
 ) -> int:
     body = {
         "experiment_config": yaml.safe_dump(config),
-        "model_definition": [e.dict() for e in model_context.entries],
         "validate_only": validate_only,
-    }
+    }  # type: Dict[str, Any]
+    uploaded = None  # type: Optional[context.ArchiveContext]
+    if isinstance(model_context, context.ArchiveContext):
+        if upload_model_definition(master_url, model_context):
+            body["model_definition_hash"] = model_context.content_hash
+            uploaded = model_context
+        else:
+            # Older masters only accept the model definition in the request body.
+            model_context = context.Context.from_local(model_context.root_path)
+    if isinstance(model_context, context.Context):
+        body["model_definition"] = [e.dict() for e in model_context.entries]
     if template:
         body["template"] = template
     if archived:
@@ -226,7 +264,15 @@ def create_experiment(
     if additional_body_fields:
         body.update(additional_body_fields)
 
-    r = req.post(master_url, "experiments", body=body)
+    try:
+        r = req.post(master_url, "experiments", body=body)
+    except errors.NotFoundException:
+        if uploaded is None:
+            raise
+        # The master only keeps uploaded model definitions in memory, and may have evicted this one
+        # since it was uploaded or found; upload it again and retry once.
+        upload_model_definition(master_url, uploaded, check_exists=False)
+        r = req.post(master_url, "experiments", body=body)
     if not hasattr(r, "headers"):
         raise Exception(r)
 
@@ -316,7 +362,7 @@ def make_test_experiment_config(config: Dict[str, Any]) -> Dict[str, Any]:
 def create_experiment_and_follow_logs(
     master_url: str,
     config: Dict[str, Any],
-    model_context: context.Context,
+    model_context: Union[context.Context, context.ArchiveContext],
     template: Optional[str] = None,
     additional_body_fields: Optional[Dict[str, Any]] = None,
     activate: bool = True,
@@ -339,7 +385,7 @@ def create_experiment_and_follow_logs(
 def create_test_experiment_and_follow_logs(
     master_url: str,
     config: Dict[str, Any],
-    model_context: context.Context,
+    model_context: Union[context.Context, context.ArchiveContext],
     template: Optional[str] = None,
     additional_body_fields: Optional[Dict[str, Any]] = None,
 ) -> int:
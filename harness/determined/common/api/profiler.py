@@ -1,6 +1,10 @@
+import base64
+import gzip
 from typing import Any, Dict, List, Optional
 
 import backoff
+import numpy as np
+import simplejson
 from requests.exceptions import RequestException
 
 from determined.common import api
@@ -48,6 +52,77 @@ def post_trial_profiler_metrics_batches(
     )
 
 
+class TrialProfilerMetricsColumns:
+    """
+    TrialProfilerMetricsColumns is one series of trial profiler metrics held as parallel arrays:
+    timestamps in nanoseconds since the epoch, batch indices and values.
+    """
+
+    def __init__(
+        self,
+        timestamps_ns: np.ndarray,
+        batches: np.ndarray,
+        values: np.ndarray,
+        labels: Dict[str, Any],
+    ):
+        self.timestamps_ns = timestamps_ns
+        self.batches = batches
+        self.values = values
+        self.labels = labels
+
+
+def _b64(array: np.ndarray, dtype: str) -> str:
+    return base64.b64encode(array.astype(dtype, copy=False).tobytes()).decode("ascii")
+
+
+def encode_trial_profiler_metrics_columns(series: List[TrialProfilerMetricsColumns]) -> bytes:
+    """
+    Encode series in the columnar format accepted by POST /trial_profiler_metrics. Each series
+    carries a base timestamp and the little-endian int64 deltas of its timestamps (the first
+    delta is relative to the base), little-endian int32 batch indices and little-endian float32
+    values, with every column base64-encoded.
+    """
+    encoded = []
+    for s in series:
+        timestamps_ns = np.asarray(s.timestamps_ns, dtype=np.int64)
+        base = int(timestamps_ns[0]) if len(timestamps_ns) else 0
+        encoded.append(
+            {
+                "labels": s.labels,
+                "timestamp_base": base,
+                "timestamp_deltas": _b64(np.diff(timestamps_ns, prepend=base), "<i8"),
+                "batches": _b64(np.asarray(s.batches), "<i4"),
+                "values": _b64(np.asarray(s.values), "<f4"),
+            }
+        )
+    return simplejson.dumps(encoded).encode("utf-8")
+
+
+@backoff.on_exception(  # type: ignore
+    backoff.constant,
+    RequestException,
+    max_tries=2,
+    giveup=lambda e: e.response is not None and e.response.status_code < 500,
+)
+def post_trial_profiler_metrics_columns(
+    master_url: str,
+    series: List[TrialProfilerMetricsColumns],
+    compress: bool = True,
+) -> None:
+    """
+    Post every series of a flush to the master in a single request, using the columnar encoding
+    of encode_trial_profiler_metrics_columns(), optionally gzip-compressed. Masters that predate
+    this endpoint respond with 404; callers should fall back to
+    post_trial_profiler_metrics_batches().
+    """
+    data = encode_trial_profiler_metrics_columns(series)
+    headers = {"Content-Type": "application/json"}
+    if compress:
+        data = gzip.compress(data)
+        headers["Content-Encoding"] = "gzip"
+    api.post(master_url, "/trial_profiler_metrics", headers=headers, data=data)
+
+
 class TrialProfilerSeriesLabels:
     def __init__(self, trial_id: int, name: str, agent_id: str, gpu_uuid: str, metric_type: str):
         self.trial_id = str(trial_id)
@@ -1,6 +1,6 @@
 import webbrowser
 from types import TracebackType
-from typing import Any, Dict, Iterator, Optional
+from typing import Any, Dict, Iterable, Iterator, Optional, Union
 from urllib import parse
 
 import lomond
@@ -70,6 +70,7 @@ def do_request(
     auth: Optional[authentication.Authentication] = None,
     cert: Optional[certs.Cert] = None,
     stream: bool = False,
+    data: Optional[Union[bytes, Iterable[bytes]]] = None,
 ) -> requests.Response:
     # If no explicit Authentication object was provided, use the cli's singleton Authentication.
     if auth is None:
@@ -94,6 +95,7 @@ def do_request(
             make_url(host, path),
             params=params,
             json=body,
+            data=data,
             headers=h,
             verify=cert.bundle if cert else None,
             stream=stream,
@@ -177,9 +179,11 @@ def post(
     authenticated: bool = True,
     auth: Optional[authentication.Authentication] = None,
     cert: Optional[certs.Cert] = None,
+    data: Optional[bytes] = None,
 ) -> requests.Response:
     """
-    Send a POST request to the remote API.
+    Send a POST request to the remote API. The request body is either `body`, serialized as JSON,
+    or the raw bytes in `data`.
     """
     return do_request(
         "POST",
@@ -190,6 +194,7 @@ def post(
         authenticated=authenticated,
         auth=auth,
         cert=cert,
+        data=data,
     )
 
 
@@ -225,9 +230,11 @@ def put(
     authenticated: bool = True,
     auth: Optional[authentication.Authentication] = None,
     cert: Optional[certs.Cert] = None,
+    data: Optional[Union[bytes, Iterable[bytes]]] = None,
 ) -> requests.Response:
     """
-    Send a PUT request to the remote API.
+    Send a PUT request to the remote API. The request body is either `body`, serialized as JSON,
+    or the raw bytes in `data`; an iterable of chunks is streamed with chunked transfer encoding.
     """
     return do_request(
         "PUT",
@@ -238,6 +245,7 @@ def put(
         authenticated=authenticated,
         auth=auth,
         cert=cert,
+        data=data,
     )
 
 
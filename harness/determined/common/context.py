@@ -1,13 +1,19 @@
 import base64
 import collections
+import hashlib
+import json
 import os
 import pathlib
+import stat
 import tarfile
-from typing import Any, Dict, List, Optional, Tuple
+import time
+import zlib
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
+import filelock
 import pathspec
 
-from determined.common import check, constants
+from determined.common import check, constants, util
 from determined.common.util import sizeof_fmt
 
 
@@ -107,87 +113,323 @@ class Context:
         """
 
         context = Context()
-        local_path = local_path.resolve()
-
-        if not local_path.exists():
-            raise Exception("Path '{}' doesn't exist".format(local_path))
-
-        if local_path.is_file():
-            raise ValueError("Path '{}' must be a directory".format(local_path))
-
-        root_path = local_path
-
-        ignore = list(constants.DEFAULT_DETIGNORE)
-        ignore_path = root_path.joinpath(".detignore")
-        if ignore_path.is_file():
-            with ignore_path.open("r") as detignore_file:
-                ignore.extend(detignore_file)
-        ignore_spec = pathspec.PathSpec.from_lines(pathspec.patterns.GitWildMatchPattern, ignore)
+        root_path = _resolve_context_dir(local_path)
 
         msg = "Preparing files (in {}) to send to master... {} and {} files".format(
             root_path, sizeof_fmt(0), 0
         )
         print(msg, end="\r", flush=True)
 
-        # We could use pathlib.Path.rglob for scanning the directory;
-        # however, the Python documentation claims a warning that rglob may be
-        # inefficient on large directory trees, so we use the older os.walk().
-        for parent, dirs, files in os.walk(str(root_path)):
-            for directory in dirs:
-                dir_path = pathlib.Path(parent).joinpath(directory)
-                dir_rel_path = dir_path.relative_to(root_path)
-
-                # If the file matches any path specified in .detignore, then ignore it.
-                if ignore_spec.match_file(str(dir_rel_path) + "/"):
-                    continue
-
-                # Determined only supports POSIX-style file paths.  Use as_posix() in case this code
-                # is executed in a non-POSIX environment.
-                entry_path = dir_rel_path.as_posix()
-
-                context.add_item(ContextItem.from_local_dir(entry_path, dir_path))
-
-            for file in files:
-                file_path = pathlib.Path(parent).joinpath(file)
-                file_rel_path = file_path.relative_to(root_path)
-
-                # If the file is the .detignore file or matches one of the
-                # paths specified in .detignore, then ignore it.
-                if file_rel_path.name == ".detignore":
-                    continue
-                if ignore_spec.match_file(str(file_rel_path)):
-                    continue
-
-                # Determined only supports POSIX-style file paths.  Use as_posix() in case this code
-                # is executed in a non-POSIX environment.
-                entry_path = file_rel_path.as_posix()
-
-                try:
-                    entry = ContextItem.from_local_file(entry_path, file_path)
-                except OSError:
-                    print("Error reading '{}', skipping this file.".format(entry_path))
-                    continue
-
-                context.add_item(entry)
-                if context.size > limit:
-                    print()
-                    raise ValueError(
-                        "Directory '{}' exceeds the maximum allowed size {}.\n"
-                        "Consider using a .detignore file to specify that certain files "
-                        "or directories should be omitted from the model.".format(
-                            root_path, sizeof_fmt(constants.MAX_CONTEXT_SIZE)
-                        )
-                    )
-
-                print(" " * len(msg), end="\r")
-                msg = "Preparing files ({}) to send to master... {} and {} files".format(
-                    root_path, sizeof_fmt(context.size), len(context)
-                )
-                print(msg, end="\r", flush=True)
+        for entry_path, path, is_dir in _walk_context_dir(root_path):
+            if is_dir:
+                context.add_item(ContextItem.from_local_dir(entry_path, path))
+                continue
+
+            try:
+                entry = ContextItem.from_local_file(entry_path, path)
+            except OSError:
+                print("Error reading '{}', skipping this file.".format(entry_path))
+                continue
+
+            context.add_item(entry)
+            if context.size > limit:
+                print()
+                raise ValueError(_context_too_large_message(root_path))
+
+            print(" " * len(msg), end="\r")
+            msg = "Preparing files ({}) to send to master... {} and {} files".format(
+                root_path, sizeof_fmt(context.size), len(context)
+            )
+            print(msg, end="\r", flush=True)
         print()
         return context
 
 
+class ArchiveContext:
+    """
+    ArchiveContext is a context directory which is sent to the master as a gzipped tar stream
+    instead of as base64-encoded file contents in a JSON body, so that the contents of the
+    directory are never held in memory all at once.
+
+    The constructor walks the directory, applying .detignore just like Context.from_local(), and
+    computes content_hash, which the master uses to skip uploads of a context that it already has.
+    content_hash is the SHA-256 of a manifest with one record per entry of the tarball: its path,
+    type, mode, modification time, size and the SHA-256 of its content. With a DigestCache, the
+    digests of files which did not change since an earlier ArchiveContext are not computed again,
+    so files are only read to hash them if they changed. chunks() reads the files and yields the
+    compressed stream.
+    """
+
+    def __init__(
+        self,
+        local_path: pathlib.Path,
+        limit: int = constants.MAX_CONTEXT_SIZE,
+        digest_cache: Optional["DigestCache"] = None,
+    ) -> None:
+        self.root_path = _resolve_context_dir(local_path)
+        self._members = []  # type: List[Tuple[tarfile.TarInfo, pathlib.Path]]
+        self._size = 0
+
+        content_hash = hashlib.sha256()
+        for entry_path, path, is_dir in _walk_context_dir(self.root_path):
+            try:
+                st = path.stat()
+                info = _make_tar_info(entry_path, st, is_dir)
+                if is_dir:
+                    digest = _EMPTY_DIGEST
+                elif digest_cache is not None:
+                    digest = digest_cache.digest(path, st)
+                else:
+                    digest = _file_digest(path)
+            except OSError:
+                print("Error reading '{}', skipping this file.".format(entry_path))
+                continue
+            self._members.append((info, path))
+            content_hash.update(_manifest_record(info, digest))
+            self._size += info.size
+            if self._size > limit:
+                raise ValueError(_context_too_large_message(self.root_path))
+        self.content_hash = content_hash.hexdigest()
+
+        if digest_cache is not None:
+            digest_cache.save()
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+    @property
+    def size(self) -> int:
+        """The total size of the files in the context."""
+        return self._size
+
+    def _tar_chunks(self) -> Iterator[bytes]:
+        """Yield the uncompressed tar stream of the context in chunks of at most _CHUNK_SIZE."""
+        for info, path in self._members:
+            yield info.tobuf(tarfile.PAX_FORMAT, "utf-8", "surrogateescape")
+            if not info.isreg():
+                continue
+            remaining = info.size
+            with path.open("rb") as f:
+                while remaining:
+                    chunk = f.read(min(remaining, _CHUNK_SIZE))
+                    if not chunk:
+                        raise OSError("'{}' changed while it was being read".format(info.name))
+                    remaining -= len(chunk)
+                    yield chunk
+            padding = -info.size % tarfile.BLOCKSIZE
+            if padding:
+                yield tarfile.NUL * padding
+        yield tarfile.NUL * (2 * tarfile.BLOCKSIZE)
+
+    def chunks(self) -> Iterator[bytes]:
+        """Yield the gzipped tar stream of the context, in chunks of roughly _CHUNK_SIZE."""
+        # wbits=31 writes a gzip header with no file name or modification time.
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+        buf = bytearray()
+        for chunk in self._tar_chunks():
+            buf += compressor.compress(chunk)
+            if len(buf) >= _CHUNK_SIZE:
+                yield bytes(buf)
+                buf.clear()
+        buf += compressor.flush()
+        yield bytes(buf)
+
+
+# The size of the chunks in which ArchiveContext reads files and yields its tar stream.
+_CHUNK_SIZE = 1024 * 1024
+
+_EMPTY_DIGEST = hashlib.sha256().hexdigest()
+
+
+class DigestCache:
+    """
+    DigestCache remembers the SHA-256 digests of files by their absolute path, size and
+    modification time, so that ArchiveContext doesn't read files again which did not change since
+    the last time a context was made from them, such as when the same model directory is submitted
+    for every experiment of a hyperparameter sweep.
+
+    The digests are stored in a JSON file, by default under the config directory. Like the token
+    store, all updates to the file follow a read-modify-write pattern under a file lock. Only the
+    max_entries most recently used digests are kept. If the file can't be read or written, e.g. in
+    a read-only home directory, every digest is computed as if there were no cache.
+    """
+
+    def __init__(self, path: Optional[pathlib.Path] = None, max_entries: int = 20000) -> None:
+        check.check_gt(max_entries, 0, "max_entries must be greater than 0")
+        self.path = path or util.get_config_path().joinpath("context_digests.json")
+        self.temp = pathlib.Path(str(self.path) + ".temp")
+        self.lock = pathlib.Path(str(self.path) + ".lock")
+        self.max_entries = max_entries
+        self._updated = {}  # type: Dict[str, List[Any]]
+
+        try:
+            self.path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+            with filelock.FileLock(str(self.lock)):
+                self._entries = self._load()
+            self._enabled = True
+        except OSError:
+            self._entries = {}
+            self._enabled = False
+
+    def _load(self) -> Dict[str, List[Any]]:
+        try:
+            with self.path.open() as f:
+                store = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        # The cache only saves work; discard it if it is from another version or corrupt.
+        if not isinstance(store, dict) or store.get("version") != 1:
+            return {}
+        entries = store.get("files")
+        if not isinstance(entries, dict):
+            return {}
+        return {k: v for k, v in entries.items() if _valid_digest_entry(v)}
+
+    def digest(self, path: pathlib.Path, st: os.stat_result) -> str:
+        """Return the SHA-256 digest of the file at path, whose stat() result is st."""
+        key = str(path.resolve())
+        now = int(time.time())
+        entry = self._entries.get(key)
+        if entry is not None and entry[:2] == [st.st_size, st.st_mtime_ns]:
+            digest = entry[2]  # type: str
+        else:
+            digest = _file_digest(path)
+            # A file modified within the resolution of its modification time may be modified again
+            # without a new modification time, so its digest can't be trusted later.
+            if st.st_mtime_ns // 10**9 >= now - _MTIME_RESOLUTION:
+                return digest
+        self._updated[key] = [st.st_size, st.st_mtime_ns, digest, now]
+        return digest
+
+    def save(self) -> None:
+        """Write the digests that were used or computed since the cache was loaded."""
+        if not self._enabled or not self._updated:
+            return
+        try:
+            with filelock.FileLock(str(self.lock)):
+                entries = self._load()
+                entries.update(self._updated)
+                if len(entries) > self.max_entries:
+                    # Keep the most recently used digests.
+                    keep = sorted(entries, key=lambda k: entries[k][3])[-self.max_entries :]
+                    entries = {k: entries[k] for k in keep}
+                with self.temp.open("w") as f:
+                    json.dump({"version": 1, "files": entries}, f)
+                self.temp.replace(self.path)
+        except OSError:
+            # The cache only saves work; the digests will be computed again next time.
+            return
+        self._entries = entries
+        self._updated = {}
+
+
+def _valid_digest_entry(entry: Any) -> bool:
+    """Whether entry is a [size, mtime_ns, digest, last_used] record of a DigestCache."""
+    return (
+        isinstance(entry, list)
+        and len(entry) == 4
+        and all(isinstance(entry[i], int) for i in (0, 1, 3))
+        and isinstance(entry[2], str)
+    )
+
+
+# The resolution, in seconds, of file modification times on the coarsest common file systems.
+_MTIME_RESOLUTION = 2
+
+
+def _file_digest(path: pathlib.Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _manifest_record(info: tarfile.TarInfo, digest: str) -> bytes:
+    """
+    Return the record of a tarball entry in the manifest which content_hash is computed from. The
+    master computes the same records from the tarball to verify content_hash.
+    """
+    fields = (info.name, info.type.decode(), info.mode, info.mtime, info.size, digest)
+    return "".join("{}\0".format(f) for f in fields).encode("utf-8", "surrogateescape")
+
+
+def _make_tar_info(entry_path: str, st: os.stat_result, is_dir: bool) -> tarfile.TarInfo:
+    info = tarfile.TarInfo(entry_path)
+    info.type = tarfile.DIRTYPE if is_dir else tarfile.REGTYPE
+    info.size = 0 if is_dir else st.st_size
+    info.mode = stat.S_IMODE(st.st_mode)
+    info.mtime = int(st.st_mtime)
+    return info
+
+
+def _resolve_context_dir(local_path: pathlib.Path) -> pathlib.Path:
+    local_path = local_path.resolve()
+
+    if not local_path.exists():
+        raise Exception("Path '{}' doesn't exist".format(local_path))
+
+    if local_path.is_file():
+        raise ValueError("Path '{}' must be a directory".format(local_path))
+
+    return local_path
+
+
+def _walk_context_dir(root_path: pathlib.Path) -> Iterator[Tuple[str, pathlib.Path, bool]]:
+    """
+    Yield (entry path, local path, is directory) for every directory and file in root_path which
+    is not ignored by .detignore, in a deterministic order. Entry paths are POSIX-style paths
+    relative to root_path.
+    """
+    ignore = list(constants.DEFAULT_DETIGNORE)
+    ignore_path = root_path.joinpath(".detignore")
+    if ignore_path.is_file():
+        with ignore_path.open("r") as detignore_file:
+            ignore.extend(detignore_file)
+    ignore_spec = pathspec.PathSpec.from_lines(pathspec.patterns.GitWildMatchPattern, ignore)
+
+    # We could use pathlib.Path.rglob for scanning the directory;
+    # however, the Python documentation claims a warning that rglob may be
+    # inefficient on large directory trees, so we use the older os.walk().
+    for parent, dirs, files in os.walk(str(root_path)):
+        # Sorting dirs in place also makes os.walk() visit them in order.
+        dirs.sort()
+        for directory in dirs:
+            dir_path = pathlib.Path(parent).joinpath(directory)
+            dir_rel_path = dir_path.relative_to(root_path)
+
+            # If the file matches any path specified in .detignore, then ignore it.
+            if ignore_spec.match_file(str(dir_rel_path) + "/"):
+                continue
+
+            # Determined only supports POSIX-style file paths.  Use as_posix() in case this code
+            # is executed in a non-POSIX environment.
+            yield dir_rel_path.as_posix(), dir_path, True
+
+        for file in sorted(files):
+            file_path = pathlib.Path(parent).joinpath(file)
+            file_rel_path = file_path.relative_to(root_path)
+
+            # If the file is the .detignore file or matches one of the
+            # paths specified in .detignore, then ignore it.
+            if file_rel_path.name == ".detignore":
+                continue
+            if ignore_spec.match_file(str(file_rel_path)):
+                continue
+
+            yield file_rel_path.as_posix(), file_path, False
+
+
+def _context_too_large_message(root_path: pathlib.Path) -> str:
+    return (
+        "Directory '{}' exceeds the maximum allowed size {}.\n"
+        "Consider using a .detignore file to specify that certain files "
+        "or directories should be omitted from the model.".format(
+            root_path, sizeof_fmt(constants.MAX_CONTEXT_SIZE)
+        )
+    )
+
+
 def read_context(
     local_path: pathlib.Path,
     limit: int = constants.MAX_CONTEXT_SIZE,
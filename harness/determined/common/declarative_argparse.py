@@ -1,7 +1,9 @@
+import argparse
 import functools
+import importlib
 import itertools
 from argparse import SUPPRESS, ArgumentDefaultsHelpFormatter, ArgumentParser, Namespace
-from typing import Any, Callable, List, NamedTuple, Optional, Tuple, cast
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple, Union, cast
 
 
 def make_prefixes(desc: str) -> List[str]:
@@ -40,13 +42,19 @@ class Cmd:
         name: str,
         func: Optional[Callable],
         help_str: str,
-        subs: List[Any],
+        subs: Union[List[Any], str],
         is_default: bool = False,
     ) -> None:
         """
         `subs` is a list containing `Cmd`, `Arg`, and `Group` that describes
         the arguments, subcommands, and mutually exclusive argument groups
         for this command.
+
+        `subs` may instead be the path of a module whose `args_description`
+        contains the full `Cmd` of the same name. The module is only imported
+        when this command is used, so that parsing other commands does not pay
+        for its imports. Such a `Cmd` must have no `func` and cannot be the
+        default.
         """
         self.name = name
         self.help_str = help_str
@@ -57,6 +65,8 @@ class Cmd:
             self.func.__name__ = help_str
         self.subs = subs
         self.is_default = is_default
+        if isinstance(subs, str) and (func is not None or is_default):
+            raise ValueError(f"Command {name} is loaded from {subs}, so it cannot have a func")
 
 
 class Arg:
@@ -107,6 +117,44 @@ class BoolOptArg(NamedTuple):
     false_help: Optional[str] = None
 
 
+def resolve_cmd(cmd: Cmd) -> Cmd:
+    """Import the full description of a Cmd whose subs are a module path."""
+    if not isinstance(cmd.subs, str):
+        return cmd
+    description = importlib.import_module(cmd.subs).args_description
+    if not isinstance(description, list):
+        description = [description]
+    for thing in description:
+        if isinstance(thing, Cmd) and thing.name == cmd.name:
+            return thing
+    raise ValueError(f"{cmd.subs}.args_description does not describe the command {cmd.name}")
+
+
+class _LazyParserMap(dict):
+    """
+    Maps subcommand names to their parsers. The arguments of a command loaded from a module are
+    only added to its parser when the parser is looked up, which both argparse and argcomplete do
+    right before they use it.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.deferred = {}  # type: Dict[int, Callable[[], None]]
+
+    def __getitem__(self, name: str) -> ArgumentParser:
+        parser = super().__getitem__(name)  # type: ArgumentParser
+        load = self.deferred.pop(id(parser), None)
+        if load is not None:
+            load()
+        return parser
+
+
+class _SubParsersAction(argparse._SubParsersAction):
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._name_parser_map = self.choices = _LazyParserMap()
+
+
 def wrap_func(parser: ArgumentParser, func: Callable) -> Callable:
     @functools.wraps(func)
     def wrapper(args: Namespace) -> Any:
@@ -156,7 +204,7 @@ def add_args(parser: ArgumentParser, description: List[Any], depth: int = 0) ->
         if isinstance(thing, Cmd):
             if subparsers is None:
                 metavar = "sub" * depth + "command"
-                subparsers = parser.add_subparsers(metavar=metavar)
+                subparsers = parser.add_subparsers(metavar=metavar, action=_SubParsersAction)
 
                 # If there are any subcommands at all, also add a `help`
                 # subcommand.
@@ -183,7 +231,12 @@ def add_args(parser: ArgumentParser, description: List[Any], depth: int = 0) ->
                 thing.func = cast(Callable, thing.func)
                 parser.set_defaults(func=wrap_func(subparser, thing.func))
 
-            add_args(subparser, thing.subs, depth + 1)
+            if isinstance(thing.subs, str):
+                cast(_LazyParserMap, subparsers.choices).deferred[
+                    id(subparser)
+                ] = functools.partial(_load_cmd, subparser, thing, depth + 1)
+            else:
+                add_args(subparser, thing.subs, depth + 1)
 
         elif isinstance(thing, Arg):
             arg = parser.add_argument(*thing.args, **thing.kwargs)
@@ -212,3 +265,9 @@ def add_args(parser: ArgumentParser, description: List[Any], depth: int = 0) ->
     # the default print help.
     if subparsers is not None and parser.get_default("func") is None:
         parser.set_defaults(func=help_func(parser))
+
+
+def _load_cmd(parser: ArgumentParser, cmd: Cmd, depth: int) -> None:
+    cmd = resolve_cmd(cmd)
+    parser.set_defaults(func=cmd.func)
+    add_args(parser, cast(List[Any], cmd.subs), depth)
@@ -1,16 +1,28 @@
 """
 A drop-in replacement for requests.request() which supports server name overriding.
+
+Requests are sent through a process-wide pool of sessions, one per (master, server_hostname,
+cert bundle), so that consecutive requests to the same master reuse keep-alive connections instead
+of paying for a new TCP connection and TLS handshake every time.
 """
-from typing import Any, Optional
+import http.cookiejar
+import inspect
+import os
+import threading
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+from urllib import parse
 
 import requests
+from urllib3.util import retry
+
+from determined.common.check import check_gt, check_gt_eq
 
 
 class HTTPAdapter(requests.adapters.HTTPAdapter):
     """A new HTTPAdapter which honors the ServerName as a value for the verify arg."""
 
-    def __init__(self, server_hostname: Optional[str]) -> None:
-        super().__init__()
+    def __init__(self, server_hostname: Optional[str], **kwargs: Any) -> None:
+        super().__init__(**kwargs)
         self.server_hostname = server_hostname
 
     def cert_verify(self, conn: Any, url: Any, verify: Any, cert: Any) -> None:
@@ -21,13 +33,123 @@ class HTTPAdapter(requests.adapters.HTTPAdapter):
 
 
 class Session(requests.sessions.Session):
-    def __init__(self, server_hostname: Optional[str]) -> None:
+    def __init__(self, server_hostname: Optional[str], **adapter_kwargs: Any) -> None:
         super().__init__()
         # Override the https adapter.
-        self.mount("https://", HTTPAdapter(server_hostname))
+        self.mount("https://", HTTPAdapter(server_hostname, **adapter_kwargs))
+        self.mount("http://", requests.adapters.HTTPAdapter(**adapter_kwargs))
+
+
+class PoolConfig(NamedTuple):
+    # The number of connections kept open to each master.
+    pool_size: int
+    # If False, connections are closed after every request, like unpooled sessions.
+    keep_alive: bool
+    # How many times to retry failed connections, and reads of GET and HEAD requests.
+    max_retries: int
+    # Retries sleep for backoff_factor * 2 ** (retry number - 1) seconds, after the first one.
+    backoff_factor: float
+
+
+# Pooled sessions are keyed by (scheme://host:port, server_hostname, cert bundle).
+_SessionKey = Tuple[str, Optional[str], Any]
+
+_pool_lock = threading.Lock()
+_pool_config = PoolConfig(pool_size=10, keep_alive=True, max_retries=3, backoff_factor=0.1)
+_pool_pid = os.getpid()
+_sessions = {}  # type: Dict[_SessionKey, Session]
+
+# Don't retry errors which are neither connection nor read errors, like certificate verification
+# failures; urllib3 counts those separately since 1.26.
+_retry_kwargs = {}  # type: Dict[str, Any]
+_retry_params = inspect.signature(retry.Retry).parameters
+if "other" in _retry_params:
+    _retry_kwargs["other"] = 0
+
+# Only retry reads for requests without a body. A request may have been sent, or its body consumed
+# (e.g. a generator streaming an upload), by the time its read fails, so resending it could repeat
+# its effect or send an empty body. Connection errors are retried for every method, since nothing
+# has been sent yet. urllib3 renamed method_whitelist to allowed_methods in 1.26.
+_RETRY_READ_METHODS = frozenset(["GET", "HEAD", "OPTIONS"])
+if "allowed_methods" in _retry_params:
+    _retry_kwargs["allowed_methods"] = _RETRY_READ_METHODS
+else:
+    _retry_kwargs["method_whitelist"] = _RETRY_READ_METHODS
+
+
+def configure_pool(
+    pool_size: int = 10,
+    keep_alive: bool = True,
+    max_retries: int = 3,
+    backoff_factor: float = 0.1,
+) -> None:
+    """
+    Configure the connection pool used by request(). Pooled sessions are closed, so the new
+    configuration applies to every subsequent request.
+    """
+    check_gt(pool_size, 0, "pool_size must be greater than 0")
+    check_gt_eq(max_retries, 0, "max_retries must be at least 0")
+    check_gt_eq(backoff_factor, 0, "backoff_factor must be at least 0")
+
+    global _pool_config
+    with _pool_lock:
+        _pool_config = PoolConfig(pool_size, keep_alive, max_retries, backoff_factor)
+        _close_sessions()
+
+
+def close_pool() -> None:
+    """Close every pooled session and its connections."""
+    with _pool_lock:
+        _close_sessions()
+
+
+def _close_sessions() -> None:
+    for session in _sessions.values():
+        session.close()
+    _sessions.clear()
+
+
+def _new_session(server_hostname: Optional[str], config: PoolConfig) -> Session:
+    session = Session(
+        server_hostname,
+        pool_connections=1,
+        pool_maxsize=config.pool_size,
+        # Never retry on the status of a response; the caller decides what to do with it.
+        max_retries=retry.Retry(
+            total=config.max_retries,
+            status=0,
+            backoff_factor=config.backoff_factor,
+            raise_on_status=False,
+            **_retry_kwargs,
+        ),
+    )
+    if not config.keep_alive:
+        session.headers["Connection"] = "close"
+    # Like requests.request(), don't let cookies from one response leak into later requests.
+    session.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+    return session
+
+
+def _get_session(url: str, server_hostname: Optional[str], verify: Any) -> Session:
+    parsed = parse.urlparse(url)
+    key = ("{}://{}".format(parsed.scheme, parsed.netloc), server_hostname, verify)
+
+    global _pool_pid
+    with _pool_lock:
+        if _pool_pid != os.getpid():
+            # Connections inherited from a parent process are shared with it; forget them, but
+            # don't close them, which would shut them down for the parent as well.
+            _sessions.clear()
+            _pool_pid = os.getpid()
+
+        session = _sessions.get(key)
+        if session is None:
+            session = _new_session(server_hostname, _pool_config)
+            _sessions[key] = session
+        return session
 
 
 def request(method: str, url: str, **kwargs: Any) -> requests.Response:
     server_hostname = kwargs.pop("server_hostname", None)
-    with Session(server_hostname) as session:
-        return session.request(method=method, url=url, **kwargs)
+    session = _get_session(url, server_hostname, kwargs.get("verify"))
+    return session.request(method=method, url=url, **kwargs)
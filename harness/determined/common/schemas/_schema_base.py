@@ -1,7 +1,8 @@
 import enum
+import functools
 import numbers
 import typing
-from typing import Any, List, Mapping, Optional, Sequence, Type, TypeVar, cast
+from typing import Any, Callable, List, Mapping, Optional, Sequence, Type, TypeVar, cast
 
 from determined.common import schemas
 from determined.common.schemas import expconf
@@ -81,9 +82,14 @@ def _merge(obj: Any, src: Any) -> Any:
     raise ValueError(f"invalid type in merge: {type(obj).__name__}")
 
 
+def _is_union(anno: Any) -> bool:
+    # Subscripted typing.Union annotations have an __origin__ of typing.Union in all pythons >= 3.6.
+    return getattr(anno, "__origin__", None) is typing.Union
+
+
 def _remove_optional(anno: Any) -> Any:
     """Given a type annotation, which might be TYPE or Optional[TYPE], return TYPE."""
-    if type(anno) is not typing._Union:  # type: ignore
+    if not _is_union(anno):
         return anno
     args = list(anno.__args__)
     if type(None) in args:
@@ -94,7 +100,7 @@ def _remove_optional(anno: Any) -> Any:
 
 
 def _handle_unions(anno: type) -> type:
-    if type(anno) is not typing._Union:  # type: ignore
+    if not _is_union(anno):
         return anno
     args = list(anno.__args__)  # type: ignore
     args = cast(List[type], args)
@@ -111,10 +117,27 @@ def _handle_unions(anno: type) -> type:
     return args[0]
 
 
+# A converter creates an instance of an annotated type from a value and a prevalidated flag.
+_Converter = Callable[[Any, bool], Any]
+
+
 def _instance_from_annotation(anno: type, value: Any, prevalidated: bool = False) -> Any:
     """
     During calls to .from_dict(), use the type annotation to create a new object from value.
     """
+    return _converter(anno)(value, prevalidated)
+
+
+def _identity(value: Any, prevalidated: bool) -> Any:
+    return value
+
+
+@functools.lru_cache(maxsize=None)
+def _converter(anno: type) -> _Converter:
+    """
+    Compile a type annotation into a converter once, rather than inspecting the annotation for
+    every value of every call to .from_dict() or .fill_defaults().
+    """
 
     # All Union types reduce to some other type.  In the case of our union schemas, like
     # hyperparameters, that other type may be partially determined by value.
@@ -122,29 +145,28 @@ def _instance_from_annotation(anno: type, value: Any, prevalidated: bool = False
 
     if typ == typing.Any:
         # In the special case of typing.Any, we just return the value directly.
-        return value
-    if issubclass(typ, enum.Enum):
-        return typ(value)
-    if issubclass(typ, SchemaBase):
-        # For subclasses of SchemaBase we just call either from_dict() or from_none().
-        if value is None:
-            return typ.from_none()
-        return typ.from_dict(value, prevalidated)
-    if issubclass(typ, PRIMITIVE_JSON_TYPES):
-        # For json literal types, we just include them directly.
-        return value
-    if issubclass(typ, typing.List):
+        return _identity
+
+    # typing.List[thing] has an __origin__ of typing.List in python 3.6 and list in later pythons,
+    # and likewise for typing.Dict[str, thing].
+    origin = getattr(typ, "__origin__", None)
+    if origin in (list, typing.List):
         # List[thing] annotations; create a list of things.
         args = typ.__args__  # type: ignore
         args = cast(List[type], args)
         if len(args) != 1:
             raise TypeError("got typing.List[] without any element type")
-        if value is None:
-            return None
-        if not isinstance(value, typing.Sequence):
-            raise TypeError(f"unable to create instance of {typ} from {value}")
-        return [_instance_from_annotation(args[0], v, prevalidated) for v in value]
-    if issubclass(typ, typing.Dict):
+        element = _converter(args[0])
+
+        def list_converter(value: Any, prevalidated: bool) -> Any:
+            if value is None:
+                return None
+            if not isinstance(value, typing.Sequence):
+                raise TypeError(f"unable to create instance of {typ} from {value}")
+            return [element(v, prevalidated) for v in value]
+
+        return list_converter
+    if origin in (dict, typing.Dict):
         # Dict[str, thing] annotations; create a dict of strings to things.
         args = typ.__args__  # type: ignore
         args = cast(List[type], args)
@@ -152,11 +174,32 @@ def _instance_from_annotation(anno: type, value: Any, prevalidated: bool = False
             raise TypeError("got typing.Dict[] without any element type")
         if args[0] != str:
             raise TypeError("got typing.Dict[] without a string as the first type")
-        if value is None:
-            return None
-        if not isinstance(value, typing.Mapping):
-            raise TypeError(f"unable to create instance of {typ} from {value}")
-        return {k: _instance_from_annotation(args[1], v, prevalidated) for k, v in value.items()}
+        element = _converter(args[1])
+
+        def dict_converter(value: Any, prevalidated: bool) -> Any:
+            if value is None:
+                return None
+            if not isinstance(value, typing.Mapping):
+                raise TypeError(f"unable to create instance of {typ} from {value}")
+            return {k: element(v, prevalidated) for k, v in value.items()}
+
+        return dict_converter
+
+    if isinstance(typ, type) and issubclass(typ, enum.Enum):
+        return lambda value, prevalidated: typ(value)
+    if isinstance(typ, type) and issubclass(typ, SchemaBase):
+        schema_type = typ
+
+        # For subclasses of SchemaBase we just call either from_dict() or from_none().
+        def schema_converter(value: Any, prevalidated: bool) -> Any:
+            if value is None:
+                return schema_type.from_none()
+            return schema_type.from_dict(value, prevalidated)
+
+        return schema_converter
+    if isinstance(typ, type) and issubclass(typ, PRIMITIVE_JSON_TYPES):
+        # For json literal types, we just include them directly.
+        return _identity
     raise TypeError(f"invalid type annotation on SchemaBase object: {anno}")
 
 
@@ -1,10 +1,10 @@
 # This is a generated file.  Editing it will make you sad.
 
 import json
+from typing import Any, Dict, Iterator, Mapping
 
-schemas = {
-    "http://determined.ai/schemas/expconf/v0/azure.json": json.loads(
-        r"""
+_texts = {
+    "http://determined.ai/schemas/expconf/v0/azure.json": r"""
 {
     "$schema": "http://json-schema.org/draft-07/schema#",
     "$id": "http://determined.ai/schemas/expconf/v0/azure.json",
@@ -112,10 +112,8 @@ schemas = {
     }
 }
 
-"""
-    ),
-    "http://determined.ai/schemas/expconf/v0/bind-mount.json": json.loads(
-        r"""
+""",
+    "http://determined.ai/schemas/expconf/v0/bind-mount.json": r"""
 {
     "$schema": "http://json-schema.org/draft-07/schema#",
     "$id": "http://determined.ai/schemas/expconf/v0/bind-mount.json",
@@ -162,10 +160,8 @@ schemas = {
     }
 }
 
-"""
-    ),
-    "http://determined.ai/schemas/expconf/v0/bind-mounts.json": json.loads(
-        r"""
+""",
+    "http://determined.ai/schemas/expconf/v0/bind-mounts.json": r"""
 {
     "$schema": "http://json-schema.org/draft-07/schema#",
     "$id": "http://determined.ai/schemas/expconf/v0/bind-mounts.json",
@@ -176,10 +172,8 @@ schemas = {
     }
 }
 
-"""
-    ),
-    "http://determined.ai/schemas/expconf/v0/check-data-layer-cache.json": json.loads(
-        r"""
+""",
+    "http://determined.ai/schemas/expconf/v0/check-data-layer-cache.json": r"""
 {
     "$schema": "http://json-schema.org/draft-07/schema#",
     "$id": "http://determined.ai/schemas/expconf/v0/check-data-layer-cache.json",
@@ -218,10 +212,8 @@ schemas = {
     }
 }
 
-"""
-    ),
-    "http://determined.ai/schemas/expconf/v0/check-epoch-not-used.json": json.loads(
-        r"""
+""",
+    "http://determined.ai/schemas/expconf/v0/check-epoch-not-used.json": r"""
 {
     "$schema": "http://json-schema.org/draft-07/schema#",
     "$id": "http://determined.ai/schemas/expconf/v0/check-epoch-not-used.json",
@@ -245,10 +237,8 @@ schemas = {
     }
 }
 
-"""
-    ),
-    "http://determined.ai/schemas/expconf/v0/check-global-batch-size.json": json.loads(
-        r"""
+""",
+    "http://determined.ai/schemas/expconf/v0/check-global-batch-size.json": r"""
 {
     "$schema": "http://json-schema.org/draft-07/schema#",
     "$id": "http://determined.ai/schemas/expconf/v0/check-global-batch-size.json",
@@ -316,10 +306,8 @@ schemas = {
     }
 }
 
-"""
-    ),
-    "http://determined.ai/schemas/expconf/v0/check-grid-hyperparameter.json": json.loads(
-        r"""
+""",
+    "http://determined.ai/schemas/expconf/v0/check-grid-hyperparameter.json": r"""
 {
     "$schema": "http://json-schema.org/draft-07/schema#",
     "$id": "http://determined.ai/schemas/expconf/v0/check-grid-hyperparameter.json",
@@ -397,10 +385,8 @@ schemas = {
     }
 }
 
-"""
-    ),
-    "http://determined.ai/schemas/expconf/v0/check-positive-length.json": json.loads(
-        r"""
+""",
+    "http://determined.ai/schemas/expconf/v0/check-positive-length.json": r"""
 {
     "$schema": "http://json-schema.org/draft-07/schema#",
     "$id": "http://determined.ai/schemas/expconf/v0/check-positive-length.json",
@@ -418,10 +404,8 @@ schemas = {
     ]
 }
 
-"""
-    ),
-    "http://determined.ai/schemas/expconf/v0/checkpoint-storage.json": json.loads(
-        r"""
+""",
+    "http://determined.ai/schemas/expconf/v0/checkpoint-storage.json": r"""
 {
     "$schema": "http://json-schema.org/draft-07/schema#",
     "$id": "http://determined.ai/schemas/expconf/v0/checkpoint-storage.json",
@@ -474,10 +458,13 @@ schemas = {
         "container": true,
         "container_path": true,
         "credential": true,
+        "deduplicate": true,
         "endpoint_url": true,
         "hdfs_path": true,
         "hdfs_url": true,
         "host_path": true,
+        "max_concurrency": true,
+        "multipart_chunksize": true,
         "propagation": true,
         "secret_key": true,
         "storage_path": true,
@@ -511,10 +498,8 @@ schemas = {
     }
 }
 
-"""
-    ),
-    "http://determined.ai/schemas/expconf/v0/data-layer-gcs.json": json.loads(
-        r"""
+""",
+    "http://determined.ai/schemas/expconf/v0/data-layer-gcs.json": r"""
 {
     "$schema": "http://json-schema.org/draft-07/schema#",
     "$id": "http://determined.ai/schemas/expconf/v0/data-layer-gcs.json",
@@ -578,10 +563,8 @@ schemas = {
     ]
 }
 
-"""
-    ),
-    "http://determined.ai/schemas/expconf/v0/data-layer-s3.json": json.loads(
-        r"""
+""",
+    "http://determined.ai/schemas/expconf/v0/data-layer-s3.json": r"""
 {
     "$schema": "http://json-schema.org/draft-07/schema#",
     "$id": "http://determined.ai/schemas/expconf/v0/data-layer-s3.json",
@@ -666,10 +649,8 @@ schemas = {
     ]
 }
 
-"""
-    ),
-    "http://determined.ai/schemas/expconf/v0/data-layer-shared-fs.json": json.loads(
-        r"""
+""",
+    "http://determined.ai/schemas/expconf/v0/data-layer-shared-fs.json": r"""
 {
     "$schema": "http://json-schema.org/draft-07/schema#",
     "$id": "http://determined.ai/schemas/expconf/v0/data-layer-shared-fs.json",
@@ -710,10 +691,8 @@ schemas = {
     }
 }
 
-"""
-    ),
-    "http://determined.ai/schemas/expconf/v0/data-layer.json": json.loads(
-        r"""
+""",
+    "http://determined.ai/schemas/expconf/v0/data-layer.json": r"""
 {
     "$schema": "http://json-schema.org/draft-07/schema#",
     "$id": "http://determined.ai/schemas/expconf/v0/data-layer.json",
@@ -737,10 +716,8 @@ schemas = {
     }
 }
 
-"""
-    ),
-    "http://determined.ai/schemas/expconf/v0/device.json": json.loads(
-        r"""
+""",
+    "http://determined.ai/schemas/expconf/v0/device.json": r"""
 {
     "$schema": "http://json-schema.org/draft-07/schema#",
     "$id": "http://determined.ai/schemas/expconf/v0/device.json",
@@ -768,10 +745,8 @@ schemas = {
     }
 }
 
-"""
-    ),
-    "http://determined.ai/schemas/expconf/v0/devices.json": json.loads(
-        r"""
+""",
+    "http://determined.ai/schemas/expconf/v0/devices.json": r"""
 {
     "$schema": "http://json-schema.org/draft-07/schema#",
     "$id": "http://determined.ai/schemas/expconf/v0/devices.json",
@@ -782,10 +757,8 @@ schemas = {
     }
 }
 
-"""
-    ),
-    "http://determined.ai/schemas/expconf/v0/environment-image-map.json": json.loads(
-        r"""
+""",
+    "http://determined.ai/schemas/expconf/v0/environment-image-map.json": r"""
 {
     "$schema": "http://json-schema.org/draft-07/schema#",
     "$id": "http://determined.ai/schemas/expconf/v0/environment-image-map.json",
@@ -815,10 +788,8 @@ schemas = {
     }
 }
 
-"""
-    ),
-    "http://determined.ai/schemas/expconf/v0/environment-image.json": json.loads(
-        r"""
+""",
+    "http://determined.ai/schemas/expconf/v0/environment-image.json": r"""
 {
     "$schema": "http://json-schema.org/draft-07/schema#",
     "$id": "http://determined.ai/schemas/expconf/v0/environment-image.json",
@@ -838,10 +809,8 @@ schemas = {
     }
 }
 
-"""
-    ),
-    "http://determined.ai/schemas/expconf/v0/environment-variables-map.json": json.loads(
-        r"""
+""",
+    "http://determined.ai/schemas/expconf/v0/environment-variables-map.json": r"""
 {
     "$schema": "http://json-schema.org/draft-07/schema#",
     "$id": "http://determined.ai/schemas/expconf/v0/environment-variables-map.json",
@@ -872,10 +841,8 @@ schemas = {
     }
 }
 
-"""
-    ),
-    "http://determined.ai/schemas/expconf/v0/environment-variables.json": json.loads(
-        r"""
+""",
+    "http://determined.ai/schemas/expconf/v0/environment-variables.json": r"""
 {
     "$schema": "http://json-schema.org/draft-07/schema#",
     "$id": "http://determined.ai/schemas/expconf/v0/environment-variables.json",
@@ -898,10 +865,8 @@ schemas = {
     }
 }
 
-"""
-    ),
-    "http://determined.ai/schemas/expconf/v0/environment.json": json.loads(
-        r"""
+""",
+    "http://determined.ai/schemas/expconf/v0/environment.json": r"""
 {
     "$schema": "http://json-schema.org/draft-07/schema#",
     "$id": "http://determined.ai/schemas/expconf/v0/environment.json",
@@ -1028,10 +993,8 @@ schemas = {
     }
 }
 
-"""
-    ),
-    "http://determined.ai/schemas/expconf/v0/experiment.json": json.loads(
-        r"""
+""",
+    "http://determined.ai/schemas/expconf/v0/experiment.json": r"""
 {
     "$schema": "http://json-schema.org/draft-07/schema#",
     "$id": "http://determined.ai/schemas/expconf/v0/experiment.json",
@@ -1343,10 +1306,8 @@ schemas = {
     }
 }
 
-"""
-    ),
-    "http://determined.ai/schemas/expconf/v0/gcs.json": json.loads(
-        r"""
+""",
+    "http://determined.ai/schemas/expconf/v0/gcs.json": r"""
 {
     "$schema": "http://json-schema.org/draft-07/schema#",
     "$id": "http://determined.ai/schemas/expconf/v0/gcs.json",
@@ -1397,10 +1358,8 @@ schemas = {
     }
 }
 
-"""
-    ),
-    "http://determined.ai/schemas/expconf/v0/hdfs.json": json.loads(
-        r"""
+""",
+    "http://determined.ai/schemas/expconf/v0/hdfs.json": r"""
 {
     "$schema": "http://json-schema.org/draft-07/schema#",
     "$id": "http://determined.ai/schemas/expconf/v0/hdfs.json",
@@ -1471,10 +1430,8 @@ schemas = {
     }
 }
 
-"""
-    ),
-    "http://determined.ai/schemas/expconf/v0/hyperparameter-categorical.json": json.loads(
-        r"""
+""",
+    "http://determined.ai/schemas/expconf/v0/hyperparameter-categorical.json": r"""
 {
     "$schema": "http://json-schema.org/draft-07/schema#",
     "$id": "http://determined.ai/schemas/expconf/v0/hyperparameter-categorical.json",
@@ -1496,10 +1453,8 @@ schemas = {
     }
 }
 
-"""
-    ),
-    "http://determined.ai/schemas/expconf/v0/hyperparameter-const.json": json.loads(
-        r"""
+""",
+    "http://determined.ai/schemas/expconf/v0/hyperparameter-const.json": r"""
 {
     "$schema": "http://json-schema.org/draft-07/schema#",
     "$id": "http://determined.ai/schemas/expconf/v0/hyperparameter-const.json",
@@ -1518,10 +1473,8 @@ schemas = {
     }
 }
 
-"""
-    ),
-    "http://determined.ai/schemas/expconf/v0/hyperparameter-double.json": json.loads(
-        r"""
+""",
+    "http://determined.ai/schemas/expconf/v0/hyperparameter-double.json": r"""
 {
     "$schema": "http://json-schema.org/draft-07/schema#",
     "$id": "http://determined.ai/schemas/expconf/v0/hyperparameter-double.json",
@@ -1559,10 +1512,8 @@ schemas = {
     }
 }
 
-"""
-    ),
-    "http://determined.ai/schemas/expconf/v0/hyperparameter-int.json": json.loads(
-        r"""
+""",
+    "http://determined.ai/schemas/expconf/v0/hyperparameter-int.json": r"""
 {
     "$schema": "http://json-schema.org/draft-07/schema#",
     "$id": "http://determined.ai/schemas/expconf/v0/hyperparameter-int.json",
@@ -1600,10 +1551,8 @@ schemas = {
     }
 }
 
-"""
-    ),
-    "http://determined.ai/schemas/expconf/v0/hyperparameter-log.json": json.loads(
-        r"""
+""",
+    "http://determined.ai/schemas/expconf/v0/hyperparameter-log.json": r"""
 {
     "$schema": "http://json-schema.org/draft-07/schema#",
     "$id": "http://determined.ai/schemas/expconf/v0/hyperparameter-log.json",
@@ -1646,10 +1595,8 @@ schemas = {
     }
 }
 
-"""
-    ),
-    "http://determined.ai/schemas/expconf/v0/hyperparameter.json": json.loads(
-        r"""
+""",
+    "http://determined.ai/schemas/expconf/v0/hyperparameter.json": r"""
 {
     "$schema": "http://json-schema.org/draft-07/schema#",
     "$id": "http://determined.ai/schemas/expconf/v0/hyperparameter.json",
@@ -1700,10 +1647,8 @@ schemas = {
     }
 }
 
-"""
-    ),
-    "http://determined.ai/schemas/expconf/v0/hyperparameters.json": json.loads(
-        r"""
+""",
+    "http://determined.ai/schemas/expconf/v0/hyperparameters.json": r"""
 {
     "$schema": "http://json-schema.org/draft-07/schema#",
     "$id": "http://determined.ai/schemas/expconf/v0/hyperparameters.json",
@@ -1728,10 +1673,8 @@ schemas = {
     }
 }
 
-"""
-    ),
-    "http://determined.ai/schemas/expconf/v0/internal.json": json.loads(
-        r"""
+""",
+    "http://determined.ai/schemas/expconf/v0/internal.json": r"""
 {
     "$schema": "http://json-schema.org/draft-07/schema#",
     "$id": "http://determined.ai/schemas/expconf/v0/internal.json",
@@ -1749,10 +1692,8 @@ schemas = {
     }
 }
 
-"""
-    ),
-    "http://determined.ai/schemas/expconf/v0/kerberos.json": json.loads(
-        r"""
+""",
+    "http://determined.ai/schemas/expconf/v0/kerberos.json": r"""
 {
     "$schema": "http://json-schema.org/draft-07/schema#",
     "$id": "http://determined.ai/schemas/expconf/v0/kerberos.json",
@@ -1770,10 +1711,8 @@ schemas = {
     }
 }
 
-"""
-    ),
-    "http://determined.ai/schemas/expconf/v0/length.json": json.loads(
-        r"""
+""",
+    "http://determined.ai/schemas/expconf/v0/length.json": r"""
 {
     "$schema": "http://json-schema.org/draft-07/schema#",
     "$id": "http://determined.ai/schemas/expconf/v0/length.json",
@@ -1827,10 +1766,8 @@ schemas = {
     }
 }
 
-"""
-    ),
-    "http://determined.ai/schemas/expconf/v0/native.json": json.loads(
-        r"""
+""",
+    "http://determined.ai/schemas/expconf/v0/native.json": r"""
 {
     "$schema": "http://json-schema.org/draft-07/schema#",
     "$id": "http://determined.ai/schemas/expconf/v0/native.json",
@@ -1850,10 +1787,8 @@ schemas = {
     }
 }
 
-"""
-    ),
-    "http://determined.ai/schemas/expconf/v0/optimizations.json": json.loads(
-        r"""
+""",
+    "http://determined.ai/schemas/expconf/v0/optimizations.json": r"""
 {
     "$schema": "http://json-schema.org/draft-07/schema#",
     "$id": "http://determined.ai/schemas/expconf/v0/optimizations.json",
@@ -1870,6 +1805,14 @@ schemas = {
             "minimum": 1,
             "default": 1
         },
+        "async_checkpoint_uploads": {
+            "type": [
+                "integer",
+                "null"
+            ],
+            "minimum": 0,
+            "default": 0
+        },
         "auto_tune_tensor_fusion": {
             "type": [
                 "boolean",
@@ -1939,10 +1882,8 @@ schemas = {
     }
 }
 
-"""
-    ),
-    "http://determined.ai/schemas/expconf/v0/profiling.json": json.loads(
-        r"""
+""",
+    "http://determined.ai/schemas/expconf/v0/profiling.json": r"""
 {
     "$schema": "http://json-schema.org/draft-07/schema#",
     "$id": "http://determined.ai/schemas/expconf/v0/profiling.json",
@@ -1973,6 +1914,13 @@ schemas = {
             ],
             "default": null,
             "minimum": 0
+        },
+        "output_dir": {
+            "type": [
+                "string",
+                "null"
+            ],
+            "default": null
         }
     },
     "compareProperties": {
@@ -1982,10 +1930,8 @@ schemas = {
     }
 }
 
-"""
-    ),
-    "http://determined.ai/schemas/expconf/v0/registry-auth.json": json.loads(
-        r"""
+""",
+    "http://determined.ai/schemas/expconf/v0/registry-auth.json": r"""
 {
     "$schema": "http://json-schema.org/draft-07/schema#",
     "$id": "http://determined.ai/schemas/expconf/v0/registry-auth.json",
@@ -2046,10 +1992,8 @@ schemas = {
     }
 }
 
-"""
-    ),
-    "http://determined.ai/schemas/expconf/v0/reproducibility.json": json.loads(
-        r"""
+""",
+    "http://determined.ai/schemas/expconf/v0/reproducibility.json": r"""
 {
     "$schema": "http://json-schema.org/draft-07/schema#",
     "$id": "http://determined.ai/schemas/expconf/v0/reproducibility.json",
@@ -2071,10 +2015,8 @@ schemas = {
     }
 }
 
-"""
-    ),
-    "http://determined.ai/schemas/expconf/v0/resources.json": json.loads(
-        r"""
+""",
+    "http://determined.ai/schemas/expconf/v0/resources.json": r"""
 {
     "$schema": "http://json-schema.org/draft-07/schema#",
     "$id": "http://determined.ai/schemas/expconf/v0/resources.json",
@@ -2160,10 +2102,8 @@ schemas = {
     }
 }
 
-"""
-    ),
-    "http://determined.ai/schemas/expconf/v0/s3.json": json.loads(
-        r"""
+""",
+    "http://determined.ai/schemas/expconf/v0/s3.json": r"""
 {
     "$schema": "http://json-schema.org/draft-07/schema#",
     "$id": "http://determined.ai/schemas/expconf/v0/s3.json",
@@ -2208,6 +2148,29 @@ schemas = {
             ],
             "default": null
         },
+        "max_concurrency": {
+            "type": [
+                "integer",
+                "null"
+            ],
+            "default": null,
+            "minimum": 1
+        },
+        "multipart_chunksize": {
+            "type": [
+                "integer",
+                "null"
+            ],
+            "default": null,
+            "minimum": 5242880
+        },
+        "deduplicate": {
+            "type": [
+                "boolean",
+                "null"
+            ],
+            "default": false
+        },
         "save_experiment_best": {
             "type": [
                 "integer",
@@ -2235,10 +2198,8 @@ schemas = {
     }
 }
 
-"""
-    ),
-    "http://determined.ai/schemas/expconf/v0/searcher-adaptive-asha.json": json.loads(
-        r"""
+""",
+    "http://determined.ai/schemas/expconf/v0/searcher-adaptive-asha.json": r"""
 {
     "$schema": "http://json-schema.org/draft-07/schema#",
     "$id": "http://determined.ai/schemas/expconf/v0/searcher-adaptive-asha.json",
@@ -2354,10 +2315,8 @@ schemas = {
     }
 }
 
-"""
-    ),
-    "http://determined.ai/schemas/expconf/v0/searcher-adaptive-simple.json": json.loads(
-        r"""
+""",
+    "http://determined.ai/schemas/expconf/v0/searcher-adaptive-simple.json": r"""
 {
     "$schema": "http://json-schema.org/draft-07/schema#",
     "$comment": "this is EOL searcher, not to be used in new experiments",
@@ -2450,10 +2409,8 @@ schemas = {
     }
 }
 
-"""
-    ),
-    "http://determined.ai/schemas/expconf/v0/searcher-adaptive.json": json.loads(
-        r"""
+""",
+    "http://determined.ai/schemas/expconf/v0/searcher-adaptive.json": r"""
 {
     "$schema": "http://json-schema.org/draft-07/schema#",
     "$comment": "this is an EOL searcher, not to be used in new experiments",
@@ -2562,10 +2519,8 @@ schemas = {
     }
 }
 
-"""
-    ),
-    "http://determined.ai/schemas/expconf/v0/searcher-async-halving.json": json.loads(
-        r"""
+""",
+    "http://determined.ai/schemas/expconf/v0/searcher-async-halving.json": r"""
 {
     "$schema": "http://json-schema.org/draft-07/schema#",
     "$id": "http://determined.ai/schemas/expconf/v0/searcher-async-halving.json",
@@ -2663,10 +2618,8 @@ schemas = {
     }
 }
 
-"""
-    ),
-    "http://determined.ai/schemas/expconf/v0/searcher-grid.json": json.loads(
-        r"""
+""",
+    "http://determined.ai/schemas/expconf/v0/searcher-grid.json": r"""
 {
     "$schema": "http://json-schema.org/draft-07/schema#",
     "$id": "http://determined.ai/schemas/expconf/v0/searcher-grid.json",
@@ -2731,10 +2684,8 @@ schemas = {
     }
 }
 
-"""
-    ),
-    "http://determined.ai/schemas/expconf/v0/searcher-pbt.json": json.loads(
-        r"""
+""",
+    "http://determined.ai/schemas/expconf/v0/searcher-pbt.json": r"""
 {
     "$schema": "http://json-schema.org/draft-07/schema#",
     "$id": "http://determined.ai/schemas/expconf/v0/searcher-pbt.json",
@@ -2877,10 +2828,8 @@ schemas = {
     }
 }
 
-"""
-    ),
-    "http://determined.ai/schemas/expconf/v0/searcher-random.json": json.loads(
-        r"""
+""",
+    "http://determined.ai/schemas/expconf/v0/searcher-random.json": r"""
 {
     "$schema": "http://json-schema.org/draft-07/schema#",
     "$id": "http://determined.ai/schemas/expconf/v0/searcher-random.json",
@@ -2954,10 +2903,8 @@ schemas = {
     }
 }
 
-"""
-    ),
-    "http://determined.ai/schemas/expconf/v0/searcher-single.json": json.loads(
-        r"""
+""",
+    "http://determined.ai/schemas/expconf/v0/searcher-single.json": r"""
 {
     "$schema": "http://json-schema.org/draft-07/schema#",
     "$id": "http://determined.ai/schemas/expconf/v0/searcher-single.json",
@@ -3014,10 +2961,8 @@ schemas = {
     }
 }
 
-"""
-    ),
-    "http://determined.ai/schemas/expconf/v0/searcher-sync-halving.json": json.loads(
-        r"""
+""",
+    "http://determined.ai/schemas/expconf/v0/searcher-sync-halving.json": r"""
 {
     "$schema": "http://json-schema.org/draft-07/schema#",
     "$comment": "this is an EOL searcher, not to be used in new experiments",
@@ -3108,10 +3053,8 @@ schemas = {
     }
 }
 
-"""
-    ),
-    "http://determined.ai/schemas/expconf/v0/searcher.json": json.loads(
-        r"""
+""",
+    "http://determined.ai/schemas/expconf/v0/searcher.json": r"""
 {
     "$schema": "http://json-schema.org/draft-07/schema#",
     "$id": "http://determined.ai/schemas/expconf/v0/searcher.json",
@@ -3224,10 +3167,8 @@ schemas = {
     }
 }
 
-"""
-    ),
-    "http://determined.ai/schemas/expconf/v0/security.json": json.loads(
-        r"""
+""",
+    "http://determined.ai/schemas/expconf/v0/security.json": r"""
 {
     "$schema": "http://json-schema.org/draft-07/schema#",
     "$id": "http://determined.ai/schemas/expconf/v0/security.json",
@@ -3247,10 +3188,8 @@ schemas = {
     }
 }
 
-"""
-    ),
-    "http://determined.ai/schemas/expconf/v0/shared-fs.json": json.loads(
-        r"""
+""",
+    "http://determined.ai/schemas/expconf/v0/shared-fs.json": r"""
 {
     "$schema": "http://json-schema.org/draft-07/schema#",
     "$id": "http://determined.ai/schemas/expconf/v0/shared-fs.json",
@@ -3345,10 +3284,8 @@ schemas = {
     }
 }
 
-"""
-    ),
-    "http://determined.ai/schemas/expconf/v0/tensorboard-storage.json": json.loads(
-        r"""
+""",
+    "http://determined.ai/schemas/expconf/v0/tensorboard-storage.json": r"""
 {
     "$schema": "http://json-schema.org/draft-07/schema#",
     "$id": "http://determined.ai/schemas/expconf/v0/tensorboard-storage.json",
@@ -3382,10 +3319,8 @@ schemas = {
     }
 }
 
-"""
-    ),
-    "http://determined.ai/schemas/expconf/v0/test-root.json": json.loads(
-        r"""
+""",
+    "http://determined.ai/schemas/expconf/v0/test-root.json": r"""
 {
     "$schema": "http://json-schema.org/draft-07/schema#",
     "$id": "http://determined.ai/schemas/expconf/v0/test-root.json",
@@ -3445,10 +3380,8 @@ schemas = {
     }
 }
 
-"""
-    ),
-    "http://determined.ai/schemas/expconf/v0/test-sub.json": json.loads(
-        r"""
+""",
+    "http://determined.ai/schemas/expconf/v0/test-sub.json": r"""
 {
     "$schema": "http://json-schema.org/draft-07/schema#",
     "$id": "http://determined.ai/schemas/expconf/v0/test-sub.json",
@@ -3467,10 +3400,8 @@ schemas = {
     }
 }
 
-"""
-    ),
-    "http://determined.ai/schemas/expconf/v0/test-union-a.json": json.loads(
-        r"""
+""",
+    "http://determined.ai/schemas/expconf/v0/test-union-a.json": r"""
 {
     "$schema": "http://json-schema.org/draft-07/schema#",
     "$id": "http://determined.ai/schemas/expconf/v0/test-union-a.json",
@@ -3498,10 +3429,8 @@ schemas = {
     }
 }
 
-"""
-    ),
-    "http://determined.ai/schemas/expconf/v0/test-union-b.json": json.loads(
-        r"""
+""",
+    "http://determined.ai/schemas/expconf/v0/test-union-b.json": r"""
 {
     "$schema": "http://json-schema.org/draft-07/schema#",
     "$id": "http://determined.ai/schemas/expconf/v0/test-union-b.json",
@@ -3529,10 +3458,8 @@ schemas = {
     }
 }
 
-"""
-    ),
-    "http://determined.ai/schemas/expconf/v0/test-union.json": json.loads(
-        r"""
+""",
+    "http://determined.ai/schemas/expconf/v0/test-union.json": r"""
 {
     "$schema": "http://json-schema.org/draft-07/schema#",
     "$id": "http://determined.ai/schemas/expconf/v0/test-union.json",
@@ -3552,6 +3479,27 @@ schemas = {
     }
 }
 
-"""
-    ),
+""",
 }
+
+
+class _Schemas(Mapping[str, Any]):
+    """Parses each schema when it is first looked up, not at import time."""
+
+    def __init__(self) -> None:
+        self._parsed = {}  # type: Dict[str, Any]
+
+    def __getitem__(self, url: str) -> Any:
+        schema = self._parsed.get(url)
+        if schema is None:
+            schema = self._parsed[url] = json.loads(_texts[url])
+        return schema
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(_texts)
+
+    def __len__(self) -> int:
+        return len(_texts)
+
+
+schemas = _Schemas()
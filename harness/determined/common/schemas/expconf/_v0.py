@@ -52,6 +52,7 @@ class ResourcesConfigV0(schemas.SchemaBase):
 class OptimizationsConfigV0(schemas.SchemaBase):
     _id = "http://determined.ai/schemas/expconf/v0/optimizations.json"
     aggregation_frequency: Optional[int] = None
+    async_checkpoint_uploads: Optional[int] = None
     auto_tune_tensor_fusion: Optional[bool] = None
     average_aggregated_gradients: Optional[bool] = None
     average_training_metrics: Optional[bool] = None
@@ -65,6 +66,7 @@ class OptimizationsConfigV0(schemas.SchemaBase):
     def __init__(
         self,
         aggregation_frequency: Optional[int] = None,
+        async_checkpoint_uploads: Optional[int] = None,
         auto_tune_tensor_fusion: Optional[bool] = None,
         average_aggregated_gradients: Optional[bool] = None,
         average_training_metrics: Optional[bool] = None,
@@ -116,6 +118,7 @@ class ProfilingConfigV0(schemas.SchemaBase):
     enabled: Optional[bool] = None
     begin_on_batch: Optional[int] = None
     end_after_batch: Optional[int] = None
+    output_dir: Optional[str] = None
 
     @schemas.auto_init
     def __init__(
@@ -123,6 +126,7 @@ class ProfilingConfigV0(schemas.SchemaBase):
         enabled: Optional[bool] = None,
         begin_on_batch: Optional[int] = None,
         end_after_batch: Optional[int] = None,
+        output_dir: Optional[str] = None,
     ) -> None:
         pass
 
@@ -802,7 +806,10 @@ class S3ConfigV0(schemas.SchemaBase):
     _id = "http://determined.ai/schemas/expconf/v0/s3.json"
     bucket: str
     access_key: Optional[str] = None
+    deduplicate: Optional[bool] = None
     endpoint_url: Optional[str] = None
+    max_concurrency: Optional[int] = None
+    multipart_chunksize: Optional[int] = None
     save_experiment_best: Optional[int] = None
     save_trial_best: Optional[int] = None
     save_trial_latest: Optional[int] = None
@@ -813,7 +820,10 @@ class S3ConfigV0(schemas.SchemaBase):
         self,
         bucket: str,
         access_key: Optional[str] = None,
+        deduplicate: Optional[bool] = None,
         endpoint_url: Optional[str] = None,
+        max_concurrency: Optional[int] = None,
+        multipart_chunksize: Optional[int] = None,
         save_experiment_best: Optional[int] = None,
         save_trial_best: Optional[int] = None,
         save_trial_latest: Optional[int] = None,
@@ -1,3 +1,4 @@
+import functools
 from typing import Any, Dict, List, Optional
 
 import jsonschema
@@ -8,10 +9,28 @@ from determined.common.schemas.expconf import _gen
 _validators = {"sanity": {}, "completeness": {}}  # type: Dict[str, Any]
 
 
+@functools.lru_cache(maxsize=None)
+def _validator_class(complete: bool) -> Any:
+    """Extend the Draft7Validator with our extensions once, to share across all schemas."""
+    ext = {
+        "disallowProperties": extensions.disallowProperties,
+        "union": extensions.union,
+        "checks": extensions.checks,
+        "compareProperties": extensions.compareProperties,
+        "conditional": extensions.conditional,
+        "optionalRef": extensions.optionalRef,
+    }
+    if complete:
+        ext["eventuallyRequired"] = extensions.eventuallyRequired
+        ext["eventually"] = extensions.eventually
+
+    return jsonschema.validators.extend(jsonschema.Draft7Validator, ext)
+
+
 def make_validator(url: Optional[str] = None, complete: Optional[bool] = False) -> Any:
     # Use the experiment config schema by default.
     if url is None:
-        url = "http://determined.ai/schemas/expconf/v1/experiment.json"
+        url = "http://determined.ai/schemas/expconf/v0/experiment.json"
 
     global _validators
     key = "completeness" if complete else "sanity"
@@ -26,20 +45,7 @@ def make_validator(url: Optional[str] = None, complete: Optional[bool] = False)
         handlers={"http": lambda url: _gen.schemas[url]},
     )
 
-    validator = jsonschema.Draft7Validator(schema=schema, resolver=resolver)
-    ext = {
-        "disallowProperties": extensions.disallowProperties,
-        "union": extensions.union,
-        "checks": extensions.checks,
-        "compareProperties": extensions.compareProperties,
-        "conditional": extensions.conditional,
-        "optionalRef": extensions.optionalRef,
-    }
-    if complete:
-        ext["eventuallyRequired"] = extensions.eventuallyRequired
-        ext["eventually"] = extensions.eventually
-
-    cls = jsonschema.validators.extend(validator, ext)
+    cls = _validator_class(bool(complete))
     _validators[key][url] = cls(schema=schema, resolver=resolver)
 
     return _validators[key][url]
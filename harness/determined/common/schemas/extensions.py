@@ -77,15 +77,18 @@ def union(
     value ("int" or "double") for that subschema's error message to be chosen.
     """
     selected_errors = None
-    valid = []
+    valid = []  # type: List[Dict[str, Any]]
 
     for idx, item in enumerate(det_one_of["items"]):
-        errors = list(validator.descend(instance, schema=item, schema_path=idx))
-        if errors:
-            key = item["unionKey"]
-            if not selected_errors and _evaluate_unionKey(key, instance):
-                selected_errors = errors
-        else:
+        errors = validator.descend(instance, schema=item, schema_path=idx)
+        if not valid and not selected_errors and _evaluate_unionKey(item["unionKey"], instance):
+            # Errors are only reported from the first failing item with a matching unionKey, and
+            # only if no item is valid.
+            selected_errors = list(errors)
+            if not selected_errors:
+                valid.append(item)
+        elif next(errors, None) is None:
+            # For any other item, stop validating at its first error.
             valid.append(item)
 
     if len(valid) == 1:
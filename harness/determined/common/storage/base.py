@@ -88,6 +88,19 @@ class StorageManager:
         created and deleting the temporary checkpoint directory.
         """
 
+        storage_id, storage_dir = self._prepare_store_path(storage_id)
+
+        yield (storage_id, storage_dir)
+        check_true(os.path.exists(storage_dir), "Checkpoint did not create a storage directory")
+
+        metadata = StorageMetadata(storage_id, StorageManager._list_directory(storage_dir))
+        self.post_store_path(storage_id, storage_dir, metadata)
+
+    def _prepare_store_path(self, storage_id: str = "") -> Tuple[str, str]:
+        """
+        Choose a checkpoint ID, if necessary, and make sure that the base path exists. Returns the
+        checkpoint ID and the local directory the checkpoint should be written to.
+        """
         if storage_id == "":
             storage_id = str(uuid.uuid4())
 
@@ -100,13 +113,7 @@ class StorageManager:
         os.umask(old_umask)
 
         os.makedirs(self._base_path, exist_ok=True)
-        storage_dir = os.path.join(self._base_path, storage_id)
-
-        yield (storage_id, storage_dir)
-        check_true(os.path.exists(storage_dir), "Checkpoint did not create a storage directory")
-
-        metadata = StorageMetadata(storage_id, StorageManager._list_directory(storage_dir))
-        self.post_store_path(storage_id, storage_dir, metadata)
+        return storage_id, os.path.join(self._base_path, storage_id)
 
     @abc.abstractmethod
     @contextlib.contextmanager
@@ -165,3 +172,26 @@ class StorageManager:
                 result[rel_path] = os.path.getsize(abs_path)
 
         return result
+
+    @staticmethod
+    def verify_restored_path(root: str, metadata: StorageMetadata) -> None:
+        """
+        Check that a restored checkpoint contains every file that was recorded when it was saved,
+        with the same size; directories are not checked, since not every backend stores them.
+        Checkpoints are reported to the master before a background upload finishes, so a
+        checkpoint whose upload failed or was interrupted could otherwise be loaded without its
+        missing files being noticed.
+        """
+        missing = []
+        for rel_path, size in metadata.resources.items():
+            if rel_path.endswith("/"):
+                continue
+            path = os.path.join(root, rel_path)
+            if not os.path.isfile(path) or os.path.getsize(path) != size:
+                missing.append(rel_path)
+
+        check_true(
+            not missing,
+            "Checkpoint {} is incomplete, probably because its upload failed or was interrupted; "
+            "missing or truncated files: {}".format(metadata.storage_id, ", ".join(missing[:10])),
+        )
@@ -1,15 +1,74 @@
+import concurrent.futures
 import contextlib
+import hashlib
+import json
 import logging
 import os
 import tempfile
-from typing import Iterator, Optional
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Sequence, TypeVar
 
+import backoff
 import boto3
+import boto3.s3.transfer
+import botocore.config
+import botocore.exceptions
 import requests
 
 from determined.common import util
 from determined.common.storage.base import StorageManager, StorageMetadata
 
+T = TypeVar("T")
+
+DEFAULT_MAX_CONCURRENCY = 10
+# Matches the boto3 default.
+DEFAULT_MULTIPART_CHUNKSIZE = 8 * 1024 * 1024
+
+# The number of attempts made to transfer a single file before the whole transfer is failed.
+MAX_TRANSFER_TRIES = 5
+
+# Network-level errors that are worth retrying for an individual file.  Errors returned by S3
+# itself (e.g., access denied) are not retried.
+_RETRYABLE_ERRORS = (
+    botocore.exceptions.ConnectionError,
+    botocore.exceptions.HTTPClientError,
+    botocore.exceptions.IncompleteReadError,
+)
+
+# Key prefixes of the content-addressed layout used when `deduplicate` is enabled:
+#
+#   blobs/sha256/<digest>               the contents of every distinct file
+#   refs/sha256/<digest>/<storage_id>   an empty marker for each checkpoint that uses a blob
+#   manifests/<storage_id>.json         the mapping from a checkpoint's paths to digests
+#
+# A blob is deleted along with the last checkpoint that references it. S3 has no way to delete an
+# object only if no other object exists, so a checkpoint being stored and one being deleted can
+# race over a shared blob: the deleter may find no references just before the uploader adds its
+# reference and finds the blob still there. To make this unlikely, the deleter checks the
+# references of each blob immediately before deleting it, and the uploader checks again that every
+# blob it did not upload still exists after writing its manifest, uploading any that have gone.
+BLOB_PREFIX = "blobs/sha256/"
+REF_PREFIX = "refs/sha256/"
+MANIFEST_PREFIX = "manifests/"
+
+_HASH_BUFFER_SIZE = 1024 * 1024
+
+
+def _sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for buf in iter(lambda: f.read(_HASH_BUFFER_SIZE), b""):
+            h.update(buf)
+    return h.hexdigest()
+
+
+def _is_not_found(e: botocore.exceptions.ClientError) -> bool:
+    return e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey")
+
+
+def _is_forbidden(e: botocore.exceptions.ClientError) -> bool:
+    # Without s3:ListBucket, S3 reports a missing key as forbidden rather than not found.
+    return e.response.get("Error", {}).get("Code") in ("403", "AccessDenied")
+
 
 class S3StorageManager(StorageManager):
     """
@@ -22,15 +81,31 @@ class S3StorageManager(StorageManager):
         access_key: Optional[str] = None,
         secret_key: Optional[str] = None,
         endpoint_url: Optional[str] = None,
+        max_concurrency: Optional[int] = None,
+        multipart_chunksize: Optional[int] = None,
+        deduplicate: Optional[bool] = None,
         temp_dir: Optional[str] = None,
     ) -> None:
         super().__init__(temp_dir if temp_dir is not None else tempfile.gettempdir())
         self.bucket = bucket
+        self.deduplicate = bool(deduplicate)
+        self.max_concurrency = max_concurrency or DEFAULT_MAX_CONCURRENCY
         self.client = boto3.client(
             "s3",
             endpoint_url=endpoint_url,
             aws_access_key_id=access_key,
             aws_secret_access_key=secret_key,
+            # Every transfer thread needs its own connection to avoid thrashing the pool.
+            config=botocore.config.Config(max_pool_connections=self.max_concurrency),
+        )
+
+        # max_concurrency bounds both the number of files in flight and the number of parts of a
+        # single large file that boto3 transfers at once.
+        multipart_chunksize = multipart_chunksize or DEFAULT_MULTIPART_CHUNKSIZE
+        self._transfer_config = boto3.s3.transfer.TransferConfig(
+            max_concurrency=self.max_concurrency,
+            multipart_threshold=multipart_chunksize,
+            multipart_chunksize=multipart_chunksize,
         )
 
         # Detect if we are talking to minio, because boto3 has a client-side bug parsing the output
@@ -69,9 +144,133 @@ class S3StorageManager(StorageManager):
         finally:
             self._remove_checkpoint_directory(metadata.storage_id)
 
+    def _run_concurrently(self, fn: Callable[[T], None], args: Iterable[T]) -> None:
+        """
+        Call fn on each of args on a bounded pool of threads, re-raising the first error. Work
+        which has not yet started when an error occurs is cancelled.
+        """
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_concurrency) as pool:
+            futures = [pool.submit(fn, arg) for arg in args]
+            try:
+                for future in concurrent.futures.as_completed(futures):
+                    future.result()
+            except Exception:
+                for future in futures:
+                    future.cancel()
+                raise
+
+    @backoff.on_exception(  # type: ignore
+        backoff.expo, _RETRYABLE_ERRORS, max_tries=MAX_TRANSFER_TRIES
+    )
+    def _upload_file(self, abs_path: str, key_name: str) -> None:
+        self.client.upload_file(abs_path, self.bucket, key_name, Config=self._transfer_config)
+
+    @backoff.on_exception(  # type: ignore
+        backoff.expo, _RETRYABLE_ERRORS, max_tries=MAX_TRANSFER_TRIES
+    )
+    def _download_file(self, key_name: str, abs_path: str) -> None:
+        self.client.download_file(self.bucket, key_name, abs_path, Config=self._transfer_config)
+
+    def _manifest_key(self, storage_id: str) -> str:
+        return "{}{}.json".format(MANIFEST_PREFIX, storage_id)
+
+    def _get_manifest(self, storage_id: str) -> Optional[Dict[str, Optional[str]]]:
+        """
+        Return the mapping of relative paths to blob digests of a deduplicated checkpoint, or None
+        if the checkpoint was stored with the plain layout.
+        """
+        try:
+            response = self.client.get_object(
+                Bucket=self.bucket, Key=self._manifest_key(storage_id)
+            )
+        except botocore.exceptions.ClientError as e:
+            # Deduplication requires s3:ListBucket, so a forbidden manifest can only be missing
+            # when deduplication is disabled.
+            if _is_not_found(e) or (_is_forbidden(e) and not self.deduplicate):
+                return None
+            raise
+        manifest = json.loads(response["Body"].read())  # type: Dict[str, Optional[str]]
+        return manifest
+
+    def _blob_exists(self, digest: str) -> bool:
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=BLOB_PREFIX + digest)
+        except botocore.exceptions.ClientError as e:
+            if _is_not_found(e):
+                return False
+            raise
+        return True
+
+    def _upload_deduplicated(self, metadata: StorageMetadata, storage_dir: str) -> None:
+        files = [p for p in metadata.resources.keys() if not p.endswith("/")]
+        digests = {}  # type: Dict[str, str]
+
+        def hash_one(rel_path: str) -> None:
+            digests[rel_path] = _sha256(os.path.join(storage_dir, rel_path))
+
+        self._run_concurrently(hash_one, files)
+
+        # Any one path is as good as another for uploading the contents of a blob.
+        blob_sources = {digest: rel_path for rel_path, digest in digests.items()}
+
+        # Mark every blob as referenced before checking whether it already exists, so that a
+        # concurrent delete of another checkpoint sharing the blob will not remove it.
+        def add_ref(digest: str) -> None:
+            key_name = "{}{}/{}".format(REF_PREFIX, digest, metadata.storage_id)
+            self.client.put_object(Bucket=self.bucket, Key=key_name, Body=b"")
+
+        self._run_concurrently(add_ref, blob_sources.keys())
+
+        uploaded = []
+        skipped = []
+
+        def upload_blob(digest: str) -> None:
+            if self._blob_exists(digest):
+                skipped.append(digest)
+                return
+            abs_path = os.path.join(storage_dir, blob_sources[digest])
+            self._upload_file(abs_path, BLOB_PREFIX + digest)
+            uploaded.append(digest)
+
+        self._run_concurrently(upload_blob, blob_sources.keys())
+        logging.info(
+            "Uploaded {} of {} distinct files for checkpoint {}".format(
+                len(uploaded), len(blob_sources), metadata.storage_id
+            )
+        )
+
+        # The manifest is written last, so its existence means the checkpoint is complete.
+        manifest = {
+            rel_path: digests.get(rel_path) for rel_path in metadata.resources.keys()
+        }  # type: Dict[str, Optional[str]]
+        self.client.put_object(
+            Bucket=self.bucket,
+            Key=self._manifest_key(metadata.storage_id),
+            Body=json.dumps(manifest).encode("utf-8"),
+        )
+
+        # A concurrent delete of another checkpoint may have removed a blob which existed when it
+        # was checked above; see the comment on BLOB_PREFIX.
+        def reupload_blob(digest: str) -> None:
+            if self._blob_exists(digest):
+                return
+            logging.warning(
+                "Blob {} was deleted while storing checkpoint {}; uploading it again".format(
+                    digest, metadata.storage_id
+                )
+            )
+            abs_path = os.path.join(storage_dir, blob_sources[digest])
+            self._upload_file(abs_path, BLOB_PREFIX + digest)
+
+        self._run_concurrently(reupload_blob, skipped)
+
     @util.preserve_random_state
     def upload(self, metadata: StorageMetadata, storage_dir: str) -> None:
-        for rel_path in metadata.resources.keys():
+        if self.deduplicate:
+            self._upload_deduplicated(metadata, storage_dir)
+            return
+
+        def upload_one(rel_path: str) -> None:
             key_name = "{}/{}".format(metadata.storage_id, rel_path)
             url = "s3://{}/{}".format(self.bucket, key_name)
 
@@ -91,10 +290,17 @@ class S3StorageManager(StorageManager):
                     pass
             else:
                 abs_path = os.path.join(storage_dir, rel_path)
-                self.client.upload_file(abs_path, self.bucket, key_name)
+                self._upload_file(abs_path, key_name)
+
+        self._run_concurrently(upload_one, metadata.resources.keys())
 
     @util.preserve_random_state
     def download(self, metadata: StorageMetadata, storage_dir: str) -> None:
+        # Checkpoints are read according to the layout they were written with, regardless of the
+        # current setting of `deduplicate`.
+        manifest = self._get_manifest(metadata.storage_id)
+
+        to_download = []
         for rel_path in metadata.resources.keys():
             abs_path = os.path.join(storage_dir, rel_path)
 
@@ -105,22 +311,68 @@ class S3StorageManager(StorageManager):
             if rel_path.endswith("/"):
                 continue
 
-            key_name = "{}/{}".format(metadata.storage_id, rel_path)
+            to_download.append(rel_path)
+
+        def download_one(rel_path: str) -> None:
+            abs_path = os.path.join(storage_dir, rel_path)
+            if manifest is not None:
+                key_name = BLOB_PREFIX + str(manifest[rel_path])
+            else:
+                key_name = "{}/{}".format(metadata.storage_id, rel_path)
             url = "s3://{}/{}".format(self.bucket, key_name)
             logging.debug("Downloading {} from {}".format(url, rel_path))
 
-            self.client.download_file(self.bucket, key_name, abs_path)
+            self._download_file(key_name, abs_path)
+
+        self._run_concurrently(download_one, to_download)
+
+    def _delete_objects(self, keys: Sequence[str]) -> None:
+        def delete_chunk(chunk: Sequence[Dict[str, Any]]) -> None:
+            logging.debug("Deleting {} objects from S3".format(len(chunk)))
+            self.client.delete_objects(Bucket=self.bucket, Delete={"Objects": chunk})
+
+        # S3 delete_objects has a limit of 1000 objects.
+        objects = [{"Key": key} for key in keys]
+        self._run_concurrently(delete_chunk, util.chunks(objects, 1000))
+
+    def _delete_deduplicated(self, storage_id: str, manifest: Dict[str, Optional[str]]) -> None:
+        digests = {digest for digest in manifest.values() if digest is not None}
+        self._delete_objects(
+            ["{}{}/{}".format(REF_PREFIX, digest, storage_id) for digest in digests]
+        )
+
+        unreferenced = []
+
+        # Each blob is deleted as soon as it is found to be unreferenced rather than in a batch
+        # afterwards, to keep the window for racing with an upload short; see BLOB_PREFIX.
+        def delete_if_unreferenced(digest: str) -> None:
+            response = self.client.list_objects_v2(
+                Bucket=self.bucket, Prefix="{}{}/".format(REF_PREFIX, digest), MaxKeys=1
+            )
+            if response.get("KeyCount", 0) == 0:
+                self.client.delete_object(Bucket=self.bucket, Key=BLOB_PREFIX + digest)
+                unreferenced.append(digest)
+
+        self._run_concurrently(delete_if_unreferenced, digests)
+        logging.info(
+            "Deleted {} of {} distinct files for checkpoint {}".format(
+                len(unreferenced), len(digests), storage_id
+            )
+        )
+        self._delete_objects([self._manifest_key(storage_id)])
 
     @util.preserve_random_state
     def delete(self, metadata: StorageMetadata) -> None:
         logging.info("Deleting checkpoint {} from S3".format(metadata.storage_id))
 
-        objects = [
-            {"Key": "{}/{}".format(metadata.storage_id, rel_path)}
-            for rel_path in metadata.resources.keys()
-        ]
+        manifest = self._get_manifest(metadata.storage_id)
+        if manifest is not None:
+            self._delete_deduplicated(metadata.storage_id, manifest)
+            return
 
-        # S3 delete_objects has a limit of 1000 objects.
-        for chunk in util.chunks(objects, 1000):
-            logging.debug("Deleting {} objects from S3".format(len(chunk)))
-            self.client.delete_objects(Bucket=self.bucket, Delete={"Objects": chunk})
+        self._delete_objects(
+            [
+                "{}/{}".format(metadata.storage_id, rel_path)
+                for rel_path in metadata.resources.keys()
+            ]
+        )
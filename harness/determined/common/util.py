@@ -5,6 +5,7 @@ import pathlib
 import platform
 import random
 import sys
+import threading
 from typing import IO, Any, Callable, Iterator, Sequence, TypeVar, Union, overload
 
 from determined.common import yaml
@@ -53,10 +54,20 @@ def debug_mode() -> bool:
 
 
 def preserve_random_state(fn: Callable) -> Callable:
-    """A decorator to run a function with a fork of the random state."""
+    """
+    A decorator to run a function with a fork of the random state.
+
+    The random state is global, so it is only forked on the main thread; restoring it from a
+    background thread, such as the tensorboard syncer or the checkpoint uploader, would rewind the
+    random state that the main thread drew from in the meantime. Decorated functions which need
+    randomness themselves should use their own random.Random instead.
+    """
 
     @functools.wraps(fn)
     def wrapped(*arg: Any, **kwarg: Any) -> Any:
+        if threading.current_thread() is not threading.main_thread():
+            return fn(*arg, **kwarg)
+
         state = random.getstate()
         try:
             return fn(*arg, **kwarg)
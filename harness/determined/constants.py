@@ -47,6 +47,11 @@ HOROVOD_GLOO_RENDEZVOUS_PORT = 12355
 INTER_TRAIN_PROCESS_COMM_PORT_1 = 12360
 INTER_TRAIN_PROCESS_COMM_PORT_2 = INTER_TRAIN_PROCESS_COMM_PORT_1 + MAX_SLOTS_PER_AGENT
 
+# Ports for communicating between the chief and the local chief of every other machine. Used for
+# hierarchical gathers.
+CROSS_MACHINE_COMM_PORT_1 = INTER_TRAIN_PROCESS_COMM_PORT_2 + MAX_SLOTS_PER_AGENT
+CROSS_MACHINE_COMM_PORT_2 = CROSS_MACHINE_COMM_PORT_1 + MAX_SLOTS_PER_AGENT
+
 # Default trial runner interface. For distributed training this
 # specifies that the network interface must be auto-detected.
 AUTO_DETECT_TRIAL_RUNNER_NETWORK_INTERFACE = "DET_AUTO_DETECT_NETWORK_INTERFACE"
@@ -79,6 +79,7 @@ def maybe_load_checkpoint(
         logging.info("Restoring trial from checkpoint {}".format(metadata.storage_id))
 
         with storage_mgr.restore_path(metadata) as path:
+            storage.StorageManager.verify_restored_path(path, metadata)
             yield pathlib.Path(path)
 
 
@@ -119,36 +120,41 @@ def build_and_run_training_pipeline(env: det.EnvContext) -> None:
             tensorboard_writer,
         )
 
-        workloads = iter(workload_mgr)
-        hvd_config = horovod.HorovodContext.from_configs(
-            env.experiment_config, socket_mgr.get_rendezvous_info(), env.hparams
-        )
-        logging.info(f"Horovod config: {hvd_config.__dict__}.")
-
-        # Load the checkpoint, if necessary. Any possible sinks to this pipeline will need access
-        # to this checkpoint.
-        with maybe_load_checkpoint(storage_mgr, env.latest_checkpoint) as load_path:
-
-            # Horovod distributed training is done inside subprocesses.
-            if hvd_config.use:
-                subproc = layers.SubprocessLauncher(
-                    env, workloads, load_path, socket_mgr.get_rendezvous_info(), hvd_config
-                )
-                subproc.run()
-            else:
-                if env.experiment_config.debug_enabled():
-                    faulthandler.dump_traceback_later(30, repeat=True)
-
-                with det._catch_sys_exit():
-                    with det._catch_init_invalid_hp(workloads):
-                        controller = load.prepare_controller(
-                            env,
-                            workloads,
-                            load_path,
-                            socket_mgr.get_rendezvous_info(),
-                            hvd_config,
-                        )
-                    controller.run()
+        # Checkpoints which were reported to the master must finish uploading however training
+        # ends, and a failed upload must fail the trial.
+        try:
+            workloads = iter(workload_mgr)
+            hvd_config = horovod.HorovodContext.from_configs(
+                env.experiment_config, socket_mgr.get_rendezvous_info(), env.hparams
+            )
+            logging.info(f"Horovod config: {hvd_config.__dict__}.")
+
+            # Load the checkpoint, if necessary. Any possible sinks to this pipeline will need
+            # access to this checkpoint.
+            with maybe_load_checkpoint(storage_mgr, env.latest_checkpoint) as load_path:
+
+                # Horovod distributed training is done inside subprocesses.
+                if hvd_config.use:
+                    subproc = layers.SubprocessLauncher(
+                        env, workloads, load_path, socket_mgr.get_rendezvous_info(), hvd_config
+                    )
+                    subproc.run()
+                else:
+                    if env.experiment_config.debug_enabled():
+                        faulthandler.dump_traceback_later(30, repeat=True)
+
+                    with det._catch_sys_exit():
+                        with det._catch_init_invalid_hp(workloads):
+                            controller = load.prepare_controller(
+                                env,
+                                workloads,
+                                load_path,
+                                socket_mgr.get_rendezvous_info(),
+                                hvd_config,
+                            )
+                        controller.run()
+        finally:
+            workload_mgr.close()
 
 
 def main() -> None:
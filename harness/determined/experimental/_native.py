@@ -72,7 +72,7 @@ def _submit_experiment(
     if master_url is None:
         master_url = util.get_default_master_address()
 
-    exp_context = context.Context.from_local(context_path)
+    exp_context = context.ArchiveContext(context_path, digest_cache=context.DigestCache())
 
     # When a requested_user isn't specified to initialize_session(), the
     # authentication module will attempt to use the token store to grab the
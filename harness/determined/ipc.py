@@ -1,12 +1,87 @@
+import io
+import pickle
 import time
 from typing import Any, Callable, List, Optional, Tuple, cast
 
+import numpy as np
 import zmq
 from zmq.error import ZMQBindError, ZMQError
 
 import determined as det
 from determined.common import check
 
+# NumPy arrays at least this large are sent as their own zero-copy ZMQ frames instead of being
+# pickled; smaller ones are cheaper to pickle than to send as separate frames.
+_ZERO_COPY_MIN_BYTES = 64 * 1024
+
+
+class _FramePickler(pickle.Pickler):
+    """
+    _FramePickler pickles an object, except that large NumPy arrays anywhere inside of it are
+    collected in self.buffers and pickled as references, so that they can be sent as separate
+    frames without copying their data.
+    """
+
+    def __init__(self, file: io.BytesIO) -> None:
+        super().__init__(file, protocol=pickle.DEFAULT_PROTOCOL)
+        self.buffers = []  # type: List[np.ndarray]
+
+    def persistent_id(self, obj: Any) -> Any:
+        if (
+            type(obj) is np.ndarray
+            and obj.nbytes >= _ZERO_COPY_MIN_BYTES
+            and obj.flags.c_contiguous
+            and not obj.dtype.hasobject
+        ):
+            self.buffers.append(obj)
+            return (len(self.buffers) - 1, obj.dtype, obj.shape)
+        return None
+
+
+class _FrameUnpickler(pickle.Unpickler):
+    """
+    _FrameUnpickler is the inverse of _FramePickler. Arrays are rebuilt directly on top of the
+    received frames, without copying them.
+    """
+
+    def __init__(self, file: io.BytesIO, frames: List[zmq.Frame]) -> None:
+        super().__init__(file)
+        self.frames = frames
+
+    def persistent_load(self, pid: Any) -> Any:
+        idx, dtype, shape = pid
+        return np.frombuffer(self.frames[idx].buffer, dtype=dtype).reshape(shape)
+
+
+def _send_obj(socket: zmq.Socket, obj: Any) -> None:
+    """
+    Send a Python object as a pickled header frame followed by one frame per large NumPy array.
+    Objects without large arrays are sent as a single frame, just like socket.send_pyobj().
+    """
+    header = io.BytesIO()
+    pickler = _FramePickler(header)
+    pickler.dump(obj)
+
+    if not pickler.buffers:
+        socket.send(header.getvalue())
+        return
+
+    frames = [header.getvalue()]  # type: List[Any]
+    frames.extend(pickler.buffers)
+    tracker = socket.send_multipart(frames, copy=False, track=True)
+    # ZMQ sends the arrays from their original memory, so don't let the caller modify them until
+    # ZMQ is done with them.
+    assert tracker is not None
+    tracker.wait()
+
+
+def _recv_obj(socket: zmq.Socket) -> Any:
+    """
+    Receive a Python object sent by _send_obj().
+    """
+    frames = socket.recv_multipart(copy=False)
+    return _FrameUnpickler(io.BytesIO(frames[0].buffer), frames[1:]).load()
+
 
 class _OneSidedBarrier:
     """
@@ -130,18 +205,18 @@ class ZMQBroadcastServer:
         connections_made = 0
         while connections_made < self._num_connections:
             # Send a Hello.
-            self._pub_socket.send_pyobj(_HelloMessage())
+            _send_obj(self._pub_socket, _HelloMessage())
 
             # Check for an incoming connection.
             if self._pull_socket.poll(50) == 0:
                 health_check()
                 continue
 
-            obj = self._pull_socket.recv_pyobj()
+            obj = _recv_obj(self._pull_socket)
             check.is_instance(obj, _HelloMessage, "got non-_HelloMessage in server safe_start")
             connections_made += 1
 
-        self._pub_socket.send_pyobj(_FinalHelloMessage())
+        _send_obj(self._pub_socket, _FinalHelloMessage())
 
     def __enter__(self) -> "ZMQBroadcastServer":
         return self
@@ -168,7 +243,7 @@ class ZMQBroadcastServer:
         Broadcast a message object to each connection.
         """
 
-        self._pub_socket.send_pyobj(_SerialMessage(self._send_serial, obj))
+        _send_obj(self._pub_socket, _SerialMessage(self._send_serial, obj))
         self._send_serial += 1
 
     def gather_with_polling(self, health_check: Callable[[], None]) -> Tuple[List[Any], bool]:
@@ -199,7 +274,7 @@ class ZMQBroadcastServer:
         Receive one _SerialMessage from the socket and confirm that it is in-order.
         """
 
-        obj = self._pull_socket.recv_pyobj()
+        obj = _recv_obj(self._pull_socket)
 
         if isinstance(obj, _ExceptionMessage):
             return None, _ExceptionMessage
@@ -232,15 +307,15 @@ class ZMQBroadcastClient:
         """
 
         # Get the first HelloMessage to guarantee our SUB socket is connected.
-        obj = self._sub_socket.recv_pyobj()
+        obj = _recv_obj(self._sub_socket)
         check.is_instance(obj, _HelloMessage, "got non-HelloMessage in client.safe_start()")
 
         # Send our own _HelloMessage.
-        self._push_socket.send_pyobj(_HelloMessage())
+        _send_obj(self._push_socket, _HelloMessage())
 
         while True:
             # Discard all further Hellos until the FinalHello.
-            obj = self._sub_socket.recv_pyobj()
+            obj = _recv_obj(self._sub_socket)
             if isinstance(obj, _FinalHelloMessage):
                 break
             check.is_instance(obj, _HelloMessage, "got non-HelloMessage in client.safe_start()")
@@ -258,15 +333,15 @@ class ZMQBroadcastClient:
     def send(self, obj: Any) -> None:
         message = _SerialMessage(self._send_serial, obj)
         self._send_serial += 1
-        self._push_socket.send_pyobj(message)
+        _send_obj(self._push_socket, message)
 
     def send_exception_message(self) -> None:
         message = _ExceptionMessage()
-        self._push_socket.send_pyobj(message)
+        _send_obj(self._push_socket, message)
 
     def recv(self) -> Any:
 
-        obj = self._sub_socket.recv_pyobj()
+        obj = _recv_obj(self._sub_socket)
 
         if isinstance(obj, _SerialMessage):
             check.eq(obj.serial, self._recv_serial, "Out-of-order server message detected")
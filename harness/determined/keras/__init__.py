@@ -4,6 +4,7 @@ from determined.keras._data import (
     _adapt_data_from_data_loader,
     _adapt_data_from_fit_args,
     ArrayLike,
+    ArrayLikeAdapter,
     SequenceAdapter,
     InputData,
 )
@@ -1,5 +1,7 @@
 import math
-from typing import Any, Dict, List, Optional, Tuple, Union
+import mmap
+import pathlib
+from typing import Any, Dict, List, Optional, Tuple, Union, cast
 
 import numpy as np
 import tensorflow as tf
@@ -10,6 +12,9 @@ from determined.common import check
 
 ArrayLike = Union[np.ndarray, List[np.ndarray], Dict[str, np.ndarray]]
 
+# Paths to .npy files are accepted wherever an array is, and opened as read-only memory maps.
+_ArrayOrPath = Union[np.ndarray, str, pathlib.Path]
+
 InputData = Union[tf.keras.utils.Sequence, tf.data.Dataset, "SequenceAdapter", tuple]
 
 
@@ -32,20 +37,121 @@ def _length_of_multi_arraylike(data: ArrayLike) -> int:
         raise det.errors.InternalException(f"Unsupported data type: {type(data)}.")
 
 
-def _get_elements_in_multi_arraylike(data: ArrayLike, start: int, end: int) -> Any:
+def _open_arraylike(data: Any) -> Any:
+    """Open any paths to .npy files in an array-like as read-only memory-mapped arrays."""
+    if isinstance(data, (str, pathlib.Path)):
+        return np.load(data, mmap_mode="r")
+    elif isinstance(data, (list, tuple)):
+        return [_open_arraylike(v) for v in data]
+    elif isinstance(data, dict):
+        return {k: _open_arraylike(v) for k, v in data.items()}
+    return data
+
+
+def _map_multi_arraylike(data: ArrayLike, fn: Any) -> Any:
     if isinstance(data, np.ndarray):
-        return data[start:end]
+        return fn(data)
     elif isinstance(data, (list, tuple)):
-        return [arraylike[start:end] for arraylike in data]
+        return [fn(arraylike) for arraylike in data]
     elif isinstance(data, dict):
-        return {name: data[name][start:end] for name in data}
+        return {name: fn(data[name]) for name in data}
     else:
         raise det.errors.InternalException(f"Unsupported data type: {type(data)}.")
 
 
-class _ArrayLikeAdapter(tf.keras.utils.Sequence):  # type: ignore
+def _get_elements_in_multi_arraylike(data: ArrayLike, start: int, end: int) -> Any:
+    def get(arraylike: np.ndarray) -> np.ndarray:
+        if isinstance(arraylike, np.memmap):
+            # Read memory-mapped rows now, rather than whenever the batch is first used.
+            return np.array(arraylike[start:end])
+        return arraylike[start:end]
+
+    return _map_multi_arraylike(data, get)
+
+
+def _gather_elements_in_multi_arraylike(data: ArrayLike, indices: np.ndarray) -> Any:
+    # With indices sorted, each array is read with a single gather in file order.
+    return _map_multi_arraylike(data, lambda arraylike: arraylike[indices])
+
+
+def _advise_rows(arraylike: np.ndarray, rows: np.ndarray) -> None:
+    """
+    Ask the OS to start reading the pages of the given sorted rows of a memory-mapped array in the
+    background. Runs of rows that are close together are advised with a single call.
+    """
+    base = arraylike.base
+    if not isinstance(base, mmap.mmap) or not arraylike.flags.c_contiguous or len(rows) == 0:
+        return
+    # np.memmap maps the file from the allocation granularity at or below the array offset.
+    data_start = arraylike.offset % mmap.ALLOCATIONGRANULARITY
+    row_bytes = arraylike.strides[0] if arraylike.ndim else arraylike.itemsize
+    starts = data_start + rows * row_bytes
+    # A run ends wherever the gap to the next row is larger than a page.
+    breaks = np.nonzero(np.diff(starts) > mmap.PAGESIZE + row_bytes)[0]
+    run_starts = np.concatenate([starts[:1], starts[breaks + 1]])
+    run_ends = np.concatenate([starts[breaks], starts[-1:]]) + row_bytes
+    for run_start, run_end in zip(run_starts, run_ends):
+        page_start = int(run_start) // mmap.PAGESIZE * mmap.PAGESIZE
+        base.madvise(mmap.MADV_WILLNEED, page_start, min(int(run_end), len(base)) - page_start)
+
+
+class _MemmapSpec:
+    """Enough to reopen a memory-mapped array in another process without copying its data."""
+
+    def __init__(self, array: np.memmap) -> None:
+        # Only memmaps of files are reopened; see _is_reopenable_memmap().
+        self.filename = cast(str, array.filename)
+        self.dtype = array.dtype
+        self.shape = array.shape
+        self.offset = array.offset
+        self.fortran_order = array.flags.f_contiguous and not array.flags.c_contiguous
+
+    def open(self) -> np.memmap:
+        return np.memmap(
+            self.filename,
+            dtype=self.dtype,
+            mode="r",
+            offset=self.offset,
+            shape=self.shape,
+            order="F" if self.fortran_order else "C",
+        )
+
+
+def _is_reopenable_memmap(data: Any) -> bool:
+    return (
+        isinstance(data, np.memmap)
+        and isinstance(data.base, mmap.mmap)
+        and data.filename is not None
+        and data.mode == "r"
+    )
+
+
+def _pickle_memmaps(data: Any) -> Any:
+    if _is_reopenable_memmap(data):
+        return _MemmapSpec(data)
+    elif isinstance(data, (list, tuple)):
+        return type(data)(_pickle_memmaps(v) for v in data)
+    elif isinstance(data, dict):
+        return {k: _pickle_memmaps(v) for k, v in data.items()}
+    return data
+
+
+def _unpickle_memmaps(data: Any) -> Any:
+    if isinstance(data, _MemmapSpec):
+        return data.open()
+    elif isinstance(data, (list, tuple)):
+        return type(data)(_unpickle_memmaps(v) for v in data)
+    elif isinstance(data, dict):
+        return {k: _unpickle_memmaps(v) for k, v in data.items()}
+    return data
+
+
+class ArrayLikeAdapter(tf.keras.utils.Sequence):  # type: ignore
     """This adapter adapts np.ndarray, a list of np.ndarray, and a dict of
     np.ndarray into a tf.keras.utils.Sequence instance.
+
+    Arrays may be memory-mapped (``np.memmap``), or given as paths to ``.npy`` files, which are
+    opened as read-only memory maps, to train on datasets that do not fit in memory.
     """
 
     def __init__(
@@ -53,8 +159,11 @@ class _ArrayLikeAdapter(tf.keras.utils.Sequence):  # type: ignore
         x: ArrayLike,
         y: ArrayLike,
         batch_size: int,
-        sample_weights: Optional[np.ndarray] = None,
+        sample_weights: Optional[_ArrayOrPath] = None,
         drop_leftovers: bool = False,
+        shuffle: bool = False,
+        shuffle_seed: int = 0,
+        prefetch: bool = False,
     ):
         """
         If converting numpy array data to Sequence to optimize performance, consider
@@ -66,6 +175,7 @@ class _ArrayLikeAdapter(tf.keras.utils.Sequence):  # type: ignore
                 has multiple inputs).
                 2) A dict mapping input names to the corresponding array, if the model
                 has named inputs.
+                Any array may also be the path to a ``.npy`` file.
 
             y: Target data. Like the input data x, it could be either Numpy array(s).
 
@@ -75,46 +185,103 @@ class _ArrayLikeAdapter(tf.keras.utils.Sequence):  # type: ignore
 
             drop_leftovers: If True, drop the data that cannot complete the last batch. This
                 argument is ignored if x is a Sequence or a Dataset.
+
+            shuffle: If True, batches are made of samples drawn in a random order, fixed by
+                shuffle_seed, rather than of consecutive samples. Each batch is read with a
+                single gather per array, in file order. Batch order is shuffled separately by
+                ``context.configure_fit(shuffle=True)``.
+
+            shuffle_seed: The seed of the sample order when shuffle is True.
+
+            prefetch: If True, after reading a batch, ask the OS to read the pages of the next
+                batch of any memory-mapped arrays in the background. Requires Python 3.8+.
         """
+        # Paths are opened here, so only arrays are left afterwards.
+        x_data = cast(ArrayLike, _open_arraylike(x))
+        y_data = cast(ArrayLike, _open_arraylike(y))
+        sample_weight_data = cast(Optional[np.ndarray], _open_arraylike(sample_weights))
 
         if not (
-            isinstance(x, np.ndarray) or _is_list_of_numpy_array(x) or _is_dict_of_numpy_array(x)
+            isinstance(x_data, np.ndarray)
+            or _is_list_of_numpy_array(x_data)
+            or _is_dict_of_numpy_array(x_data)
         ):
             raise det.errors.InvalidDataTypeException(
-                type(x),
+                type(x_data),
                 "Data which is not tf.data.Datasets or tf.keras.utils.Sequence objects must be a "
                 "numpy array or a list/dict of numpy arrays. See the instructions below for "
                 f"details:\n{keras.TFKerasTrial.build_training_data_loader.__doc__}",
             )
         if not (
-            isinstance(y, np.ndarray) or _is_list_of_numpy_array(y) or _is_dict_of_numpy_array(y)
+            isinstance(y_data, np.ndarray)
+            or _is_list_of_numpy_array(y_data)
+            or _is_dict_of_numpy_array(y_data)
         ):
             raise det.errors.InvalidDataTypeException(
-                type(y),
+                type(y_data),
                 "Data which is not tf.data.Datasets or tf.keras.utils.Sequence objects must be a "
                 "numpy array or a list/dict of numpy arrays. See the instructions below for "
                 f"details:\n{keras.TFKerasTrial.build_training_data_loader.__doc__}",
             )
 
-        self._x_length = _length_of_multi_arraylike(x)
-        self._y_length = _length_of_multi_arraylike(y)
+        self._x_length = _length_of_multi_arraylike(x_data)
+        self._y_length = _length_of_multi_arraylike(y_data)
 
         check.eq(self._x_length, self._y_length, "Length of x and y do not match.")
         check.check_gt_eq(self._x_length, batch_size, "Batch size is too large for the input data.")
-        if sample_weights is not None:
+        if sample_weight_data is not None:
             check.eq(
                 self._x_length,
-                len(sample_weights),
+                len(sample_weight_data),
                 "Lengths of input data and sample weights do not match.",
             )
 
-        self.x = x
-        self.y = y
-        self.sample_weight = sample_weights
+        self.x = x_data
+        self.y = y_data
+        self.sample_weight = sample_weight_data
 
         self.batch_size = batch_size
         self.drop_leftovers = drop_leftovers
 
+        self.order = None  # type: Optional[np.ndarray]
+        if shuffle:
+            self.order = np.random.RandomState(shuffle_seed).permutation(self._x_length)
+        self.prefetch = prefetch and hasattr(mmap.mmap, "madvise")
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Pickling a np.memmap copies all of its data, so send dataloader worker processes
+        # enough to map the same files again instead.
+        return {k: _pickle_memmaps(v) for k, v in self.__dict__.items()}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update({k: _unpickle_memmaps(v) for k, v in state.items()})
+
+    def _arrays(self) -> List[np.ndarray]:
+        arrays = []  # type: List[np.ndarray]
+        for data in (self.x, self.y, self.sample_weight):
+            if data is not None:
+                _map_multi_arraylike(data, arrays.append)
+        return arrays
+
+    def _batch_rows(self, index: int) -> Union[np.ndarray, Tuple[int, int]]:
+        """The sorted sample indices of a batch in shuffled mode, or its (start, end) otherwise."""
+        start = index * self.batch_size
+        # The end is not `(index + 1) * self.batch_size` if the
+        # last batch is not a full `self.batch_size`
+        end = min((index + 1) * self.batch_size, self._x_length)
+        if self.order is None:
+            return start, end
+        return np.sort(self.order[start:end])
+
+    def _prefetch(self, index: int) -> None:
+        if index >= len(self):
+            return
+        rows = self._batch_rows(index)
+        if isinstance(rows, tuple):
+            rows = np.arange(*rows)
+        for array in self._arrays():
+            _advise_rows(array, rows)
+
     def __len__(self) -> int:
         # Returns number of batches (keeps last partial batch).
         if self.drop_leftovers:
@@ -126,23 +293,31 @@ class _ArrayLikeAdapter(tf.keras.utils.Sequence):  # type: ignore
         self, index: int
     ) -> Union[Tuple[ArrayLike, ArrayLike], Tuple[ArrayLike, ArrayLike, np.ndarray]]:
         # Gets batch at position index.
-        start = index * self.batch_size
-        # The end is not `(index + 1) * self.batch_size` if the
-        # last batch is not a full `self.batch_size`
-        end = min((index + 1) * self.batch_size, self._x_length)
-
-        if self.sample_weight is None:
-            return (
-                _get_elements_in_multi_arraylike(self.x, start, end),
-                _get_elements_in_multi_arraylike(self.y, start, end),
+        rows = self._batch_rows(index)
+        if isinstance(rows, tuple):
+            start, end = rows
+            batch = tuple(
+                _get_elements_in_multi_arraylike(data, start, end)
+                for data in (self.x, self.y, self.sample_weight)
+                if data is not None
             )
         else:
-            return (
-                _get_elements_in_multi_arraylike(self.x, start, end),
-                _get_elements_in_multi_arraylike(self.y, start, end),
-                self.sample_weight[start:end],
+            batch = tuple(
+                _gather_elements_in_multi_arraylike(data, rows)
+                for data in (self.x, self.y, self.sample_weight)
+                if data is not None
             )
 
+        if self.prefetch:
+            self._prefetch(index + 1)
+        return cast(
+            Union[Tuple[ArrayLike, ArrayLike], Tuple[ArrayLike, ArrayLike, np.ndarray]], batch
+        )
+
+
+# ArrayLikeAdapter was private before it was exposed for memory-mapped data.
+_ArrayLikeAdapter = ArrayLikeAdapter
+
 
 class SequenceAdapter:
     """
@@ -187,7 +362,7 @@ def _adapt_data_from_data_loader(
     y = input_data[1]
     sample_weight = input_data[2] if len(input_data) == 3 else None
 
-    return _ArrayLikeAdapter(x, y, batch_size, sample_weight)
+    return ArrayLikeAdapter(x, y, batch_size, sample_weight)
 
 
 def _adapt_data_from_fit_args(
@@ -210,4 +385,4 @@ def _adapt_data_from_fit_args(
             )
         return x
 
-    return _ArrayLikeAdapter(x, y, batch_size, sample_weight)
+    return ArrayLikeAdapter(x, y, batch_size, sample_weight)
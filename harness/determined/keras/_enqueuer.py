@@ -1,19 +1,38 @@
 import abc
+import atexit
 import collections
+import logging
 import multiprocessing
 import multiprocessing.queues
+import os
 import queue
 import threading
-from typing import Any, Deque, Dict, Iterator, Optional, Type, Union
+import weakref
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Tuple, Type, Union
 
 import numpy as np
 import tensorflow as tf
 
 from determined.common import check
 
+# Shared memory is only available in Python 3.8+; older versions always pickle batches.
+try:
+    from multiprocessing import resource_tracker, shared_memory
+except ImportError:
+    resource_tracker = None  # type: ignore
+    shared_memory = None  # type: ignore
+
 Queue = Union[queue.Queue, multiprocessing.Queue]
 Worker = Union[threading.Thread, multiprocessing.Process]
 
+# Arrays in a shared memory slot start at offsets aligned to this many bytes.
+_SLOT_ALIGNMENT = 64
+# Slots are sized from the first batch, with some headroom for larger batches later on.
+_SLOT_HEADROOM = 1.25
+# Running out of space in /dev/shm kills the writing process with SIGBUS rather than raising an
+# error, so batch slots never take more than this fraction of its free space.
+_SHM_MAX_FRACTION = 0.5
+
 
 class _Sampler:
     """
@@ -172,6 +191,123 @@ def _worker(sequence: tf.keras.utils.Sequence, queries: Queue, answers: Queue) -
         answers.put(None)
 
 
+class _SharedArray:
+    """A placeholder for an ndarray that a worker wrote into a shared memory slot."""
+
+    __slots__ = ("offset", "dtype", "shape")
+
+    def __init__(self, offset: int, dtype: np.dtype, shape: Tuple[int, ...]) -> None:
+        self.offset = offset
+        self.dtype = dtype
+        self.shape = shape
+
+
+class _SharedBatch:
+    """
+    A batch written into a shared memory slot. The batch structure (tuples, lists, and dicts) is
+    preserved, with every ndarray replaced by a _SharedArray.
+    """
+
+    def __init__(self, structure: Any) -> None:
+        self.structure = structure
+
+
+def _aligned(nbytes: int) -> int:
+    return (nbytes + _SLOT_ALIGNMENT - 1) // _SLOT_ALIGNMENT * _SLOT_ALIGNMENT
+
+
+def _shared_nbytes(data: Any) -> int:
+    """The space that the ndarrays in a batch would take in a shared memory slot."""
+    if type(data) in (tuple, list):
+        return sum(_shared_nbytes(d) for d in data)
+    elif type(data) is dict:
+        return sum(_shared_nbytes(d) for d in data.values())
+    elif isinstance(data, np.ndarray) and not data.dtype.hasobject:
+        return _aligned(data.nbytes)
+    return 0
+
+
+def _write_shared(data: Any, buf: memoryview, offset: List[int]) -> Any:
+    """Copy the ndarrays in a batch into buf, starting at offset[0], which is advanced."""
+    if type(data) in (tuple, list):
+        return type(data)(_write_shared(d, buf, offset) for d in data)
+    elif type(data) is dict:
+        return {k: _write_shared(v, buf, offset) for k, v in data.items()}
+    elif isinstance(data, np.ndarray) and not data.dtype.hasobject:
+        shared = _SharedArray(offset[0], data.dtype, data.shape)
+        np.ndarray(data.shape, data.dtype, buffer=buf, offset=offset[0])[...] = data
+        offset[0] += _aligned(data.nbytes)
+        return shared
+    return data
+
+
+def _read_shared(structure: Any, slot: np.ndarray) -> Any:
+    """Rebuild a batch from its _SharedBatch structure, with ndarrays that are views of slot."""
+    if type(structure) in (tuple, list):
+        return type(structure)(_read_shared(d, slot) for d in structure)
+    elif type(structure) is dict:
+        return {k: _read_shared(v, slot) for k, v in structure.items()}
+    elif type(structure) is _SharedArray:
+        nbytes = int(np.prod(structure.shape)) * structure.dtype.itemsize
+        view = slot[structure.offset : structure.offset + nbytes]
+        return view.view(structure.dtype).reshape(structure.shape)
+    return structure
+
+
+# Slots of stopped enqueuers that could not be closed yet, because a batch in them was still
+# referenced. They are closed by the next call to _close_retired_slots() after the batch is freed.
+_retired_slots = []  # type: List[Any]
+
+
+def _close_retired_slots() -> None:
+    still_open = []
+    for shm in _retired_slots:
+        try:
+            shm.close()
+        except BufferError:
+            still_open.append(shm)
+    _retired_slots[:] = still_open
+
+
+atexit.register(_close_retired_slots)
+
+
+def _shared_memory_worker(
+    sequence: tf.keras.utils.Sequence, queries: Queue, answers: Queue
+) -> None:
+    """
+    _shared_memory_worker is the loop of a multiprocessing data loader worker which writes batches
+    into shared memory slots instead of pickling them through the answers queue.
+
+    Parameters:
+        sequence: the user-provided Keras Sequence.
+        queries: a queue of tuples of (index, order, slot), where slot is the (name, size) of a
+            shared memory slot to write the batch into, or None.
+        answers: a queue of tuples of (data, order), where data is a _SharedBatch if the batch was
+            written into the slot, or the batch itself if there was no slot or it did not fit.
+    """
+    attached = {}  # type: Dict[str, Any]
+    try:
+        while True:
+            query = queries.get()
+            if query is None:
+                return
+            i, order, slot = query
+            data = sequence[i]
+            if slot is not None:
+                name, size = slot
+                nbytes = _shared_nbytes(data)
+                if 0 < nbytes <= size:
+                    if name not in attached:
+                        attached[name] = shared_memory.SharedMemory(name=name)
+                    data = _SharedBatch(_write_shared(data, attached[name].buf, [0]))
+            answers.put((data, order))
+    finally:
+        for shm in attached.values():
+            shm.close()
+        answers.put(None)
+
+
 class _ParallelEnqueuer(_Enqueuer):
     """
     _ParallelEnqueuer defines the semantics for either a threading-based or multiprocessing-based
@@ -221,7 +357,9 @@ class _ParallelEnqueuer(_Enqueuer):
         self.answers = self.queue_class()()
 
         self.workers = [
-            self.worker_class()(target=_worker, args=(self.sequence, self.queries, self.answers))
+            self.worker_class()(
+                target=self.worker_target(), args=(self.sequence, self.queries, self.answers)
+            )
             for _ in range(workers)
         ]
 
@@ -258,8 +396,7 @@ class _ParallelEnqueuer(_Enqueuer):
             except StopIteration:
                 self.index_iter = None
                 return
-            puttable = (i, self.order)
-            self.queries.put(puttable)
+            self.queries.put(self.make_query(i, self.order))
             self.requested.append(self.order)
             self.order += 1
 
@@ -274,12 +411,21 @@ class _ParallelEnqueuer(_Enqueuer):
                 if answer is None:
                     raise ValueError("data loading worker finished unexpectedly")
                 data, order = answer
-                self.received[order] = data
+                self.received[order] = self.unpack_answer(data, order)
             data = self.received.pop(target)
             self.fill_requests()
             yield data
         self.sequence.on_epoch_end()
 
+    def worker_target(self) -> Callable[[tf.keras.utils.Sequence, Queue, Queue], None]:
+        return _worker
+
+    def make_query(self, i: int, order: int) -> Any:
+        return (i, order)
+
+    def unpack_answer(self, data: Any, order: int) -> Any:
+        return data
+
     @abc.abstractmethod
     def queue_class(self) -> Type[Queue]:
         pass
@@ -307,7 +453,110 @@ class _ThreadingEnqueuer(_ParallelEnqueuer):
 
 
 class _MultiprocessingEnqueuer(_ParallelEnqueuer):
-    """multiprocessing.Process-specific implementation details."""
+    """
+    multiprocessing.Process-specific implementation details.
+
+    To avoid pickling whole batches through a pipe, workers write the ndarrays of each batch into
+    a ring of preallocated shared memory slots, and only the batch structure crosses the answers
+    queue. The batches yielded by data() are views of a slot, which is recycled once every array
+    of the batch has been garbage collected. Slots are sized when the first batch arrives; while
+    no slot is free, or for batches that do not fit, workers fall back to pickling.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        # Whether workers accept slots at all, and whether the slots are in use.
+        self.shared_memory_workers = shared_memory is not None
+        self.use_shared_memory = self.shared_memory_workers
+        self.slots = []  # type: List[Any]
+        self.slot_size = 0
+        self.free_slots = collections.deque()  # type: Deque[int]
+        self.slot_of_order = {}  # type: Dict[int, int]
+        super().__init__(*args, **kwargs)
+
+    def start(self) -> None:
+        if self.shared_memory_workers:
+            # Workers must share the resource tracker of this process. Otherwise, each worker
+            # starts its own tracker when it attaches to a slot, and that tracker unlinks the slot
+            # when the worker exits.
+            resource_tracker.ensure_running()
+        super().start()
+
+    def worker_target(self) -> Callable[[tf.keras.utils.Sequence, Queue, Queue], None]:
+        return _shared_memory_worker if self.shared_memory_workers else _worker
+
+    def make_query(self, i: int, order: int) -> Any:
+        if not self.shared_memory_workers:
+            return (i, order)
+        if not self.use_shared_memory:
+            return (i, order, None)
+        try:
+            slot = self.free_slots.popleft()
+        except IndexError:
+            return (i, order, None)
+        self.slot_of_order[order] = slot
+        return (i, order, (self.slots[slot].name, self.slot_size))
+
+    def unpack_answer(self, data: Any, order: int) -> Any:
+        if not self.use_shared_memory:
+            return data
+        slot = self.slot_of_order.pop(order, None)
+        if isinstance(data, _SharedBatch):
+            assert slot is not None
+            return self.lease_slot(slot, data)
+        if slot is not None:
+            self.free_slots.append(slot)
+        if not self.slots:
+            self.allocate_slots(_shared_nbytes(data))
+        return data
+
+    def lease_slot(self, slot: int, batch: _SharedBatch) -> Any:
+        # Every array of the batch is a view of this one array, which is only garbage collected
+        # (and the slot freed for another batch) after the last of those views.
+        lease = np.frombuffer(self.slots[slot].buf, dtype=np.uint8, count=self.slot_size)
+        weakref.finalize(lease, self.free_slots.append, slot)
+        return _read_shared(batch.structure, lease)
+
+    def allocate_slots(self, batch_nbytes: int) -> None:
+        if batch_nbytes == 0:
+            # Batches without ndarrays are small; pickling them is fine.
+            self.use_shared_memory = False
+            return
+
+        self.slot_size = _aligned(int(batch_nbytes * _SLOT_HEADROOM))
+        # Enough slots for a full queue plus the batches that are being trained on.
+        num_slots = self.max_queue_size + 2
+        try:
+            stat = os.statvfs("/dev/shm")
+            budget = int(stat.f_bavail * stat.f_frsize * _SHM_MAX_FRACTION)
+            num_slots = min(num_slots, budget // self.slot_size)
+        except OSError:
+            pass
+
+        try:
+            for _ in range(num_slots):
+                self.slots.append(shared_memory.SharedMemory(create=True, size=self.slot_size))
+        except OSError as e:
+            logging.warning(f"Failed to allocate shared memory for data loading: {e}")
+
+        if not self.slots:
+            logging.warning(
+                "Not enough shared memory for data loading, so batches will be pickled instead; "
+                "consider increasing resources.shm_size."
+            )
+            self.use_shared_memory = False
+            return
+        self.free_slots.extend(range(len(self.slots)))
+
+    def stop(self) -> None:
+        super().stop()
+        # Drop batches that were loaded but never yielded, so that their slots can be closed.
+        self.received.clear()
+        for shm in self.slots:
+            shm.unlink()
+        # Slots with batches that are still referenced stay mapped until those batches are freed.
+        _retired_slots.extend(self.slots)
+        self.slots = []
+        _close_retired_slots()
 
     def queue_class(self) -> Type[Queue]:
         return multiprocessing.Queue
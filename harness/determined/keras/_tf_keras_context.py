@@ -80,6 +80,11 @@ class TFKerasContext:
         not provided in the second call will not overwrite any settings configured by the first
         call.
 
+        With ``use_multiprocessing=True`` on Python 3.8 or newer, worker processes pass the NumPy
+        arrays of each batch to the trial through shared memory rather than pickling them. Up to
+        ``max_queue_size + 2`` batches are kept in shared memory at once, so make sure that the
+        ``resources.shm_size`` of the experiment is large enough; otherwise, batches are pickled.
+
         **Usage Example**
 
         .. code:: python
@@ -5,7 +5,7 @@ import pickle
 import random
 import sys
 from abc import abstractmethod
-from typing import Any, Dict, List, Optional, cast
+from typing import Any, Dict, List, Optional, Set, Tuple, cast
 
 import h5py
 import numpy as np
@@ -311,6 +311,11 @@ class TFKerasTrialController(det.LoopTrialController):
             model=self.model, hvd_config=self.hvd_config
         )
 
+        # The signature of our horovod allreduce changed after we rebased onto 0.21.
+        self._hvd_allreduce_params = set()  # type: Set[str]
+        if self.hvd_config.use:
+            self._hvd_allreduce_params = set(inspect.signature(hvd.allreduce).parameters)
+
         self.training_data = train_config.training_data
         self.validation_data = train_config.validation_data
 
@@ -790,31 +795,46 @@ class TFKerasTrialController(det.LoopTrialController):
             else:
                 raise AssertionError(f"Unknown workload kind {wkld.kind}.")
 
-    def _allreduce_logs(self, logs: Dict) -> Dict:
+    def _allreduce_logs(self, logs: Dict, num_inputs: int, name: str) -> Tuple[Dict, int]:
+        """
+        Average logs and sum num_inputs across workers with a single allreduce of every value
+        packed into one float64 vector, rather than one small collective per key.
+        """
         if not self.hvd_config.use:
-            return logs
-        # Reduce logs in key-sorted to be deterministic across workers.
+            return logs, num_inputs
+        # Pack logs in key-sorted order to be deterministic across workers.
         keys = sorted(logs)
         logging.debug(f"all-reducing logs on worker {hvd.rank()} for {len(keys)} keys {keys}.")
-        return {
-            key: np.array(self._hvd_allreduce(logs[key], average=True, name=key)) for key in keys
-        }
+        values = [
+            np.asarray(self._convert_possible_tensor(logs[key]), dtype=np.float64) for key in keys
+        ]
+        packed = [value.ravel() for value in values] + [np.array([num_inputs], dtype=np.float64)]
+        reduced = self._hvd_allreduce(np.concatenate(packed), average=False, name=name)
+        reduced = np.asarray(self._convert_possible_tensor(reduced))
+        num_inputs = int(reduced[-1])
+        # Average with the same sum-then-divide that horovod uses for hvd.Average.
+        reduced = reduced / hvd.size()
+
+        averaged = {}  # type: Dict[str, Any]
+        offset = 0
+        for key, value in zip(keys, values):
+            averaged[key] = reduced[offset : offset + value.size].reshape(value.shape)
+            offset += value.size
+        return averaged, num_inputs
 
     def _hvd_allreduce(self, value: Any, average: bool, name: str) -> Any:
-        # The signature of our horovod allreduce changed after we rebased onto 0.21.
-        hvd_sig = inspect.signature(hvd.allreduce)
         horovod_kwargs = {
             "value": value,
             "name": name,
         }  # type: Dict[str, Any]
 
-        if "op" in hvd_sig.parameters:
+        if "op" in self._hvd_allreduce_params:
             horovod_kwargs["op"] = hvd.Average if average else hvd.Sum
 
             # average has not yet been removed but it's deprecated. It defaults
             # to true and horovod does not support specifying an op while having
             # average be not None.
-            if "average" in hvd_sig.parameters:
+            if "average" in self._hvd_allreduce_params:
                 horovod_kwargs["average"] = None
         else:
             horovod_kwargs["average"] = average
@@ -847,15 +867,15 @@ class TFKerasTrialController(det.LoopTrialController):
                 "as this will affect Determined training behavior",
             )
 
-        if self.hvd_config.use:
-            num_inputs = self._hvd_allreduce(num_inputs, average=False, name="train_num_inputs")
-            num_inputs = self._convert_possible_tensor(num_inputs)
-
         # Return only the latest metrics, which is the running average for all trained batches in
         # the step (Keras does not report individual logs, only running averages at any point).
         final_metrics = self.train_workload_metrics[-1]
         if self.env.experiment_config.averaging_training_metrics_enabled():
-            final_metrics = self._allreduce_logs(final_metrics)
+            final_metrics, num_inputs = self._allreduce_logs(
+                final_metrics, num_inputs, "train_logs"
+            )
+        else:
+            _, num_inputs = self._allreduce_logs({}, num_inputs, "train_num_inputs")
 
         self.multiplexer._train_workload_end(final_metrics)
         self._stop_training_check()
@@ -894,12 +914,7 @@ class TFKerasTrialController(det.LoopTrialController):
             # workers complete evaluation at different speeds.
             _ = self.context.distributed._zmq_gather(None)
 
-            num_inputs = hvd.allreduce(num_inputs, average=False, name="validation_num_inputs")
-            if isinstance(num_inputs, EagerTensor):
-                # Horovod will promote an int to a tensor in eager mode.
-                num_inputs = num_inputs.numpy()
-
-        metrics = self._allreduce_logs(metrics)
+        metrics, num_inputs = self._allreduce_logs(metrics, num_inputs, "validation_logs")
         check.gt(len(metrics), 0)
 
         self.multiplexer._test_end(metrics)
@@ -996,6 +1011,10 @@ class TFKerasTrial(det.Trial):
             2) A tuple ``(x_train, y_train, sample_weights)``
             of NumPy arrays.
 
+            Any array in 1) or 2) may be a ``np.memmap`` or the path to a ``.npy`` file. To
+            shuffle samples within batches or read batches ahead of time, wrap the arrays in a
+            :class:`determined.keras.ArrayLikeAdapter`.
+
             3) A `tf.data.Dataset
             <https://www.tensorflow.org/versions/r1.15/api_docs/python/tf/data/Dataset>`__ returning
             a tuple of either ``(inputs, targets)`` or ``(inputs, targets, sample_weights)``.
@@ -1031,6 +1050,10 @@ class TFKerasTrial(det.Trial):
             2) A tuple ``(x_val, y_val, sample_weights)``
             of NumPy arrays.
 
+            Any array in 1) or 2) may be a ``np.memmap`` or the path to a ``.npy`` file. To
+            shuffle samples within batches or read batches ahead of time, wrap the arrays in a
+            :class:`determined.keras.ArrayLikeAdapter`.
+
             3) A `tf.data.Dataset
             <https://www.tensorflow.org/versions/r1.15/api_docs/python/tf/data/Dataset>`__ returning
             a tuple of either ``(inputs, targets)`` or ``(inputs, targets, sample_weights)``.
@@ -0,0 +1,107 @@
+import contextlib
+import logging
+import os
+import queue
+import threading
+from typing import Iterator, List, Optional, Tuple
+
+from determined.common import storage
+from determined.common.check import check_gt, check_true
+
+# Each queue item is (storage_id, storage_dir, metadata); None tells the upload thread to exit.
+_UploadItem = Optional[Tuple[str, str, storage.StorageMetadata]]
+
+
+class CheckpointUploader:
+    """
+    CheckpointUploader is a drop-in replacement for StorageManager.store_path() which runs the
+    upload step of each checkpoint (StorageManager.post_store_path()) on a background thread, so
+    that training can continue while the checkpoint is uploaded.
+
+    At most max_in_flight checkpoints may be saved locally but not yet uploaded; store_path()
+    blocks until an earlier upload finishes once that limit is reached. The first upload error is
+    re-raised on the calling thread by the next call to store_path(), raise_if_failed(), flush(),
+    or close(). pop_uploaded() returns the checkpoints whose uploads finished, so that the master
+    can be told which checkpoints are safe to restore from.
+    """
+
+    def __init__(self, storage_mgr: storage.StorageManager, max_in_flight: int) -> None:
+        check_gt(max_in_flight, 0, "max_in_flight must be greater than 0")
+        self._storage_mgr = storage_mgr
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        self._queue = queue.Queue()  # type: queue.Queue
+        self._error = None  # type: Optional[Exception]
+        self._uploaded_lock = threading.Lock()
+        self._uploaded = []  # type: List[str]
+
+        self._thread = threading.Thread(
+            target=self._upload_loop, name="CheckpointUploader", daemon=True
+        )
+        self._thread.start()
+
+    def _upload_loop(self) -> None:
+        while True:
+            item = self._queue.get()  # type: _UploadItem
+            if item is None:
+                self._queue.task_done()
+                return
+
+            storage_id, storage_dir, metadata = item
+            try:
+                # After a failure, the trial is going to fail anyway; don't bother uploading more.
+                if self._error is None:
+                    self._storage_mgr.post_store_path(storage_id, storage_dir, metadata)
+                    logging.info("Finished uploading checkpoint {}".format(storage_id))
+                    with self._uploaded_lock:
+                        self._uploaded.append(storage_id)
+            except Exception as e:
+                logging.error("Failed to upload checkpoint {}: {}".format(storage_id, e))
+                self._error = e
+            finally:
+                self._slots.release()
+                self._queue.task_done()
+
+    def pop_uploaded(self) -> List[str]:
+        """Return the storage IDs of the checkpoints uploaded since the last call, oldest first."""
+        with self._uploaded_lock:
+            uploaded, self._uploaded = self._uploaded, []
+        return uploaded
+
+    def raise_if_failed(self) -> None:
+        if self._error is not None:
+            raise self._error
+
+    @contextlib.contextmanager
+    def store_path(self) -> Iterator[Tuple[str, str]]:
+        """
+        Prepare a local directory that will become a checkpoint, just like
+        StorageManager.store_path(). The checkpoint is queued for upload when the context exits.
+        """
+        self.raise_if_failed()
+        self._slots.acquire()
+        try:
+            # An upload may have failed while we were waiting for a free slot.
+            self.raise_if_failed()
+            storage_id, storage_dir = self._storage_mgr._prepare_store_path()
+            yield (storage_id, storage_dir)
+            check_true(os.path.exists(storage_dir), "Checkpoint did not create a storage directory")
+        except BaseException:
+            self._slots.release()
+            raise
+
+        metadata = storage.StorageMetadata(
+            storage_id, storage.StorageManager._list_directory(storage_dir)
+        )
+        logging.info("Uploading checkpoint {} in the background".format(storage_id))
+        self._queue.put((storage_id, storage_dir, metadata))
+
+    def flush(self) -> None:
+        """Block until every queued checkpoint has been uploaded."""
+        self._queue.join()
+        self.raise_if_failed()
+
+    def close(self) -> None:
+        """Upload every queued checkpoint, then stop the background thread."""
+        self._queue.put(None)
+        self._thread.join()
+        self.raise_if_failed()
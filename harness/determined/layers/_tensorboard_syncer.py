@@ -0,0 +1,109 @@
+import logging
+import threading
+import time
+from typing import Optional
+
+from determined import tensorboard
+
+
+class TensorboardSyncer:
+    """
+    TensorboardSyncer runs TensorboardManager.sync() on a background thread, so that responding to
+    the master after a training or validation step does not wait on the storage backend.
+
+    Sync requests are coalesced: a request made while another is still waiting to start is merged
+    into it, so a slow backend is never more than one sync behind. flush() blocks until every
+    request made so far has been synced. The first sync error is re-raised on the calling thread by
+    the next call to raise_if_failed(), flush(), or close().
+
+    The lag of each sync, from the oldest request it covers until the sync finishes, is recorded in
+    last_lag and max_lag (in seconds) and logged when the syncer is closed.
+    """
+
+    def __init__(self, tensorboard_mgr: tensorboard.TensorboardManager) -> None:
+        self._tensorboard_mgr = tensorboard_mgr
+        self._cond = threading.Condition()
+        # Requests are numbered; _started and _completed are the last request covered by the
+        # most recently started and completed syncs, respectively.
+        self._requested = 0
+        self._started = 0
+        self._completed = 0
+        self._pending_since = 0.0
+        self._closing = False
+        self._error = None  # type: Optional[Exception]
+        self._thread = None  # type: Optional[threading.Thread]
+
+        self.num_syncs = 0
+        self.num_coalesced = 0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+
+    def _sync_loop(self) -> None:
+        while True:
+            with self._cond:
+                while self._requested == self._started and not self._closing:
+                    self._cond.wait()
+                if self._requested == self._started:
+                    return
+                target = self._started = self._requested
+                pending_since = self._pending_since
+
+            try:
+                # After a failure, the trial is going to fail anyway; don't bother syncing more.
+                if self._error is None:
+                    self._tensorboard_mgr.sync()
+            except Exception as e:
+                logging.error("Failed to sync Tensorboard files: {}".format(e))
+                self._error = e
+            finally:
+                lag = time.time() - pending_since
+                with self._cond:
+                    self._completed = target
+                    self.num_syncs += 1
+                    self.last_lag = lag
+                    self.max_lag = max(self.max_lag, lag)
+                    self._cond.notify_all()
+                logging.debug("Synced Tensorboard files with a lag of {:.3f}s".format(lag))
+
+    def raise_if_failed(self) -> None:
+        if self._error is not None:
+            raise self._error
+
+    def request_sync(self) -> None:
+        """Ask for a sync to happen soon, without waiting for it."""
+        with self._cond:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._sync_loop, name="TensorboardSyncer", daemon=True
+                )
+                self._thread.start()
+
+            if self._requested > self._started:
+                self.num_coalesced += 1
+            else:
+                self._pending_since = time.time()
+            self._requested += 1
+            self._cond.notify_all()
+
+    def flush(self) -> None:
+        """Sync, and block until every file written before this call has been synced."""
+        with self._cond:
+            self.request_sync()
+            target = self._requested
+            while self._completed < target:
+                self._cond.wait()
+        self.raise_if_failed()
+
+    def close(self) -> None:
+        """Sync any remaining files, then stop the background thread."""
+        with self._cond:
+            self.request_sync()
+            self._closing = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+        logging.info(
+            "Tensorboard syncer ran {} syncs ({} requests coalesced), with a maximum lag of "
+            "{:.3f}s".format(self.num_syncs, self.num_coalesced, self.max_lag)
+        )
+        self.raise_if_failed()
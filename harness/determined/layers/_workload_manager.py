@@ -14,6 +14,8 @@ from determined.common.check import (
     check_not_isinstance,
     check_not_none,
 )
+from determined.layers._checkpoint_uploader import CheckpointUploader
+from determined.layers._tensorboard_syncer import TensorboardSyncer
 
 
 def _current_timestamp() -> datetime:
@@ -43,6 +45,13 @@ class WorkloadManager(workload.Source):
         self.tensorboard_mgr = tensorboard_mgr
         self.callbacks = [metric_writer]  # type: List[det.callback.Callback]
 
+    def close(self) -> None:
+        """
+        Finish any work still running in the background, raising an exception if it failed. This
+        is called however training ends, and may be called more than once.
+        """
+        pass
+
 
 def build_workload_manager(
     env: det.EnvContext,
@@ -82,6 +91,17 @@ class _TrialWorkloadManager(WorkloadManager):
         )
         self.workload = None  # type: Optional[workload.Workload]
 
+        # Tensorboard files are synced in the background so that step responses do not wait on
+        # the storage backend; syncs are flushed at checkpoints and before terminating.
+        self.tensorboard_syncer = TensorboardSyncer(tensorboard_mgr)
+        self._closed = False
+
+        # Only the chief uploads checkpoints, so only the chief needs a background uploader.
+        self.checkpoint_uploader = None  # type: Optional[CheckpointUploader]
+        max_uploads = env.experiment_config.async_checkpoint_uploads()
+        if max_uploads > 0 and rendezvous_info.get_rank() == 0:
+            self.checkpoint_uploader = CheckpointUploader(storage_mgr, max_uploads)
+
     def __iter__(self) -> workload.Stream:
         for w, _, response_func in self.workloads:
             if self.rendezvous_info.get_rank() == 0:
@@ -90,7 +110,13 @@ class _TrialWorkloadManager(WorkloadManager):
                 logging.debug("Running workload {}".format(w))
             self.check_sane_workload(w)
 
+            # Fail the trial as soon as possible if a background upload or sync failed.
+            if self.checkpoint_uploader is not None:
+                self.checkpoint_uploader.raise_if_failed()
+            self.tensorboard_syncer.raise_if_failed()
+
             self.workload = w
+            response_func = self._report_uploads(response_func)
 
             if w.kind == workload.Workload.Kind.RUN_STEP:
                 yield from self.yield_train_for_step(w, response_func)
@@ -103,6 +129,28 @@ class _TrialWorkloadManager(WorkloadManager):
             else:
                 raise AssertionError("Unexpected workload: {}".format(w.kind))
 
+    def _report_uploads(self, respond: workload.ResponseFunc) -> workload.ResponseFunc:
+        """
+        Wrap a response function to tell the master which checkpoints finished uploading in the
+        background. The master only restores trials from checkpoints that are reported as
+        uploaded, so that a trial which crashes mid-upload restarts from an earlier checkpoint.
+        """
+        uploader = self.checkpoint_uploader
+        if uploader is None:
+            return respond
+
+        def _respond(message: workload.Response) -> None:
+            if isinstance(message, dict) and message.get("type") == "WORKLOAD_COMPLETED":
+                uploaded = uploader.pop_uploaded()
+                message["uploaded_checkpoints"] = uploaded
+                if message.get("checkpoint_upload_pending"):
+                    # The checkpoint may have been uploaded already.
+                    metadata = cast(storage.StorageMetadata, message["metrics"])
+                    message["checkpoint_upload_pending"] = metadata.storage_id not in uploaded
+            respond(message)
+
+        return _respond
+
     def check_sane_workload(self, new_workload: workload.Workload) -> None:
         # If this is the initial workload, we don't expect to start with
         # a checkpoint operation. All other workloads are reasonable.
@@ -179,7 +227,7 @@ class _TrialWorkloadManager(WorkloadManager):
                     wkld.step_id, wkld.num_batches, wkld.total_batches_processed, metrics
                 )
 
-            self.tensorboard_mgr.sync()
+            self.tensorboard_syncer.request_sync()
 
             out_response = {
                 "type": "WORKLOAD_COMPLETED",
@@ -244,7 +292,7 @@ class _TrialWorkloadManager(WorkloadManager):
                     wkld.step_id, wkld.total_batches_processed, v_metrics
                 )
 
-            self.tensorboard_mgr.sync()
+            self.tensorboard_syncer.request_sync()
 
             # Check that the validation metrics computed by the model code
             # includes the metric used by the search method.
@@ -341,7 +389,7 @@ class _TrialWorkloadManager(WorkloadManager):
             )
 
             logging.info("Saved trial to checkpoint {}".format(metadata.storage_id))
-            self.tensorboard_mgr.sync()
+            self.tensorboard_syncer.flush()
 
             nonlocal message
             message = {
@@ -350,9 +398,18 @@ class _TrialWorkloadManager(WorkloadManager):
                 "start_time": start_time,
                 "end_time": _current_timestamp(),
                 "metrics": metadata,
+                "checkpoint_upload_pending": self.checkpoint_uploader is not None,
             }
 
-        with self.storage_mgr.store_path() as (storage_id, path):
+        # With asynchronous uploads, the checkpoint is reported to the master as soon as it has
+        # been written locally, and the upload happens while training continues. The master
+        # doesn't restore the trial from it until a later response reports it as uploaded.
+        if self.checkpoint_uploader is not None:
+            store_path = self.checkpoint_uploader.store_path()
+        else:
+            store_path = self.storage_mgr.store_path()
+
+        with store_path as (storage_id, path):
             yield wkld, [pathlib.Path(path)], _respond
 
         # Because the messaging is synchronous, the layer below us must have called _respond.
@@ -361,9 +418,21 @@ class _TrialWorkloadManager(WorkloadManager):
 
         respond(message)
 
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        # Every checkpoint already reported to the master must be uploaded before the trial exits.
+        try:
+            if self.checkpoint_uploader is not None:
+                self.checkpoint_uploader.close()
+        finally:
+            self.tensorboard_syncer.close()
+
     def yield_terminate(
         self, wkld: workload.Workload, respond: workload.ResponseFunc
     ) -> workload.Stream:
+        self.close()
 
         # The master can't actually handle WORKLOAD_COMPLETED messages for TERMINATE workloads.
         def _respond(_: workload.Response) -> None:
@@ -1,22 +1,31 @@
-import contextlib
+import collections
 import logging
+import os
 import queue
+import struct
 import threading
 import time
 from datetime import datetime, timedelta, timezone
 from enum import Enum
 from types import TracebackType
-from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Type, Union, cast
+from typing import Any, Callable, ContextManager, Dict, List, Optional, Tuple, Type, Union, cast
 
+import numpy as np
 import psutil
+import simplejson
 
 import determined as det
 from determined.common import api, check
-from determined.common.api import TrialProfilerMetricsBatch
+from determined.common.api import TrialProfilerMetricsBatch, TrialProfilerMetricsColumns
 
 MAX_COLLECTION_SECONDS = 300
 LOG_NAMESPACE = "determined-profiler"
 
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+# time.time_ns() is only available on Python 3.7+.
+_time_ns = getattr(time, "time_ns", lambda: int(time.time() * 1e9))  # type: Callable[[], int]
+
 
 class PynvmlWrapperError(Exception):
     pass
@@ -151,54 +160,172 @@ class NamedMeasurement(Measurement):
         self.metric_name = metric_name
 
 
-class Timing:
-    def __init__(self, name: str, current_batch_idx: int) -> None:
-        self.name = name
-        self.current_batch_idx = current_batch_idx
-        self.start_time = None  # type: Optional[float]
-        self.dur = None  # type: Optional[float]
+class StartMessage:
+    pass
 
-    def start(self) -> None:
-        self.start_time = time.time()
 
-    def end(self) -> None:
-        check.is_not_none(
-            self.start_time,
-            "Timing has no start time and end() was called. You probably didn't "
-            "run start() before end().",
-        )
-        self.start_time = cast(float, self.start_time)
-        self.dur = time.time() - self.start_time
-
-    def to_measurement(self) -> NamedMeasurement:
-        check.is_not_none(
-            self.start_time,
-            "Timing has no start time and to_measurement() was called. You probably didn't "
-            "run start() before to_measurement().",
-        )
-        check.is_not_none(
-            self.dur,
-            "Timing has no duration and to_measurement() was called. You probably didn't "
-            "run end() before to_measurement().",
+class ShutdownMessage:
+    pass
+
+
+class _TimingBuffer:
+    """
+    A fixed-size ring buffer of timings written by exactly one thread and drained by exactly one
+    other thread. Each side only ever writes its own counter, so no lock is needed: the writer
+    publishes a slot by bumping `head` after filling it in, and the reader frees slots by bumping
+    `tail` after copying them out. When the buffer is full, new timings are dropped and counted.
+
+    The slots are preallocated Python lists rather than NumPy arrays because storing a Python int
+    into a list is several times cheaper than into an array; drain() converts them in bulk.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self.name_ids = [0] * capacity
+        self.starts_ns = [0] * capacity
+        self.durations_ns = [0] * capacity
+        self.batch_idxs = [0] * capacity
+        self.head = 0
+        self.tail = 0
+        self.dropped = 0
+
+    def record(self, name_id: int, start_ns: int, duration_ns: int, batch_idx: int) -> None:
+        head = self.head
+        if head - self.tail >= self.capacity:
+            self.dropped += 1
+            return
+        i = head % self.capacity
+        self.name_ids[i] = name_id
+        self.starts_ns[i] = start_ns
+        self.durations_ns[i] = duration_ns
+        self.batch_idxs[i] = batch_idx
+        self.head = head + 1
+
+    def drain(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        head, tail = self.head, self.tail
+        first, last = tail % self.capacity, head % self.capacity
+
+        def take(slots: List[int]) -> np.ndarray:
+            if head - tail == 0:
+                return np.zeros(0, dtype=np.int64)
+            if first < last:
+                return np.array(slots[first:last], dtype=np.int64)
+            return np.array(slots[first:] + slots[:last], dtype=np.int64)
+
+        drained = (
+            take(self.name_ids),
+            take(self.starts_ns),
+            take(self.durations_ns),
+            take(self.batch_idxs),
         )
-        self.start_time = cast(float, self.start_time)
-        start_time_dt = datetime.fromtimestamp(self.start_time, timezone.utc)
-        self.dur = cast(float, self.dur)
-        return NamedMeasurement(
-            metric_type=MetricType.TIMING,
-            metric_name=self.name,
-            timestamp=start_time_dt,
-            batch_idx=self.current_batch_idx,
-            value=self.dur,
+        self.tail = head
+        return drained
+
+
+class TimingRecorder:
+    """
+    TimingRecorder stores timings in preallocated ring buffers, one per recording thread, so that
+    recording a timing on the training thread is a handful of list stores rather than building
+    datetimes and Python objects and passing them through a locked queue.
+
+    drain() is meant to be called periodically by a single consumer thread (the
+    MetricsBatcherThread), which converts the raw timings in bulk.
+    """
+
+    def __init__(self, capacity: int = 65536) -> None:
+        check.check_gt(capacity, 0, "capacity must be greater than 0")
+        self.capacity = capacity
+        self._names = []  # type: List[str]
+        self._name_ids = {}  # type: Dict[str, int]
+        self._buffers = []  # type: List[_TimingBuffer]
+        self._local = threading.local()
+        # Only taken the first time a name or a thread is seen.
+        self._lock = threading.Lock()
+
+    def thread_buffer(self) -> _TimingBuffer:
+        """Return the calling thread's buffer."""
+        buf = getattr(self._local, "buffer", None)  # type: Optional[_TimingBuffer]
+        if buf is None:
+            buf = _TimingBuffer(self.capacity)
+            with self._lock:
+                self._buffers = self._buffers + [buf]
+            self._local.buffer = buf
+        return buf
+
+    def name_id(self, name: str) -> int:
+        name_id = self._name_ids.get(name)
+        if name_id is None:
+            with self._lock:
+                name_id = self._name_ids.get(name)
+                if name_id is None:
+                    name_id = len(self._names)
+                    self._names.append(name)
+                    self._name_ids[name] = name_id
+        return name_id
+
+    def record(self, name_id: int, start_ns: int, duration_ns: int, batch_idx: int) -> None:
+        self.thread_buffer().record(name_id, start_ns, duration_ns, batch_idx)
+
+    @property
+    def dropped(self) -> int:
+        return sum(buf.dropped for buf in self._buffers)
+
+    def drain(self) -> Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """
+        Remove every recorded timing and return them grouped by name, as arrays of start times
+        (ns since the epoch), batch indices and durations (ns).
+        """
+        columns = [buf.drain() for buf in self._buffers]
+        columns = [c for c in columns if len(c[0])]
+        if not columns:
+            return {}
+        name_ids, starts_ns, durations_ns, batch_idxs = (
+            np.concatenate(col) if len(columns) > 1 else col[0] for col in zip(*columns)
         )
+        drained = {}
+        for name_id in np.unique(name_ids):
+            mask = name_ids == name_id
+            drained[self._names[name_id]] = (starts_ns[mask], batch_idxs[mask], durations_ns[mask])
+        return drained
 
 
-class StartMessage:
-    pass
+class _RecordTiming:
+    """Context manager returned by ProfilerAgent.record_timing() while timings are collected."""
 
+    __slots__ = ("_buffer", "_name_id", "_batch_idx", "_start_ns")
 
-class ShutdownMessage:
-    pass
+    def __init__(self, buffer: _TimingBuffer, name_id: int, batch_idx: int) -> None:
+        self._buffer = buffer
+        self._name_id = name_id
+        self._batch_idx = batch_idx
+        self._start_ns = 0
+
+    def __enter__(self) -> None:
+        self._start_ns = _time_ns()
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        # Like the generator-based version this replaced, failed regions are not recorded.
+        if exc_type is None:
+            start_ns = self._start_ns
+            self._buffer.record(self._name_id, start_ns, _time_ns() - start_ns, self._batch_idx)
+
+
+class _NoopTiming:
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        pass
+
+    def __exit__(self, *args: Any) -> None:
+        pass
+
+
+_NOOP_TIMING = _NoopTiming()
 
 
 def profiling_metrics_exist(master_url: str, trial_id: str) -> bool:
@@ -210,6 +337,7 @@ def profiling_metrics_exist(master_url: str, trial_id: str) -> bool:
 
 
 SendBatchFnType = Callable[[str, List[TrialProfilerMetricsBatch]], None]
+SendColumnsFnType = Callable[[str, List[TrialProfilerMetricsColumns]], None]
 CheckDataExistsFnType = Callable[[str, str], bool]
 
 
@@ -228,6 +356,10 @@ class ProfilerAgent:
     shut down MAX_COLLECTION_SECONDS after starting. When profiling is not active, no system metrics
     are collected and the record_timing function is a no-op.
 
+    If output_path is set, the ProfilerAgent runs offline: metrics are appended to that local file
+    (see ProfilerFileWriter) instead of being sent to the master, the master is not checked for
+    preexisting metrics, and there is no MAX_COLLECTION_SECONDS limit.
+
     Profiling is automatically disabled if profiling metrics already exist in the API. This would
     indicates that the harness restarted due to job failure or being descheduled. Picking up
     profiling in that case introduces issues around multiple data points for the same batch_idx,
@@ -237,6 +369,8 @@ class ProfilerAgent:
 
     send_batch_fn and check_data_exists_fn are the pieces of code that communicate with the
     master API. They can be replaced with dummy functions to enable testing without a master.
+    If send_columns_fn is set, each flush is sent with it in the columnar format instead, and
+    send_batch_fn is only used if the master does not support the columnar format.
     """
 
     # dev note: We optimize this code by only creating threads if they will be used.
@@ -256,6 +390,8 @@ class ProfilerAgent:
         end_after_batch: Optional[int] = None,
         send_batch_fn: SendBatchFnType = api.post_trial_profiler_metrics_batches,
         check_data_exists_fn: CheckDataExistsFnType = profiling_metrics_exist,
+        send_columns_fn: Optional[SendColumnsFnType] = None,
+        output_path: Optional[str] = None,
     ):
         self.current_batch_idx = 0
         self.trial_id = trial_id
@@ -267,6 +403,8 @@ class ProfilerAgent:
         self.begin_on_batch = begin_on_batch
         self.end_after_batch = end_after_batch
         self.send_batch_fn = send_batch_fn
+        self.send_columns_fn = send_columns_fn
+        self.output_path = output_path
         self.check_data_already_exists_fn = check_data_exists_fn
 
         self.has_started = False
@@ -280,9 +418,13 @@ class ProfilerAgent:
         if self.is_enabled:
             self.pynvml_wrapper = PynvmlWrapper()
 
-            self.disabled_due_to_preexisting_metrics = self.check_data_already_exists_fn(
-                self.master_url, self.trial_id
-            )
+            if self.output_path is not None:
+                writer = ProfilerFileWriter(self.output_path)
+                self.send_columns_fn = lambda _, series: writer.write(series)
+            else:
+                self.disabled_due_to_preexisting_metrics = self.check_data_already_exists_fn(
+                    self.master_url, self.trial_id
+                )
             if self.disabled_due_to_preexisting_metrics and self.global_rank == 0:
                 logging.warning(
                     f"{LOG_NAMESPACE}: ProfilerAgent is disabled because profiling data for "
@@ -290,12 +432,16 @@ class ProfilerAgent:
                     f"after a restart."
                 )
 
-            # Set up timer thread to stop collecting after MAX_COLLECTION_SECONDS
-            self.shutdown_timer = PreemptibleTimer(MAX_COLLECTION_SECONDS, self._end_collection)
+            # Set up timer thread to stop collecting after MAX_COLLECTION_SECONDS; offline
+            # collection has no time limit.
+            self.shutdown_timer = PreemptibleTimer(
+                None if self.output_path is not None else MAX_COLLECTION_SECONDS,
+                self._end_collection,
+            )
 
             self.send_queue = (
                 queue.Queue()
-            )  # type: """queue.Queue[Union[List[TrialProfilerMetricsBatch], ShutdownMessage]]"""
+            )  # type: """queue.Queue[Union[List[TrialProfilerMetricsColumns], ShutdownMessage]]"""
 
             num_producers = 0
 
@@ -309,17 +455,32 @@ class ProfilerAgent:
             self.metrics_batcher_queue = (
                 queue.Queue()
             )  # type: """queue.Queue[Union[NamedMeasurement, StartMessage, ShutdownMessage]]"""
+            self.timing_recorder = TimingRecorder()
             self.metrics_batcher_thread = MetricsBatcherThread(
-                trial_id, agent_id, self.metrics_batcher_queue, self.send_queue
+                trial_id,
+                agent_id,
+                self.metrics_batcher_queue,
+                self.send_queue,
+                self.timing_recorder,
             )
 
             self.sender_thread = ProfilerSenderThread(
-                self.send_queue, self.master_url, num_producers, self.send_batch_fn
+                self.send_queue,
+                self.master_url,
+                num_producers,
+                self.send_batch_fn,
+                self.send_columns_fn,
             )
 
     @staticmethod
     def from_env(env: det.EnvContext, global_rank: int, local_rank: int) -> "ProfilerAgent":
         begin_on_batch, end_after_batch = env.experiment_config.profiling_interval()
+        output_dir = env.experiment_config.profiling_output_dir()
+        output_path = None
+        if output_dir is not None:
+            output_path = os.path.join(
+                output_dir, f"trial_{env.det_trial_id}_rank_{global_rank}{PROFILER_FILE_SUFFIX}"
+            )
         return ProfilerAgent(
             trial_id=env.det_trial_id,
             agent_id=env.det_agent_id,
@@ -329,6 +490,8 @@ class ProfilerAgent:
             local_rank=local_rank,
             begin_on_batch=begin_on_batch,
             end_after_batch=end_after_batch,
+            send_columns_fn=api.post_trial_profiler_metrics_columns,
+            output_path=output_path,
         )
 
     # Launch the children threads. This does not mean 'start collecting metrics'
@@ -438,17 +601,14 @@ class ProfilerAgent:
             )
         )
 
-    @contextlib.contextmanager
-    def record_timing(self, metric_name: str) -> Iterator[None]:
+    def record_timing(self, metric_name: str) -> ContextManager[None]:
         if not self.is_enabled or not self.timings_is_enabled or not self.is_active:
-            yield
-            return
-
-        timing = Timing(metric_name, self.current_batch_idx)
-        timing.start()
-        yield
-        timing.end()
-        self.metrics_batcher_queue.put(timing.to_measurement())
+            return _NOOP_TIMING
+        return _RecordTiming(
+            self.timing_recorder.thread_buffer(),
+            self.timing_recorder.name_id(metric_name),
+            self.current_batch_idx,
+        )
 
     def cleanup_timer(self) -> None:
         if not self.is_enabled:
@@ -515,7 +675,7 @@ class PreemptibleTimer(threading.Thread):
     ```
     """
 
-    def __init__(self, duration: int, callback: Callable):
+    def __init__(self, duration: Optional[int], callback: Callable):
         self.duration = duration
         self.callback = callback
         self._timer_has_begun = False
@@ -678,9 +838,13 @@ class MetricsBatcherThread(threading.Thread):
     """
     This is a thread that exists solely so that we can batch measurements and ship them to the
     SenderThread every FLUSH_INTERVAL seconds.
+
+    Timings are not sent through the inbound_queue; they are drained from the TimingRecorder in
+    bulk every DRAIN_INTERVAL seconds instead.
     """
 
     FLUSH_INTERVAL = 10  # How often to make API calls
+    DRAIN_INTERVAL = 1  # How often to empty the TimingRecorder's buffers
 
     def __init__(
         self,
@@ -688,10 +852,13 @@ class MetricsBatcherThread(threading.Thread):
         agent_id: str,
         inbound_queue: queue.Queue,
         send_queue: queue.Queue,
+        timing_recorder: TimingRecorder,
     ) -> None:
         self.inbound_queue = inbound_queue
         self.send_queue = send_queue
+        self.timing_recorder = timing_recorder
         self.metrics_batch = MetricBatch(trial_id, agent_id)
+        self._reported_dropped = 0
         super().__init__(daemon=True)
 
     def activate(self) -> None:
@@ -701,6 +868,20 @@ class MetricsBatcherThread(threading.Thread):
     def send_shutdown_signal(self) -> None:
         self.inbound_queue.put(ShutdownMessage())
 
+    def _drain_timings(self) -> None:
+        for name, (starts_ns, batch_idxs, durations_ns) in self.timing_recorder.drain().items():
+            self.metrics_batch.extend(
+                MetricType.TIMING, name, starts_ns, batch_idxs, durations_ns / 1e9
+            )
+
+        dropped = self.timing_recorder.dropped
+        if dropped > self._reported_dropped:
+            logging.warning(
+                f"{LOG_NAMESPACE}: dropped {dropped - self._reported_dropped} timings because "
+                f"they were recorded faster than they could be collected."
+            )
+            self._reported_dropped = dropped
+
     def run(self) -> None:
         # Do nothing while we wait for a StartMessage
         while True:
@@ -711,27 +892,23 @@ class MetricsBatcherThread(threading.Thread):
                 self.send_queue.put(ShutdownMessage())
                 return
             else:
-                # Ignore any Timings that are received before StartMessage
+                # Ignore any measurements that are received before StartMessage
                 pass
 
-        batch_start_time = None  # type: Optional[float]
+        batch_start_time = time.time()
+        next_drain = batch_start_time + self.DRAIN_INTERVAL
         while True:
-            # Wait for the next Timing to arrive. If it doesn't arrive before the next flush
-            # should happen, we stop waiting for the next Timing and go straight to flushing.
-            timeout = None
-            if batch_start_time is not None:
-                time_since_flush = time.time() - batch_start_time
-                timeout = self.FLUSH_INTERVAL - time_since_flush
-
+            # Wait for the next measurement to arrive, but never for longer than until the next
+            # time the timings should be drained.
+            timeout = max(next_drain - time.time(), 0)
             try:
                 message = self.inbound_queue.get(timeout=timeout)
                 if isinstance(message, ShutdownMessage):
+                    self._drain_timings()
                     self.send_queue.put(self.metrics_batch.consume())
                     self.send_queue.put(ShutdownMessage())
                     return
                 elif isinstance(message, NamedMeasurement):
-                    if batch_start_time is None:
-                        batch_start_time = time.time()
                     self.metrics_batch.append(message.metric_type, message.metric_name, message)
                 else:
                     logging.fatal(
@@ -740,29 +917,36 @@ class MetricsBatcherThread(threading.Thread):
                         f"inbound_queue. This should never happen - there must "
                         f"be a bug in the code."
                     )
-
             except queue.Empty:
                 pass
 
-            check.is_not_none(
-                batch_start_time,
-                "batch_start_time should never be None. The inbound_queue.get() "
-                "should never return and proceed to this piece of code "
-                "without batch_start_time being updated to a real timestamp. If "
-                "batch_start_time is None, inbound_queue.get() timeout should be "
-                "None and the get() should block until a Timing is received.",
-            )
-            batch_start_time = cast(float, batch_start_time)
+            if time.time() < next_drain:
+                continue
+            self._drain_timings()
+            next_drain = time.time() + self.DRAIN_INTERVAL
             if time.time() - batch_start_time > self.FLUSH_INTERVAL:
-                self.send_queue.put(self.metrics_batch.consume())
+                batches = self.metrics_batch.consume()
+                if batches:
+                    self.send_queue.put(batches)
                 batch_start_time = time.time()
 
 
+# (timestamps in ns since the epoch, batch indices, values) of part of a series.
+_Columns = Tuple[np.ndarray, np.ndarray, np.ndarray]
+
+
 class MetricBatch:
+    """
+    MetricBatch accumulates the measurements of each series between flushes. Measurements may be
+    appended one at a time or extended by whole arrays; either way, timestamps are kept as
+    nanoseconds since the epoch and are only converted to strings by to_post_format().
+    """
+
     def __init__(self, trial_id: str, agent_id: str) -> None:
         self.trial_id = trial_id
         self.agent_id = agent_id
         self.batch = {}  # type: Dict[Tuple[MetricType, str, str], List[Measurement]]
+        self.columns = {}  # type: Dict[Tuple[MetricType, str, str], List[_Columns]]
 
     def append(
         self,
@@ -775,16 +959,53 @@ class MetricBatch:
             self.batch[(metric_type, metric_name, gpu_uuid)] = []
         self.batch[(metric_type, metric_name, gpu_uuid)].append(measurement)
 
-    def consume(self) -> List[TrialProfilerMetricsBatch]:
+    def extend(
+        self,
+        metric_type: MetricType,
+        metric_name: str,
+        timestamps_ns: np.ndarray,
+        batch_idxs: np.ndarray,
+        values: np.ndarray,
+        gpu_uuid: str = "",
+    ) -> None:
+        """Append many measurements of one series at once, given as parallel arrays."""
+        check.eq(len(timestamps_ns), len(batch_idxs))
+        check.eq(len(timestamps_ns), len(values))
+        self.columns.setdefault((metric_type, metric_name, gpu_uuid), []).append(
+            (timestamps_ns, batch_idxs, values)
+        )
+
+    def consume(self) -> List[TrialProfilerMetricsColumns]:
         trial_profiler_metrics_batches = []
 
-        for (metric_type, metric_name, gpu_uuid), measurements in self.batch.items():
+        for key in list(self.batch.keys()) + [k for k in self.columns if k not in self.batch]:
+            metric_type, metric_name, gpu_uuid = key
+            chunks = list(self.columns.get(key, []))
+            measurements = self.batch.get(key, [])
             if len(measurements) > 0:
-                labels = MetricBatch.make_labels(
-                    metric_name, self.trial_id, self.agent_id, metric_type.value, gpu_uuid
+                chunks.insert(
+                    0,
+                    (
+                        np.array(
+                            [MetricBatch.convert_to_ns(m.timestamp) for m in measurements],
+                            dtype=np.int64,
+                        ),
+                        np.array([m.batch_idx for m in measurements], dtype=np.int64),
+                        np.array([m.measurement for m in measurements], dtype=np.float64),
+                    ),
                 )
-                batch = MetricBatch.to_post_format(measurements, labels)
-                trial_profiler_metrics_batches.append(batch)
+            if not chunks:
+                continue
+
+            timestamps_ns, batch_idxs, values = (
+                np.concatenate(col) if len(chunks) > 1 else col[0] for col in zip(*chunks)
+            )
+            labels = MetricBatch.make_labels(
+                metric_name, self.trial_id, self.agent_id, metric_type.value, gpu_uuid
+            )
+            trial_profiler_metrics_batches.append(
+                TrialProfilerMetricsColumns(timestamps_ns, batch_idxs, values, labels)
+            )
 
         self.clear()
         return trial_profiler_metrics_batches
@@ -792,17 +1013,20 @@ class MetricBatch:
     def clear(self) -> None:
         for key in self.batch.keys():
             self.batch[key] = []
+        self.columns = {}
 
     @staticmethod
-    def to_post_format(
-        measurements: List[Measurement], labels: Dict[str, Any]
-    ) -> TrialProfilerMetricsBatch:
-        values, batches, timestamps = [], [], []
-        for m in measurements:
-            values.append(m.measurement)
-            batches.append(m.batch_idx)
-            timestamps.append(MetricBatch.convert_to_timestamp_str(m.timestamp))
-        return TrialProfilerMetricsBatch(values, batches, timestamps, labels)
+    def to_post_format(columns: TrialProfilerMetricsColumns) -> TrialProfilerMetricsBatch:
+        timestamps = [
+            MetricBatch.convert_ns_to_timestamp_str(ts)
+            for ts in np.asarray(columns.timestamps_ns, dtype=np.int64).tolist()
+        ]
+        return TrialProfilerMetricsBatch(
+            np.asarray(columns.values, dtype=np.float64).tolist(),
+            np.asarray(columns.batches, dtype=np.int64).tolist(),
+            timestamps,
+            columns.labels,
+        )
 
     @staticmethod
     def make_labels(
@@ -817,9 +1041,9 @@ class MetricBatch:
         }
 
     @staticmethod
-    def convert_to_timestamp_str(timestamp: datetime) -> str:
+    def convert_to_ns(timestamp: datetime) -> int:
         """
-        Convert a datetime object to the string format expected by the API. All timestamps must be
+        Convert a datetime object to nanoseconds since the epoch. All timestamps must be
         timezone-aware datetime.datetimes in UTC.
         """
         # https://docs.python.org/3/library/datetime.html#determining-if-an-object-is-aware-or-naive
@@ -832,7 +1056,12 @@ class MetricBatch:
             f"{utcoffset.total_seconds()}"
         )
 
-        return timestamp.isoformat()
+        return ((timestamp - _EPOCH) // timedelta(microseconds=1)) * 1000
+
+    @staticmethod
+    def convert_ns_to_timestamp_str(timestamp_ns: int) -> str:
+        """Convert nanoseconds since the epoch to the string format expected by the API."""
+        return (_EPOCH + timedelta(microseconds=timestamp_ns // 1000)).isoformat()
 
 
 class ProfilerSenderThread(threading.Thread):
@@ -840,6 +1069,12 @@ class ProfilerSenderThread(threading.Thread):
     This is a thread that exists solely so that we can make API calls without blocking.
     It has a Queue through which work is sent to the thread. It is aware of the number of
     upstream producers and exits whenever it receives a ShutdownMessage from each producer.
+
+    Batches are sent with send_columns_fn when it is set. If the master rejects the columnar
+    format, this thread falls back to send_batch_fn for the rest of its lifetime.
+
+    Everything sent also feeds a BottleneckAnalyzer, whose report is logged once the profiling
+    window ends.
     """
 
     def __init__(
@@ -848,27 +1083,330 @@ class ProfilerSenderThread(threading.Thread):
         master_url: str,
         num_producers: int,
         send_batch_fn: SendBatchFnType,
+        send_columns_fn: Optional[SendColumnsFnType] = None,
     ) -> None:
         self.master_url = master_url
         self.inbound_queue = inbound_queue
         self.num_producers = num_producers
         self.producers_shutdown = 0
         self.send_batch_fn = send_batch_fn
+        self.send_columns_fn = send_columns_fn
+        self.analyzer = BottleneckAnalyzer()
         super().__init__(daemon=True)
 
+    def send(self, series: List[TrialProfilerMetricsColumns]) -> None:
+        if self.send_columns_fn is not None:
+            try:
+                self.send_columns_fn(self.master_url, series)
+                return
+            except (api.errors.APIException, api.errors.UnauthenticatedException) as e:
+                if getattr(e, "status_code", 0) >= 500:
+                    raise
+                logging.info(
+                    f"{LOG_NAMESPACE}: the master did not accept columnar profiler metrics "
+                    f"({e}); falling back to the JSON API."
+                )
+                self.send_columns_fn = None
+
+        self.send_batch_fn(self.master_url, [MetricBatch.to_post_format(s) for s in series])
+
     def run(self) -> None:
         while True:
             message = self.inbound_queue.get()
             if isinstance(message, ShutdownMessage):
                 self.producers_shutdown += 1
                 if self.num_producers == self.producers_shutdown:
+                    report = self.analyzer.report()
+                    if report is not None:
+                        logging.info(f"{LOG_NAMESPACE}: {report}")
                     return
                 else:
                     continue
-            self.send_batch_fn(
-                self.master_url,
-                message,
+            self.analyzer.add(message)
+            self.send(message)
+
+
+PROFILER_FILE_SUFFIX = ".detprof"
+_PROFILER_FILE_MAGIC = b"DETPROF1"
+_RECORD_HEADER = struct.Struct("<I")
+
+
+class ProfilerFileWriter:
+    """
+    ProfilerFileWriter appends profiler series to a local file, for offline profiling.
+
+    The file starts with an 8-byte magic string followed by any number of records. Each record is
+    a little-endian uint32 length, a JSON header of that length holding the series labels and the
+    number of measurements n, then n int64 timestamps (ns since the epoch), n int64 batch indices
+    and n float64 values, all little-endian. Every write() appends whole records and flushes, so a
+    file being written can be read at any time and a crash loses at most the last record.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(self.path, "ab") as f:
+            if f.tell() == 0:
+                f.write(_PROFILER_FILE_MAGIC)
+
+    def write(self, series: List[TrialProfilerMetricsColumns]) -> None:
+        with open(self.path, "ab") as f:
+            for s in series:
+                header = simplejson.dumps({"labels": s.labels, "n": len(s.values)}).encode("utf-8")
+                f.write(_RECORD_HEADER.pack(len(header)))
+                f.write(header)
+                f.write(np.asarray(s.timestamps_ns).astype("<i8", copy=False).tobytes())
+                f.write(np.asarray(s.batches).astype("<i8", copy=False).tobytes())
+                f.write(np.asarray(s.values).astype("<f8", copy=False).tobytes())
+
+
+def read_profiler_file(path: str) -> List[TrialProfilerMetricsColumns]:
+    """
+    Read a file written by ProfilerFileWriter, returning one TrialProfilerMetricsColumns per
+    series with all of its records concatenated. A truncated last record is ignored.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    if not data.startswith(_PROFILER_FILE_MAGIC):
+        raise ValueError(f"{path} is not a profiler file")
+
+    # Both keyed by the series labels as canonical JSON.
+    labels = {}  # type: Dict[str, Dict[str, Any]]
+    columns = {}  # type: Dict[str, Tuple[List[np.ndarray], List[np.ndarray], List[np.ndarray]]]
+    offset = len(_PROFILER_FILE_MAGIC)
+    while offset < len(data):
+        if offset + _RECORD_HEADER.size > len(data):
+            break
+        (header_len,) = _RECORD_HEADER.unpack_from(data, offset)
+        start = offset + _RECORD_HEADER.size
+        header_end = start + header_len
+        if header_end > len(data):
+            break
+        header = simplejson.loads(data[start:header_end].decode("utf-8"))
+        n = header["n"]
+        record_end = header_end + 24 * n
+        if record_end > len(data):
+            break
+        timestamps_ns = np.frombuffer(data, dtype="<i8", count=n, offset=header_end)
+        batches = np.frombuffer(data, dtype="<i8", count=n, offset=header_end + 8 * n)
+        values = np.frombuffer(data, dtype="<f8", count=n, offset=header_end + 16 * n)
+
+        key = simplejson.dumps(header["labels"], sort_keys=True)
+        if key not in labels:
+            labels[key] = header["labels"]
+            columns[key] = ([], [], [])
+        columns[key][0].append(timestamps_ns)
+        columns[key][1].append(batches)
+        columns[key][2].append(values)
+        offset = record_end
+
+    if offset < len(data):
+        logging.warning(f"{LOG_NAMESPACE}: ignoring a truncated record at the end of {path}")
+
+    return [
+        TrialProfilerMetricsColumns(
+            np.concatenate(timestamps_ns),
+            np.concatenate(batches),
+            np.concatenate(values),
+            labels[key],
+        )
+        for key, (timestamps_ns, batches, values) in columns.items()
+    ]
+
+
+def timing_breakdown(series: List[TrialProfilerMetricsColumns]) -> List[Dict[str, Any]]:
+    """
+    Summarize the timing series among the given series, one row per timing name, ordered by total
+    time spent. Timings with the same name from different agents and ranks are combined. Each row
+    has the count, the total in seconds, the mean, median, 95th percentile and maximum in
+    milliseconds, and the percentage of the profiled wall-clock time spent in it, averaged over
+    the series that recorded it.
+    """
+    timings = [s for s in series if s.labels.get("metricType") == MetricType.TIMING.value]
+    if not timings:
+        return []
+
+    # Timings are recorded by start time, so the profiled span runs from the first start to the
+    # latest end.
+    first = min(int(s.timestamps_ns.min()) for s in timings)
+    last = max(int((s.timestamps_ns + (s.values * 1e9).astype(np.int64)).max()) for s in timings)
+    span = max(last - first, 1) / 1e9
+
+    by_name = collections.defaultdict(list)  # type: Dict[str, List[np.ndarray]]
+    for s in timings:
+        by_name[s.labels["name"]].append(np.asarray(s.values, dtype=np.float64))
+
+    rows = []
+    for name, values in by_name.items():
+        durations = np.concatenate(values)
+        rows.append(
+            {
+                "name": name,
+                "count": len(durations),
+                "total_s": float(durations.sum()),
+                "mean_ms": float(durations.mean() * 1e3),
+                "p50_ms": float(np.percentile(durations, 50) * 1e3),
+                "p95_ms": float(np.percentile(durations, 95) * 1e3),
+                "max_ms": float(durations.max() * 1e3),
+                "percent": float(durations.sum() / (span * len(values)) * 100),
+            }
+        )
+    return sorted(rows, key=lambda r: -r["total_s"])
+
+
+# The timings that make up each kind of bottleneck. Per-batch and per-step timings are mixed, so
+# categories are compared by the total time spent in them.
+_BOTTLENECK_TIMINGS = {
+    "input-pipeline-bound": ["dataloader_next"],
+    "host-device-transfer-bound": ["to_device", "from_device"],
+    "compute-bound": ["train_batch", "step_lr_schedulers"],
+    "sync-bound": ["average_training_metrics", "reduce_metrics"],
+}
+
+
+class BottleneckReport:
+    """
+    The result of BottleneckAnalyzer.report(): the share of time spent in each kind of work,
+    the dominant one (classification) and suggestions for relieving it.
+    """
+
+    def __init__(
+        self,
+        classification: str,
+        breakdown: Dict[str, float],
+        gpu_util: Optional[float],
+        cpu_util: Optional[float],
+        samples_per_second: Optional[float],
+        suggestions: List[str],
+    ) -> None:
+        self.classification = classification
+        self.breakdown = breakdown
+        self.gpu_util = gpu_util
+        self.cpu_util = cpu_util
+        self.samples_per_second = samples_per_second
+        self.suggestions = suggestions
+
+    def __str__(self) -> str:
+        lines = [f"bottleneck report: the trial is {self.classification}"]
+        for category, fraction in sorted(self.breakdown.items(), key=lambda kv: -kv[1]):
+            timings = ", ".join(_BOTTLENECK_TIMINGS[category])
+            lines.append(f"  {category}: {fraction * 100:.1f}% of time ({timings})")
+        for label, value, unit in [
+            ("GPU utilization", self.gpu_util, "%"),
+            ("CPU utilization", self.cpu_util, "%"),
+            ("samples per second", self.samples_per_second, ""),
+        ]:
+            if value is not None:
+                lines.append(f"  {label}: {value:.1f}{unit}")
+        lines.extend(["  suggestions:"] + [f"    - {s}" for s in self.suggestions])
+        return "\n".join(lines)
+
+
+class BottleneckAnalyzer:
+    """
+    BottleneckAnalyzer keeps running totals of profiler series, so it can consume every flush of
+    a profiling window without holding on to the measurements, and classifies the window as
+    input-pipeline-bound, host-device-transfer-bound, compute-bound or sync-bound.
+    """
+
+    def __init__(self) -> None:
+        # (metric type, name) -> [number of measurements, sum of values]
+        self._totals = {}  # type: Dict[Tuple[str, str], List[float]]
+
+    def add(self, series: List[TrialProfilerMetricsColumns]) -> None:
+        for s in series:
+            if not len(s.values):
+                continue
+            key = (s.labels.get("metricType", ""), s.labels.get("name", ""))
+            totals = self._totals.setdefault(key, [0, 0.0])
+            totals[0] += len(s.values)
+            totals[1] += float(np.sum(s.values))
+
+    def _mean(self, metric_type: MetricType, name: str) -> Optional[float]:
+        count, total = self._totals.get((metric_type.value, name), (0, 0.0))
+        return total / count if count else None
+
+    def report(self) -> Optional[BottleneckReport]:
+        """Return the report for everything added so far, or None if no timings were added."""
+        time_spent = {
+            category: sum(
+                self._totals.get((MetricType.TIMING.value, name), (0, 0.0))[1] for name in names
+            )
+            for category, names in _BOTTLENECK_TIMINGS.items()
+        }
+        total = sum(time_spent.values())
+        if total <= 0:
+            return None
+
+        breakdown = {category: spent / total for category, spent in time_spent.items() if spent}
+        classification = max(breakdown, key=lambda category: breakdown[category])
+        gpu_util = self._mean(MetricType.SYSTEM, SysMetricName.GPU_UTIL_METRIC)
+        cpu_util = self._mean(MetricType.SYSTEM, SysMetricName.SIMPLE_CPU_UTIL_METRIC)
+        samples_per_second = self._mean(MetricType.MISC, "samples_per_second")
+
+        return BottleneckReport(
+            classification,
+            breakdown,
+            gpu_util,
+            cpu_util,
+            samples_per_second,
+            self._suggest(classification, gpu_util, cpu_util),
+        )
+
+    @staticmethod
+    def _suggest(
+        classification: str, gpu_util: Optional[float], cpu_util: Optional[float]
+    ) -> List[str]:
+        suggestions = []
+        if classification == "input-pipeline-bound":
+            if cpu_util is not None and cpu_util > 90:
+                suggestions.append(
+                    "The CPU is saturated; move expensive preprocessing (decoding, augmentation) "
+                    "offline or cache its results."
+                )
+            suggestions.append(
+                "Increase num_workers of the DataLoader so that batches are prepared in parallel "
+                "with training."
+            )
+            suggestions.append(
+                "In a PyTorchTrial, call context.experimental.prefetch_to_device() to load "
+                "batches ahead of time on a background thread."
             )
+        elif classification == "host-device-transfer-bound":
+            suggestions.append(
+                "Pass pin_memory=True to the DataLoader so that copies to the GPU are faster."
+            )
+            suggestions.append(
+                "In a PyTorchTrial, call context.experimental.prefetch_to_device() to overlap "
+                "copies to the GPU with train_batch."
+            )
+            suggestions.append(
+                "Increase global_batch_size so that fewer, larger transfers are made per record."
+            )
+        elif classification == "compute-bound":
+            if gpu_util is not None and gpu_util < 80:
+                suggestions.append(
+                    f"GPU utilization is only {gpu_util:.0f}%; increase global_batch_size to give "
+                    "the GPU more work per batch."
+                )
+            suggestions.append("Enable mixed precision training to speed up compute.")
+        elif classification == "sync-bound":
+            suggestions.append(
+                "Set optimizations.average_training_metrics to false to avoid averaging training "
+                "metrics across processes at every step."
+            )
+            suggestions.append(
+                "Increase scheduling_unit so that metrics are reduced less often, or simplify "
+                "custom metric reducers."
+            )
+        return suggestions
+
+
+def bottleneck_report(series: List[TrialProfilerMetricsColumns]) -> Optional[BottleneckReport]:
+    """Classify the bottleneck of the given profiler series; see BottleneckAnalyzer."""
+    analyzer = BottleneckAnalyzer()
+    analyzer.add(series)
+    return analyzer.report()
 
 
 GIGA = 1_000_000_000
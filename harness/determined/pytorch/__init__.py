@@ -12,12 +12,22 @@ from determined.pytorch._data import (
 from determined.pytorch._callback import PyTorchCallback
 from determined.pytorch._lr_scheduler import LRScheduler
 from determined.pytorch._reducer import (
+    HistogramMetricReducer,
+    MaxMetricReducer,
+    MeanMetricReducer,
+    MergeableMetricReducer,
     MetricReducer,
+    MinMetricReducer,
+    QuantileMetricReducer,
+    SumMetricReducer,
+    _make_mergeable_reducer,
+    _merge_reducers,
     _PyTorchReducerContext,
     _SimpleReducer,
     Reducer,
     _reduce_metrics,
 )
+from determined.pytorch._prefetch import _DevicePrefetcher
 from determined.pytorch._experimental import PyTorchExperimentalContext
 from determined.pytorch._pytorch_context import PyTorchTrialContext
 from determined.pytorch._pytorch_trial import PyTorchTrial, PyTorchTrialController, reset_parameters
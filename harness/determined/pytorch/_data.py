@@ -9,6 +9,8 @@ from typing import (
     Optional,
     Sequence,
     Set,
+    Sized,
+    Tuple,
     Type,
     TypeVar,
     Union,
@@ -158,7 +160,9 @@ class DataLoader:
             #    else:
             #        sampler = SequentialSampler(dataset)
             if shuffle:
-                sampler = RandomSampler(dataset)  # type: ignore
+                # Unlike RandomSampler, _SeededRandomSampler can compute the order of any epoch
+                # directly, so resuming training does not have to replay every skipped batch.
+                sampler = _SeededRandomSampler(dataset)  # type: ignore
             else:
                 sampler = SequentialSampler(dataset)  # type: ignore
 
@@ -218,6 +222,93 @@ class DataLoader:
         return len(batch_sampler)
 
 
+class _SeededRandomSampler(RandomSampler):
+    """
+    _SeededRandomSampler samples without replacement in a random order, like RandomSampler. The
+    order of each epoch is a function of a seed, drawn from the torch random number generator when
+    the sampler is created, and the epoch number, so that the order of any epoch can be computed
+    without iterating through the previous ones.
+    """
+
+    def __init__(self, data_source: Sized) -> None:
+        super().__init__(data_source)  # type: ignore
+        self.seed = int(torch.empty((), dtype=torch.int64).random_().item())
+        self.epoch = 0
+
+    def epoch_indices(self, epoch: int) -> List[int]:
+        generator = torch.Generator()
+        generator.manual_seed(self.seed + epoch)
+        return cast(List[int], torch.randperm(len(self.data_source), generator=generator).tolist())
+
+    def __iter__(self) -> Iterator[int]:
+        indices = self.epoch_indices(self.epoch)
+        self.epoch += 1
+        return iter(indices)
+
+
+class _EpochBatches:
+    """The batches of one epoch of a BatchSampler, computed on demand from the epoch's indices."""
+
+    def __init__(self, indices: Sequence[int], batch_size: int, drop_last: bool) -> None:
+        self.indices = indices
+        self.batch_size = batch_size
+        if drop_last:
+            self.length = len(indices) // batch_size
+        else:
+            self.length = (len(indices) + batch_size - 1) // batch_size
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __getitem__(self, idx: int) -> List[int]:
+        start = idx * self.batch_size
+        return list(self.indices[start : start + self.batch_size])
+
+
+def _has_epoch_batches(batch_sampler: torch.utils.data.BatchSampler) -> bool:
+    """
+    Return whether batch_sampler is a plain BatchSampler whose sampler has an order that is known
+    without iterating it, so that _epoch_batches() can compute its batches directly.
+    """
+    return type(batch_sampler) is BatchSampler and type(batch_sampler.sampler) in (
+        SequentialSampler,
+        _SeededRandomSampler,
+    )
+
+
+def _epoch_batches(batch_sampler: torch.utils.data.BatchSampler, epoch: int) -> _EpochBatches:
+    """Return the batches that batch_sampler yields in the given epoch; see _has_epoch_batches."""
+    sampler = batch_sampler.sampler
+    if isinstance(sampler, _SeededRandomSampler):
+        indices = sampler.epoch_indices(epoch)  # type: Sequence[int]
+    else:
+        indices = range(len(sampler.data_source))  # type: ignore
+    return _EpochBatches(indices, batch_sampler.batch_size, batch_sampler.drop_last)
+
+
+def _seek(
+    batch_sampler: torch.utils.data.BatchSampler, start: int, step: int = 1
+) -> Optional[Iterator[List[int]]]:
+    """
+    Return an iterator over batches start, start + step, start + 2 * step, ... of batch_sampler,
+    computed directly rather than by iterating over the batches in between, or None if
+    batch_sampler does not support seeking.
+
+    Samplers built from SequentialSampler, _SeededRandomSampler, and the batch samplers in this
+    module support seeking. A plain BatchSampler over a _SeededRandomSampler only supports seeking
+    when wrapped in a RepeatBatchSampler, which tracks the epoch number.
+    """
+    if isinstance(batch_sampler, (RepeatBatchSampler, DistributedBatchSampler, SkipBatchSampler)):
+        return batch_sampler._seek(start, step)
+    if (
+        type(batch_sampler) is not BatchSampler
+        or type(batch_sampler.sampler) is not SequentialSampler
+    ):
+        return None
+    batches = _epoch_batches(batch_sampler, 0)
+    return (batches[i] for i in range(start, len(batches), step))
+
+
 def adapt_batch_sampler(
     batch_sampler: torch.utils.data.BatchSampler,
     repeat: bool = False,
@@ -260,9 +351,31 @@ class RepeatBatchSampler(torch.utils.data.BatchSampler):
         return len(self.batch_sampler)
 
     def __iter__(self) -> Generator:
+        iterator = self._seek(0)
+        if iterator is not None:
+            yield from iterator
+            return
         while True:
             yield from self.batch_sampler
 
+    def _seek(self, start: int, step: int = 1) -> Optional[Iterator[List[int]]]:
+        epoch_len = len(self.batch_sampler)
+        if epoch_len == 0 or not _has_epoch_batches(self.batch_sampler):
+            return None
+        return self._iter_positions(start, step, epoch_len)
+
+    def _iter_positions(self, start: int, step: int, epoch_len: int) -> Iterator[List[int]]:
+        current_epoch = start // epoch_len
+        batches = _epoch_batches(self.batch_sampler, current_epoch)
+        position = start
+        while True:
+            epoch, idx = divmod(position, epoch_len)
+            if epoch != current_epoch:
+                current_epoch = epoch
+                batches = _epoch_batches(self.batch_sampler, epoch)
+            yield batches[idx]
+            position += step
+
 
 class DistributedBatchSampler(torch.utils.data.BatchSampler):
     """
@@ -303,10 +416,19 @@ class DistributedBatchSampler(torch.utils.data.BatchSampler):
     def __iter__(self) -> Generator:
         if self.num_replicas == 1:
             yield from self.batch_sampler
-        else:
-            for i, batch in enumerate(self.batch_sampler):
-                if i % self.num_replicas == self.rank:
-                    yield batch
+            return
+        iterator = _seek(self.batch_sampler, self.rank, self.num_replicas)
+        if iterator is not None:
+            yield from iterator
+            return
+        for i, batch in enumerate(self.batch_sampler):
+            if i % self.num_replicas == self.rank:
+                yield batch
+
+    def _seek(self, start: int, step: int = 1) -> Optional[Iterator[List[int]]]:
+        return _seek(
+            self.batch_sampler, start * self.num_replicas + self.rank, step * self.num_replicas
+        )
 
 
 class SkipBatchSampler(torch.utils.data.BatchSampler):
@@ -334,6 +456,12 @@ class SkipBatchSampler(torch.utils.data.BatchSampler):
         return self.length
 
     def __iter__(self) -> Generator:
+        seeked = _seek(self.batch_sampler, self.skip)
+        if seeked is not None:
+            yield from seeked
+            return
+
+        # Fall back to skipping batches one at a time for samplers that cannot seek.
         iterator = iter(self.batch_sampler)
         for _ in range(self.skip):
             try:
@@ -342,6 +470,9 @@ class SkipBatchSampler(torch.utils.data.BatchSampler):
                 return
         yield from iterator
 
+    def _seek(self, start: int, step: int = 1) -> Optional[Iterator[List[int]]]:
+        return _seek(self.batch_sampler, self.skip + start, step)
+
 
 def data_length(data: _Data) -> int:
     """
@@ -377,8 +508,148 @@ def data_length(data: _Data) -> int:
     raise TypeError("Data of incorrect type: {}".format(type(data)))
 
 
+# Tensors up to this size that are moved off the host are coalesced into a single copy per dtype,
+# which saves the per-copy overhead of many small tensors. Larger tensors gain nothing from this
+# and would pay for an extra host-side copy, so they are moved on their own.
+_COALESCE_MAX_BYTES = 1 << 20
+
+
+class _Pending:
+    """A placeholder for a host tensor that is waiting for a coalesced copy to the device."""
+
+    __slots__ = ("dtype", "index")
+
+    def __init__(self, dtype: torch.dtype, index: int) -> None:
+        self.dtype = dtype
+        self.index = index
+
+
+class _BatchTransfer:
+    """
+    _BatchTransfer moves one batch to a device. Leaves are converted by handlers which are looked up
+    by the exact type of each item and cached in _handlers, so the isinstance checks only run the
+    first time a type is seen.
+
+    When the device is not the CPU, small host tensors are replaced by _Pending placeholders and
+    grouped by dtype; finish() copies each group as one flat buffer and substitutes views of it.
+    """
+
+    def __init__(self, device: torch.device, warned_types: Set[Type], non_blocking: bool) -> None:
+        self.device = device
+        self.warned_types = warned_types
+        self.non_blocking = non_blocking
+        self.off_host = device.type != "cpu"
+        # Only copies from page-locked memory to a GPU can be asynchronous.
+        self.pin = non_blocking and device.type == "cuda"
+        self.pending = {}  # type: Dict[torch.dtype, List[torch.Tensor]]
+
+    def convert(self, data: Any) -> Any:
+        handler = _handlers.get(type(data))
+        if handler is None:
+            handler = _handlers[type(data)] = _resolve_handler(type(data))
+        return handler(self, data)
+
+    def convert_dict(self, data: Dict) -> Dict:
+        return {k: self.convert(v) for k, v in data.items()}
+
+    def convert_list(self, data: List) -> List:
+        return [self.convert(d) for d in data]
+
+    def convert_tuple(self, data: Tuple) -> Tuple:
+        return tuple(self.convert(d) for d in data)
+
+    def convert_ndarray(self, data: np.ndarray) -> Any:
+        # Torch supports floats, complex floats, ints, uints, and bools as tensors.
+        # Those correspond to numpy dtype kinds: "f", "c", "i", "u", and "b", respectively.
+        # Do not attempt to convert any other kinds to tensors.
+        if data.dtype.kind in "fciub":
+            return self.convert_tensor(torch.from_numpy(data))
+        return self.convert_unsupported(data)
+
+    def convert_tensor(self, data: torch.Tensor) -> Any:
+        if data.device == self.device:
+            # Skip the dispatch overhead of a .to() call that would return data itself.
+            return data
+        if (
+            not self.off_host
+            or data.device.type != "cpu"
+            or data.requires_grad
+            # Only dense, unquantized tensors can be packed into a flat buffer.
+            or data.layout != torch.strided
+            or data.is_quantized
+        ):
+            return data.to(self.device, non_blocking=self.non_blocking)
+        if data.numel() * data.element_size() > _COALESCE_MAX_BYTES:
+            if self.pin and not data.is_pinned():
+                data = data.pin_memory()
+            return data.to(self.device, non_blocking=self.non_blocking)
+        group = self.pending.setdefault(data.dtype, [])
+        group.append(data)
+        return _Pending(data.dtype, len(group) - 1)
+
+    def convert_other(self, data: Any) -> Any:
+        if hasattr(data, "to") and callable(data.to):
+            return data.to(self.device)
+        return self.convert_unsupported(data)
+
+    def convert_unsupported(self, data: Any) -> Any:
+        if type(data) not in self.warned_types:
+            self.warned_types.add(type(data))
+            logging.warning(
+                f"Was not able to move data item of type '{type(data).__name__}' to device."
+            )
+        return data
+
+    def finish(self, data: Any) -> Any:
+        if not self.pending:
+            return data
+
+        moved = {}  # type: Dict[torch.dtype, List[torch.Tensor]]
+        for dtype, group in self.pending.items():
+            sizes = [t.numel() for t in group]
+            flat = torch.empty(sum(sizes), dtype=dtype, pin_memory=self.pin)
+            torch.cat([t.reshape(-1) for t in group], out=flat)
+            flat = flat.to(self.device, non_blocking=self.non_blocking)
+            views = flat.split(sizes)  # type: ignore
+            moved[dtype] = [v.view(t.shape) for v, t in zip(views, group)]
+        return _fill_pending(data, moved)
+
+
+def _fill_pending(data: Any, moved: Dict[torch.dtype, List[torch.Tensor]]) -> Any:
+    # Containers here were all rebuilt by _BatchTransfer, so they have exactly these types.
+    if type(data) is dict:
+        return {k: _fill_pending(v, moved) for k, v in data.items()}
+    elif type(data) is list:
+        return [_fill_pending(d, moved) for d in data]
+    elif type(data) is tuple:
+        return tuple(_fill_pending(d, moved) for d in data)
+    elif type(data) is _Pending:
+        return moved[data.dtype][data.index]
+    return data
+
+
+def _resolve_handler(data_type: Type) -> Callable[[_BatchTransfer, Any], Any]:
+    if issubclass(data_type, dict):
+        return _BatchTransfer.convert_dict
+    elif issubclass(data_type, list):
+        return _BatchTransfer.convert_list
+    elif issubclass(data_type, tuple):
+        return _BatchTransfer.convert_tuple
+    elif issubclass(data_type, np.ndarray):
+        return _BatchTransfer.convert_ndarray
+    elif issubclass(data_type, torch.Tensor):
+        return _BatchTransfer.convert_tensor
+    return _BatchTransfer.convert_other
+
+
+_handlers = {}  # type: Dict[Type, Callable[[_BatchTransfer, Any], Any]]
+
+
 def to_device(
-    data: _Data, device: torch.device, warned_types: Optional[Set[Type]] = None
+    data: _Data,
+    device: torch.device,
+    warned_types: Optional[Set[Type]] = None,
+    non_blocking: bool = False,
 ) -> TorchData:
     """
     Accept np.ndarray, torch.Tensor, list, or dictionary. Recursively convert any ndarrays to
@@ -387,30 +658,16 @@ def to_device(
 
     If the data cannot be moved to device, log a warning (only once per type) and return the
     original data.
+
+    When moving data off the CPU, small tensors of the same dtype are copied to the device together
+    in a single transfer and returned as views of one device buffer. With non_blocking=True,
+    tensors are staged in pinned memory when moving to a GPU, so the copies are asynchronous.
     """
     # Never print errors recursively.
     if warned_types is None:
         warned_types = set()
+    if not isinstance(device, torch.device):
+        device = torch.device(device)
 
-    if isinstance(data, dict):
-        return {k: to_device(v, device, warned_types) for k, v in data.items()}  # type: ignore
-    elif isinstance(data, list):
-        return [to_device(d, device, warned_types) for d in data]  # type: ignore
-    elif isinstance(data, tuple):
-        return tuple(to_device(d, device, warned_types) for d in data)  # type: ignore
-    elif isinstance(data, np.ndarray):
-        # Torch supports floats, complex floats, ints, uints, and bools as tensors.
-        # Those correspond to numpy dtype kinds: "f", "c", "i", "u", and "b", respectively.
-        # Do not attempt to convert any other kinds to tensors.
-        if data.dtype.kind in "fciub":
-            return torch.from_numpy(data).to(device)
-    elif hasattr(data, "to") and callable(data.to):  # type: ignore
-        return data.to(device)  # type: ignore
-
-    if type(data) not in warned_types:
-        warned_types.add(type(data))
-        logging.warning(
-            f"Was not able to move data item of type '{type(data).__name__}' to device."
-        )
-
-    return data  # type:ignore
+    transfer = _BatchTransfer(device, warned_types, non_blocking)
+    return cast(TorchData, transfer.finish(transfer.convert(data)))
@@ -1,6 +1,7 @@
 from typing import Any, Callable, Dict, Optional, Union, cast
 
 from determined import pytorch, util
+from determined.common import check
 
 # AMP is only available in PyTorch 1.6+
 try:
@@ -14,6 +15,7 @@ class PyTorchExperimentalContext:
     def __init__(self, parent: Any) -> None:
         self._parent = parent
         self._auto_amp = False
+        self._prefetch_depth = 0
 
     def use_amp(self) -> None:
         """
@@ -28,6 +30,29 @@ class PyTorchExperimentalContext:
         self._parent.wrap_scaler(amp.GradScaler())  # type: ignore
         self._auto_amp = True
 
+    def prefetch_to_device(self, depth: int = 2) -> None:
+        """
+        Load training batches and move them to the device on a background thread, up to ``depth``
+        batches ahead of the batch being trained on, so that data loading and host-to-device
+        copies overlap with ``train_batch()``. On a GPU, batches are copied from pinned host
+        memory with non-blocking copies on a separate CUDA stream.
+
+        Batches passed to ``train_batch()`` are already on the device, and each prefetched batch
+        holds device memory until it is used, so larger values of ``depth`` use more GPU memory.
+        Call this method in the ``__init__`` method of the trial.
+
+        .. warning::
+            The random number generators of Python, NumPy and PyTorch are shared by every thread
+            of a process, so random data augmentations that run on the background thread draw
+            random numbers in an order that interleaves nondeterministically with those drawn by
+            ``train_batch()`` (e.g., for dropout). Training is then not reproducible even with a
+            fixed seed. To keep it reproducible, load data with ``num_workers`` greater than 0,
+            so that augmentations run in the data loader's worker processes, or draw their random
+            numbers from generators owned by the dataset.
+        """
+        check.gt(depth, 0, "The prefetch depth must be greater than 0")
+        self._prefetch_depth = depth
+
     @util.deprecated(
         "context.experimental.reset_reducers() is deprecated since 0.15.2 and will be removed in a "
         "future version; use context.reset_reducers() directly."
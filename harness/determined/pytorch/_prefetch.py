@@ -0,0 +1,151 @@
+import queue
+import threading
+from typing import Any, Callable, Iterator, Optional
+
+import torch
+
+from determined.common.check import check_gt
+
+# How often the prefetch thread, when blocked on a full queue, checks whether it should exit.
+_POLL_INTERVAL = 0.1
+
+
+class _Done:
+    """Queued by the prefetch thread once the wrapped iterator is exhausted."""
+
+
+class _Failed:
+    """Queued by the prefetch thread when the wrapped iterator raises."""
+
+    def __init__(self, error: BaseException) -> None:
+        self.error = error
+
+
+def _record_stream(data: Any, stream: "torch.cuda.Stream") -> None:
+    """
+    Mark every CUDA tensor in a batch as used on stream, so the caching allocator does not reuse
+    its memory (allocated on the prefetch stream) while stream may still be reading it.
+    """
+    if isinstance(data, dict):
+        for v in data.values():
+            _record_stream(v, stream)
+    elif isinstance(data, (list, tuple)):
+        for d in data:
+            _record_stream(d, stream)
+    elif isinstance(data, torch.Tensor) and data.is_cuda:
+        data.record_stream(stream)
+
+
+class _DevicePrefetcher:
+    """
+    _DevicePrefetcher wraps a batch iterator and moves up to depth batches to the training device
+    ahead of time on a background thread, so that data loading and host-to-device copies overlap
+    with the training step.
+
+    On a GPU, each batch is pinned and copied with non-blocking copies on a side CUDA stream; the
+    consumer's stream waits on an event recorded after the copy, so the training step never reads
+    a partially copied batch. On a CPU, batches are simply loaded and converted ahead of time on
+    the background thread.
+
+    The wrapped iterator runs on the background thread, so any randomness it draws from the
+    process-wide random number generators interleaves nondeterministically with the training step.
+
+    Exceptions raised by the wrapped iterator, including StopIteration, are re-raised by next() on
+    the consuming thread in order. close() must be called to stop the background thread before the
+    wrapped iterator is shut down.
+    """
+
+    def __init__(
+        self,
+        iterator: Iterator,
+        to_device: Callable[[Any, bool], Any],
+        device: torch.device,
+        depth: int,
+    ) -> None:
+        check_gt(depth, 0, "The prefetch depth must be greater than 0")
+        self._to_device = to_device
+        self._device = device
+        self._stream = None  # type: Optional[torch.cuda.Stream]
+        if device.type == "cuda":
+            self._stream = torch.cuda.Stream(device)  # type: ignore
+
+        self._queue = queue.Queue(maxsize=depth)  # type: queue.Queue
+        self._closed = threading.Event()
+        self._done = False
+        self._thread = threading.Thread(
+            target=self._prefetch_loop, args=(iterator,), name="DevicePrefetcher", daemon=True
+        )
+        self._thread.start()
+
+    def _load(self, iterator: Iterator) -> Any:
+        batch = next(iterator)
+        if self._stream is None:
+            return self._to_device(batch, False), None
+
+        with torch.cuda.stream(self._stream):
+            # to_device() stages the batch in pinned memory for non-blocking copies.
+            batch = self._to_device(batch, True)
+            ready = torch.cuda.Event()  # type: ignore
+            ready.record(self._stream)
+        return batch, ready
+
+    def _put(self, item: Any) -> bool:
+        while not self._closed.is_set():
+            try:
+                self._queue.put(item, timeout=_POLL_INTERVAL)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _prefetch_loop(self, iterator: Iterator) -> None:
+        if self._stream is not None:
+            torch.cuda.set_device(self._device)
+
+        while not self._closed.is_set():
+            try:
+                item = self._load(iterator)
+            except StopIteration:
+                self._put(_Done())
+                return
+            except BaseException as e:
+                self._put(_Failed(e))
+                return
+            if not self._put(item):
+                return
+
+    def __iter__(self) -> "_DevicePrefetcher":
+        return self
+
+    def __next__(self) -> Any:
+        if self._done:
+            raise StopIteration
+
+        item = self._queue.get()
+        if isinstance(item, _Done):
+            self._done = True
+            raise StopIteration
+        if isinstance(item, _Failed):
+            self._done = True
+            raise item.error
+
+        batch, ready = item
+        if ready is None:
+            return batch
+
+        current = torch.cuda.current_stream(self._device)
+        current.wait_event(ready)
+        _record_stream(batch, current)
+        return batch
+
+    def close(self) -> None:
+        """Stop the background thread, which releases its reference to the wrapped iterator."""
+        self._closed.set()
+        self._done = True
+        # Unblock the prefetch thread if it is waiting on a full queue.
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
+        self._thread.join()
@@ -21,6 +21,87 @@ except ImportError:
     pass
 
 
+def _dense_measurements(
+    timeseries: List[List[Any]],
+) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Pack timeseries[process_idx][batch_idx] into a (process x batch) float64 array, along with a
+    mask of the None measurements (which are stored as 0). Return None if any measurement is not
+    a scalar.
+    """
+    num_batches = len(timeseries[0]) if timeseries else 0
+    if any(len(process) != num_batches for process in timeseries):
+        return None
+    shape = (len(timeseries), num_batches)
+
+    # Fast path: NumPy converts None to NaN, so only look for None measurements if there are NaNs.
+    try:
+        values = np.fromiter(
+            (m for process in timeseries for m in process), np.float64, shape[0] * shape[1]
+        )
+        if not np.isnan(values).any():
+            return values.reshape(shape), np.zeros(shape, dtype=bool)
+    except (TypeError, ValueError):
+        pass
+
+    try:
+        missing = np.array([[m is None for m in process] for process in timeseries], dtype=bool)
+        values = np.array(
+            [[0.0 if m is None else m for m in process] for process in timeseries], np.float64
+        )
+    except (TypeError, ValueError):
+        return None
+    if values.shape != shape:
+        return None
+    return values, missing
+
+
+def _average_metrics_timeseries(
+    combined_timeseries: Dict[str, List[List[Any]]], array_metrics: List[str]
+) -> Dict[str, List[Any]]:
+    """
+    Average combined_timeseries[metric_name][process_idx][batch_idx] across processes, ignoring
+    None measurements. Metrics in array_metrics are wrapped in single-element arrays.
+
+    Scalar metrics are packed into a dense (metric x process x batch) array with a mask of the
+    None measurements, so that all of them are reduced at once; metrics with non-scalar values
+    are averaged one batch at a time.
+    """
+    averaged_metrics_timeseries = {}  # type: Dict[str, List[Any]]
+    dense_names = []  # type: List[str]
+    dense_values = []  # type: List[np.ndarray]
+    dense_missing = []  # type: List[np.ndarray]
+
+    for metric_name, timeseries in combined_timeseries.items():
+        dense = _dense_measurements(timeseries)
+        if dense is not None:
+            dense_names.append(metric_name)
+            dense_values.append(dense[0])
+            dense_missing.append(dense[1])
+            continue
+
+        averaged_metrics_timeseries[metric_name] = []
+        for batch in zip(*timeseries):
+            np_batch = np.array(batch)
+            batch_avg = np.mean(np_batch[np_batch != None])  # noqa: E711
+            if metric_name in array_metrics:
+                batch_avg = np.array(batch_avg)
+            averaged_metrics_timeseries[metric_name].append(batch_avg)
+
+    if dense_names:
+        # Sum over the process axis; batches with no measurements at all average to NaN.
+        counts = np.sum(~np.stack(dense_missing), axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            averages = np.sum(np.stack(dense_values), axis=1) / counts
+        for metric_name, metric_averages in zip(dense_names, averages):
+            if metric_name in array_metrics:
+                averaged_metrics_timeseries[metric_name] = [np.array(a) for a in metric_averages]
+            else:
+                averaged_metrics_timeseries[metric_name] = list(metric_averages)
+
+    return {name: averaged_metrics_timeseries[name] for name in combined_timeseries}
+
+
 class PyTorchTrialController(det.LoopTrialController):
     def __init__(self, trial_inst: det.Trial, *args: Any, **kwargs: Any) -> None:
         super().__init__(*args, **kwargs)
@@ -49,6 +130,9 @@ class PyTorchTrialController(det.LoopTrialController):
         self.validation_loader = None  # type: Optional[torch.utils.data.DataLoader]
         self._set_data_loaders()
 
+        # Set in run() when the trial calls context.experimental.prefetch_to_device().
+        self.prefetcher = None  # type: Optional[pytorch._DevicePrefetcher]
+
     @staticmethod
     def pre_execute_hook(env: det.EnvContext, hvd_config: horovod.HorovodContext) -> None:
         # Initialize the correct horovod.
@@ -141,10 +225,28 @@ class PyTorchTrialController(det.LoopTrialController):
                 for optimizer in self.context.optimizers:
                     hvd.broadcast_optimizer_state(optimizer, root_rank=0)
 
+            # Start prefetching only after loading state, since the prefetch thread draws batches
+            # (and random numbers) from the training iterator concurrently with the main thread.
+            if self.context.experimental._prefetch_depth > 0:
+                self.prefetcher = pytorch._DevicePrefetcher(
+                    self.training_iterator,
+                    lambda batch, non_blocking: pytorch.to_device(
+                        batch,
+                        self.context.device,
+                        self.context._to_device_warned_types,
+                        non_blocking,
+                    ),
+                    self.context.device,
+                    self.context.experimental._prefetch_depth,
+                )
+
             with self.prof:
                 self._run()
 
         finally:
+            # The prefetch thread must stop using the training iterator before it is shut down.
+            if self.prefetcher is not None:
+                self.prefetcher.close()
             # Explicitly trigger the training iterator's shutdown (which happens in __del__).
             # See the rather long note in pytorch/torch/utils/data/dataloader.py.
             del self.training_iterator
@@ -238,23 +340,9 @@ class PyTorchTrialController(det.LoopTrialController):
         if self.is_chief:
             combined_timeseries_type = Dict[str, List[List[Any]]]
             combined_timeseries = cast(combined_timeseries_type, combined_timeseries)
-            num_batches = len(per_batch_metrics)
-            num_processes = hvd.size()
-            averaged_metrics_timeseries = {}  # type: Dict[str, List]
-
-            for metric_name in combined_timeseries.keys():
-                averaged_metrics_timeseries[metric_name] = []
-                for batch_idx in range(num_batches):
-                    batch = [
-                        combined_timeseries[metric_name][process_idx][batch_idx]
-                        for process_idx in range(num_processes)
-                    ]
-
-                    np_batch = np.array(batch)
-                    batch_avg = np.mean(np_batch[np_batch != None])  # noqa: E711
-                    if metric_name in array_metrics:
-                        batch_avg = np.array(batch_avg)
-                    averaged_metrics_timeseries[metric_name].append(batch_avg)
+            averaged_metrics_timeseries = _average_metrics_timeseries(
+                combined_timeseries, array_metrics
+            )
             per_batch_metrics = util._dict_to_list(averaged_metrics_timeseries)
         return per_batch_metrics
 
@@ -310,13 +398,20 @@ class PyTorchTrialController(det.LoopTrialController):
         for batch_idx in range(start, end):
             batch_start_time = time.time()
             self.prof.update_batch_idx(batch_idx)
-            with self.prof.record_timing("dataloader_next"):
-                batch = next(self.training_iterator)
-            batch_inputs = self.trial.get_batch_length(batch)
-            num_inputs += batch_inputs
+            if self.prefetcher is not None:
+                # The batch was loaded and moved to the device ahead of time; this only measures
+                # how long training waited for it.
+                with self.prof.record_timing("dataloader_next"):
+                    batch = next(self.prefetcher)
+                batch_inputs = self.trial.get_batch_length(batch)
+            else:
+                with self.prof.record_timing("dataloader_next"):
+                    batch = next(self.training_iterator)
+                batch_inputs = self.trial.get_batch_length(batch)
 
-            with self.prof.record_timing("to_device"):
-                batch = self.context.to_device(batch)
+                with self.prof.record_timing("to_device"):
+                    batch = self.context.to_device(batch)
+            num_inputs += batch_inputs
 
             self.context._current_batch_idx = batch_idx
             if self.context.is_epoch_start():
@@ -358,13 +453,14 @@ class PyTorchTrialController(det.LoopTrialController):
                 for lr_scheduler in self.context.lr_schedulers:
                     self._auto_step_lr_scheduler_per_batch(batch_idx, lr_scheduler)
 
-            with self.prof.record_timing("from_device"):
-                for name, metric in tr_metrics.items():
-                    # Convert PyTorch metric values to NumPy, so that
-                    # `det.util.encode_json` handles them properly without
-                    # needing a dependency on PyTorch.
-                    if isinstance(metric, torch.Tensor):
-                        metric = metric.cpu().detach().numpy()
+            # Keep metric tensors on the device until the end of the step; copying each one to
+            # the host here would synchronize with the device after every batch. Device tensors
+            # are cloned in case the trial updates them in place during a later batch.
+            for name, metric in tr_metrics.items():
+                if isinstance(metric, torch.Tensor):
+                    metric = metric.detach()
+                    if metric.device.type != "cpu":
+                        metric = metric.clone()
                     tr_metrics[name] = metric
 
             batch_dur = time.time() - batch_start_time
@@ -372,6 +468,9 @@ class PyTorchTrialController(det.LoopTrialController):
             self.prof.record_metric("samples_per_second", samples_per_second)
             per_batch_metrics.append(tr_metrics)
 
+        with self.prof.record_timing("from_device"):
+            per_batch_metrics = self._convert_batch_metrics_to_numpy(per_batch_metrics)
+
         # Aggregate and reduce training metrics from all the training processes.
         if self.hvd_config.use and self.hvd_config.average_training_metrics:
             with self.prof.record_timing("average_training_metrics"):
@@ -395,6 +494,35 @@ class PyTorchTrialController(det.LoopTrialController):
 
         return metrics
 
+    @staticmethod
+    def _convert_batch_metrics_to_numpy(
+        per_batch_metrics: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Convert the PyTorch tensors in a step's per-batch metrics to NumPy, so that
+        `det.util.encode_json` handles them properly without needing a dependency on PyTorch.
+
+        Tensors which share a device and dtype are concatenated and copied to the host together,
+        costing one device synchronization per step instead of one per metric per batch.
+        """
+        groups = {}  # type: Dict[Tuple[torch.device, torch.dtype], List[Tuple[Dict, str]]]
+        for batch_metrics in per_batch_metrics:
+            for name, metric in batch_metrics.items():
+                if isinstance(metric, torch.Tensor):
+                    key = (metric.device, metric.dtype)
+                    groups.setdefault(key, []).append((batch_metrics, name))
+
+        for entries in groups.values():
+            tensors = [batch_metrics[name] for batch_metrics, name in entries]
+            flat = torch.cat([tensor.reshape(-1) for tensor in tensors]).cpu().numpy()
+            offset = 0
+            for (batch_metrics, name), tensor in zip(entries, tensors):
+                size = tensor.numel()
+                batch_metrics[name] = flat[offset : offset + size].reshape(tuple(tensor.shape))
+                offset += size
+
+        return per_batch_metrics
+
     @staticmethod
     def _convert_metrics_to_numpy(metrics: Dict[str, Any]) -> Dict[str, Any]:
         for metric_name, metric_val in metrics.items():
@@ -426,6 +554,15 @@ class PyTorchTrialController(det.LoopTrialController):
 
         if self._evaluate_batch_defined():
             keys = None
+            reducers = {}  # type: Dict[str, pytorch.MergeableMetricReducer]
+
+            # Each batch's metrics are folded into streaming reducers as they arrive, so memory use
+            # does not grow with the size of the validation set. The batch metrics themselves are
+            # kept only if a callback needs all of them.
+            keep_batch_metrics = any(
+                util.is_overridden(c.on_validation_epoch_end, pytorch.PyTorchCallback)
+                for c in self.callbacks.values()
+            )
             batch_metrics = []
 
             self.validation_loader = cast(torch.utils.data.DataLoader, self.validation_loader)
@@ -443,6 +580,10 @@ class PyTorchTrialController(det.LoopTrialController):
                 # Verify validation metric names are the same across batches.
                 if keys is None:
                     keys = vld_metrics.keys()
+                    reducers = {
+                        name: pytorch._make_mergeable_reducer(reducer)
+                        for name, reducer in self._prepare_metrics_reducers(keys=keys).items()
+                    }
                 else:
                     check.eq(
                         keys,
@@ -456,19 +597,18 @@ class PyTorchTrialController(det.LoopTrialController):
                     "dictionary of string names to Tensor "
                     "metrics",
                 )
-                # TODO: For performance perform -> cpu() only at the end of validation.
-                batch_metrics.append(self._convert_metrics_to_numpy(vld_metrics))
+                vld_metrics = self._convert_metrics_to_numpy(vld_metrics)
+                for name, value in vld_metrics.items():
+                    reducers[name].update(value)
+                if keep_batch_metrics:
+                    batch_metrics.append(vld_metrics)
                 if self.env.test_mode:
                     break
 
             for callback in self.callbacks.values():
                 callback.on_validation_epoch_end(batch_metrics)
 
-            metrics = self._reduce_metrics(
-                batch_metrics=batch_metrics,
-                keys=keys,
-                metrics_reducers=self._prepare_metrics_reducers(keys=keys),
-            )
+            metrics = self._reduce_metrics(reducers)
 
             if self.hvd_config.use:
                 num_inputs *= hvd.size()
@@ -543,42 +683,23 @@ class PyTorchTrialController(det.LoopTrialController):
         return metrics_reducers
 
     def _reduce_metrics(
-        self, batch_metrics: List, keys: Any, metrics_reducers: Dict[str, pytorch.Reducer]
+        self, reducers: Dict[str, pytorch.MergeableMetricReducer]
     ) -> Dict[str, Any]:
-        metrics = {
-            name: pytorch._reduce_metrics(
-                reducer=metrics_reducers[name],
-                metrics=np.stack([b[name] for b in batch_metrics], axis=0),
-                num_batches=None,
-            )
-            for name in keys or []
-        }
-
         if self.hvd_config.use:
-            # If using horovod combine metrics across all processes.
-            # Only the chief process will receive all the metrics.
-            self.validation_loader = cast(torch.utils.data.DataLoader, self.validation_loader)
-            num_batches = len(self.validation_loader)
-            combined_metrics, batches_per_process = self._combine_metrics_across_processes(
-                metrics, num_batches
-            )
-            if self.is_chief:
-                # Only the chief collects all the metrics.
-                combined_metrics = self._convert_metrics_to_numpy(
-                    cast(Dict[str, Any], combined_metrics)
-                )
-                metrics = {
-                    name: pytorch._reduce_metrics(
-                        reducer=metrics_reducers[name],
-                        metrics=combined_metrics[name],
-                        num_batches=batches_per_process,
-                    )
-                    for name in keys or []
+            # If using horovod, merge the reducers of all processes on the chief. Reducers are
+            # merged on each machine before being sent to the chief.
+            def merge(all_reducers: List[Dict[str, pytorch.MergeableMetricReducer]]) -> Dict:
+                return {
+                    name: pytorch._merge_reducers([r[name] for r in all_reducers])
+                    for name in reducers
                 }
-            else:
+
+            merged = self.context.distributed._zmq_gather_hierarchical(reducers, merge)
+            if not self.is_chief:
                 return {}
+            reducers = cast(Dict[str, pytorch.MergeableMetricReducer], merged)
 
-        return metrics
+        return {name: reducer.result() for name, reducer in reducers.items()}
 
     def _combine_metrics_across_processes(
         self, metrics: Dict[str, Any], num_batches: int
@@ -587,7 +708,7 @@ class PyTorchTrialController(det.LoopTrialController):
         check.true(self.hvd_config.use)
 
         # all_args is a list of [(metrics, num_batches), ...] for each worker.
-        all_args = self.context.distributed._zmq_gather((metrics, num_batches))
+        all_args = self.context.distributed._zmq_gather_hierarchical((metrics, num_batches))
 
         if not self.is_chief:
             return None, None
@@ -1,6 +1,7 @@
 import abc
+import copy
 import enum
-from typing import Any, Callable, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
 
 import numpy as np
 
@@ -188,6 +189,255 @@ class _SimpleReducer(MetricReducer):
         return self.fn(flat_metrics)
 
 
+class MergeableMetricReducer(MetricReducer):
+    """
+    A ``MergeableMetricReducer`` is a :class:`MetricReducer` that keeps a small running summary of
+    the values passed to ``update()``, instead of the values themselves, so memory use does not
+    grow with the size of the dataset. Summaries from different slots are combined with
+    ``merge()``, so ``per_slot_reduce()`` and ``cross_slot_reduce()`` are implemented for you.
+
+    Subclasses implement ``reset()``, ``update()``, ``merge()``, and ``result()``. The built-in
+    subclasses are :class:`MeanMetricReducer`, :class:`SumMetricReducer`,
+    :class:`MinMetricReducer`, :class:`MaxMetricReducer`, :class:`HistogramMetricReducer`, and
+    :class:`QuantileMetricReducer`.
+    """
+
+    @abc.abstractmethod
+    def update(self, value: Any) -> None:
+        """
+        Add a value, which may be a scalar or an array of any shape, to the summary.
+        """
+        pass
+
+    @abc.abstractmethod
+    def merge(self, other: Any) -> None:
+        """
+        Add the summary of another reducer of the same type into this reducer's summary.
+        """
+        pass
+
+    @abc.abstractmethod
+    def result(self) -> Any:
+        """
+        Return the metric value for the values summarized so far.
+        """
+        pass
+
+    def per_slot_reduce(self) -> Any:
+        return self
+
+    def cross_slot_reduce(self, per_slot_metrics: List) -> Any:
+        return _merge_reducers(per_slot_metrics).result()
+
+
+def _merge_reducers(reducers: List[MergeableMetricReducer]) -> MergeableMetricReducer:
+    """
+    Merge reducers into a new reducer, leaving the inputs unchanged.
+    """
+    check.gt(len(reducers), 0, "cannot merge an empty list of reducers")
+    # A deep copy keeps the configuration of the first reducer (e.g. histogram bins) without
+    # sharing any state with it, in case reset() modifies that state in place.
+    merged = copy.deepcopy(reducers[0])
+    merged.reset()
+    for reducer in reducers:
+        merged.merge(reducer)
+    return merged
+
+
+class MeanMetricReducer(MergeableMetricReducer):
+    """
+    Average all elements of all values passed to ``update()``.
+    """
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        self.sum = 0.0
+        self.count = 0
+
+    def update(self, value: Any) -> None:
+        self.sum += np.sum(value, dtype=np.float64)
+        self.count += np.size(value)
+
+    def merge(self, other: "MeanMetricReducer") -> None:
+        self.sum += other.sum
+        self.count += other.count
+
+    def result(self) -> Any:
+        return self.sum / self.count if self.count else np.nan
+
+
+class SumMetricReducer(MergeableMetricReducer):
+    """
+    Sum all elements of all values passed to ``update()``.
+    """
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        self.sum = 0  # type: Any
+
+    def update(self, value: Any) -> None:
+        self.sum += np.sum(value)
+
+    def merge(self, other: "SumMetricReducer") -> None:
+        self.sum += other.sum
+
+    def result(self) -> Any:
+        return self.sum
+
+
+class MinMetricReducer(MergeableMetricReducer):
+    """
+    Take the minimum element of all values passed to ``update()``.
+    """
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        self.min = None  # type: Any
+
+    def update(self, value: Any) -> None:
+        value = np.min(value)
+        self.min = value if self.min is None else np.minimum(self.min, value)
+
+    def merge(self, other: "MinMetricReducer") -> None:
+        if other.min is not None:
+            self.update(other.min)
+
+    def result(self) -> Any:
+        return self.min
+
+
+class MaxMetricReducer(MergeableMetricReducer):
+    """
+    Take the maximum element of all values passed to ``update()``.
+    """
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        self.max = None  # type: Any
+
+    def update(self, value: Any) -> None:
+        value = np.max(value)
+        self.max = value if self.max is None else np.maximum(self.max, value)
+
+    def merge(self, other: "MaxMetricReducer") -> None:
+        if other.max is not None:
+            self.update(other.max)
+
+    def result(self) -> Any:
+        return self.max
+
+
+class HistogramMetricReducer(MergeableMetricReducer):
+    """
+    Count the elements of all values passed to ``update()`` in ``bins`` equal-width bins spanning
+    ``range``, like ``numpy.histogram``. The result is the array of counts; the bin edges are
+    available as ``bin_edges``. Elements outside of ``range`` are not counted.
+    """
+
+    def __init__(self, bins: int, range: Tuple[float, float]) -> None:
+        check.gt(bins, 0, "bins must be greater than 0")
+        check.lt(range[0], range[1], "range must be an increasing (min, max) pair")
+        self.bin_edges = np.linspace(range[0], range[1], bins + 1)
+        self.reset()
+
+    def reset(self) -> None:
+        self.counts = np.zeros(len(self.bin_edges) - 1, dtype=np.int64)
+
+    def update(self, value: Any) -> None:
+        counts, _ = np.histogram(value, bins=self.bin_edges)
+        self.counts += counts
+
+    def merge(self, other: "HistogramMetricReducer") -> None:
+        check.true(
+            np.array_equal(self.bin_edges, other.bin_edges),
+            "cannot merge histograms with different bins",
+        )
+        self.counts += other.counts
+
+    def result(self) -> Any:
+        return self.counts.copy()
+
+
+class QuantileMetricReducer(MergeableMetricReducer):
+    """
+    Estimate the given ``quantiles`` (each between 0 and 1) of all elements of all values passed to
+    ``update()``. The result is an array with one estimate per quantile.
+
+    The values are summarized by at most ``2 * max_centroids`` weighted centroids, each standing in
+    for a run of adjacent values in sorted order, so the rank of each estimate is accurate to about
+    ``1 / max_centroids`` of the number of values.
+    """
+
+    def __init__(self, quantiles: Sequence[float], max_centroids: int = 1000) -> None:
+        check.true(all(0 <= q <= 1 for q in quantiles), "quantiles must be between 0 and 1")
+        check.gt(max_centroids, 0, "max_centroids must be greater than 0")
+        self.quantiles = list(quantiles)
+        self.max_centroids = max_centroids
+        self.reset()
+
+    def reset(self) -> None:
+        self.means = np.empty(0, dtype=np.float64)
+        self.weights = np.empty(0, dtype=np.float64)
+
+    def _add(self, means: np.ndarray, weights: np.ndarray) -> None:
+        self.means = np.concatenate([self.means, means])
+        self.weights = np.concatenate([self.weights, weights])
+        if len(self.means) > 2 * self.max_centroids:
+            self._compress()
+
+    def _compress(self) -> None:
+        order = np.argsort(self.means, kind="mergesort")
+        means, weights = self.means[order], self.weights[order]
+        # Group adjacent centroids into max_centroids runs of roughly equal total weight.
+        cumulative = np.cumsum(weights) - weights
+        groups = np.floor(cumulative / np.sum(weights) * self.max_centroids).astype(np.int64)
+        group_weights = np.bincount(groups, weights=weights)
+        group_sums = np.bincount(groups, weights=means * weights)
+        nonempty = group_weights > 0
+        self.means = group_sums[nonempty] / group_weights[nonempty]
+        self.weights = group_weights[nonempty]
+
+    def update(self, value: Any) -> None:
+        values = np.asarray(value, dtype=np.float64).ravel()
+        self._add(values, np.ones_like(values))
+
+    def merge(self, other: "QuantileMetricReducer") -> None:
+        self._add(other.means, other.weights)
+
+    def result(self) -> Any:
+        if len(self.means) == 0:
+            return np.full(len(self.quantiles), np.nan)
+        order = np.argsort(self.means, kind="mergesort")
+        means, weights = self.means[order], self.weights[order]
+        # Each centroid sits at the middle of the range of ranks that it stands in for.
+        positions = (np.cumsum(weights) - weights / 2) / np.sum(weights)
+        return np.interp(self.quantiles, positions, means)
+
+
+def _make_mergeable_reducer(reducer: Reducer) -> MergeableMetricReducer:
+    """
+    Return a MergeableMetricReducer which computes the same metric as a Reducer.
+    """
+    if reducer == Reducer.AVG:
+        return MeanMetricReducer()
+    elif reducer == Reducer.SUM:
+        return SumMetricReducer()
+    elif reducer == Reducer.MAX:
+        return MaxMetricReducer()
+    elif reducer == Reducer.MIN:
+        return MinMetricReducer()
+    else:
+        raise NotImplementedError
+
+
 def default_allgather_fn(metrics: Any) -> List:
     """
     A noop allgather implementation to ensure that custom reducers work outside of Determined.
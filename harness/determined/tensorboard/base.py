@@ -1,7 +1,7 @@
 import abc
 import pathlib
 import time
-from typing import List
+from typing import List, Tuple
 
 from determined.tensorboard import util
 
@@ -26,6 +26,7 @@ class TensorboardManager(metaclass=abc.ABCMeta):
         self.base_path = base_path
         self.sync_path = sync_path
         self.last_sync = 0.0
+        self._index = util.TBFileIndex(base_path)
 
     def list_tb_files(self, since: float) -> List[pathlib.Path]:
         """
@@ -41,12 +42,20 @@ class TensorboardManager(metaclass=abc.ABCMeta):
         tb_files = util.find_tb_files(self.base_path)
         return list(filter(lambda file: file.stat().st_mtime > since, tb_files))
 
-    def to_sync(self) -> List[pathlib.Path]:
+    def to_sync_with_offsets(self) -> List[Tuple[pathlib.Path, int]]:
+        """
+        Return (path, offset) for each Tensorboard file that is new or has changed since the last
+        sync, where offset is the number of leading bytes of the file which were already synced.
+        Backends that can append to an existing object may upload only the bytes after offset.
+        """
         sync_start = time.time()
-        sync_paths = self.list_tb_files(self.last_sync)
+        changes = self._index.changes()
         self.last_sync = sync_start
 
-        return sync_paths
+        return changes
+
+    def to_sync(self) -> List[pathlib.Path]:
+        return [path for path, _ in self.to_sync_with_offsets()]
 
     @abc.abstractmethod
     def sync(self) -> None:
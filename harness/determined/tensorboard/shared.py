@@ -26,10 +26,18 @@ class SharedFSTensorboardManager(base.TensorboardManager):
         os.umask(old_umask)
 
     def sync(self) -> None:
-        for path in self.to_sync():
+        for path, offset in self.to_sync_with_offsets():
             shared_fs_path = self.shared_fs_base.joinpath(path.relative_to(self.base_path))
             pathlib.Path.mkdir(shared_fs_path.parent, parents=True, exist_ok=True)
-            shutil.copy(path, shared_fs_path)
+
+            # Appended tfevents files only need their new tail copied, provided the copy on the
+            # shared file system is exactly what was synced last time.
+            if offset > 0 and shared_fs_path.exists() and shared_fs_path.stat().st_size == offset:
+                with path.open("rb") as src, shared_fs_path.open("ab") as dst:
+                    src.seek(offset)
+                    shutil.copyfileobj(src, dst)
+            else:
+                shutil.copy(path, shared_fs_path)
 
     def delete(self) -> None:
         shutil.rmtree(self.shared_fs_base, False)
@@ -1,6 +1,9 @@
+import fnmatch
 import logging
+import os
 import pathlib
-from typing import List
+import time
+from typing import Dict, List, Optional, Tuple
 
 tb_file_types = [
     "*tfevents*",
@@ -26,3 +29,136 @@ def find_tb_files(base_dir: pathlib.Path) -> List[pathlib.Path]:
         return []
 
     return [file for filetype in tb_file_types for file in base_dir.rglob(filetype)]
+
+
+# Files which TensorFlow keeps appending to while training. Every other Tensorboard file is
+# written once, so it stops being stat'd once it has been seen unchanged.
+appendable_tb_file_types = ["*tfevents*"]
+
+# Directories modified this recently are re-listed even if their mtime looks unchanged, since a
+# file created within the same filesystem timestamp tick would otherwise go unnoticed.
+_RACY_DIR_WINDOW_NS = 1_000_000_000
+
+
+def _matches(name: str, patterns: List[str]) -> bool:
+    return any(fnmatch.fnmatchcase(name, pattern) for pattern in patterns)
+
+
+class _TBFile:
+    def __init__(self, appendable: bool) -> None:
+        self.appendable = appendable
+        self.signature = None  # type: Optional[Tuple[int, int, int]]
+        self.synced_size = 0
+        self.settled = False
+
+
+class _TBDir:
+    def __init__(self) -> None:
+        self.mtime_ns = -1
+        self.subdirs = []  # type: List[str]
+        self.files = {}  # type: Dict[str, _TBFile]
+
+
+class TBFileIndex:
+    """
+    TBFileIndex incrementally tracks the Tensorboard files found under base_dir, so that
+    repeated syncs do not pay for a full recursive search of base_dir every time.
+
+    Directory listings are cached and only re-read when a directory's mtime changes. A file is
+    reported by changes() when it is new or its size or mtime has changed since it was last
+    reported, along with the number of bytes that had already been reported, which lets backends
+    that support appending upload only the new tail of a tfevents file. Write-once files stop
+    being stat'd after they have been seen unchanged, so the cost of each scan grows with the
+    number of directories and tfevents files rather than with the total number of files.
+    """
+
+    def __init__(self, base_dir: pathlib.Path) -> None:
+        self.base_dir = base_dir
+        self._dirs = {}  # type: Dict[str, _TBDir]
+
+    def _refresh_dir(self, path: str, tb_dir: _TBDir, scan_start_ns: int) -> None:
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            self._forget_dir(path)
+            return
+
+        if mtime_ns == tb_dir.mtime_ns and mtime_ns < scan_start_ns - _RACY_DIR_WINDOW_NS:
+            return
+
+        subdirs = []
+        names = set()
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                elif _matches(entry.name, tb_file_types):
+                    names.add(entry.name)
+
+        for removed in set(tb_dir.subdirs) - set(subdirs):
+            self._forget_dir(removed)
+        for name in set(tb_dir.files) - names:
+            del tb_dir.files[name]
+        for name in names:
+            tb_file = tb_dir.files.setdefault(
+                name, _TBFile(_matches(name, appendable_tb_file_types))
+            )
+            # The file may have been replaced under the same name.
+            tb_file.settled = False
+
+        tb_dir.subdirs = subdirs
+        tb_dir.mtime_ns = mtime_ns
+
+    def _forget_dir(self, path: str) -> None:
+        tb_dir = self._dirs.pop(path, None)
+        if tb_dir is not None:
+            for subdir in tb_dir.subdirs:
+                self._forget_dir(subdir)
+
+    def changes(self) -> List[Tuple[pathlib.Path, int]]:
+        """
+        Return (path, offset) for every Tensorboard file which is new or has changed since the
+        previous call, where offset is the size of the file when it was last returned, or 0 if
+        it has not been returned before or has since been truncated or replaced.
+        """
+        root = str(self.base_dir)
+        if not os.path.isdir(root):
+            self._dirs.clear()
+            return []
+
+        scan_start_ns = int(time.time() * 1e9)
+        changed = []
+        pending = [root]
+        while pending:
+            path = pending.pop()
+            tb_dir = self._dirs.setdefault(path, _TBDir())
+            self._refresh_dir(path, tb_dir, scan_start_ns)
+            if path not in self._dirs:
+                continue
+            pending.extend(tb_dir.subdirs)
+
+            for name, tb_file in list(tb_dir.files.items()):
+                if tb_file.settled:
+                    continue
+                file_path = os.path.join(path, name)
+                try:
+                    st = os.stat(file_path)
+                except FileNotFoundError:
+                    del tb_dir.files[name]
+                    continue
+
+                signature = (st.st_ino, st.st_size, st.st_mtime_ns)
+                if signature == tb_file.signature:
+                    tb_file.settled = not tb_file.appendable
+                    continue
+
+                offset = 0
+                if tb_file.signature is not None:
+                    same_file = tb_file.signature[0] == st.st_ino
+                    if same_file and st.st_size >= tb_file.synced_size:
+                        offset = tb_file.synced_size
+                changed.append((pathlib.Path(file_path), offset))
+                tb_file.signature = signature
+                tb_file.synced_size = st.st_size
+
+        return changed
@@ -21,11 +21,12 @@ from determined.common import check, util
 
 @util.preserve_random_state
 def download_gcs_blob_with_backoff(blob: Any, n_retries: int = 32, max_backoff: int = 32) -> Any:
+    jitter = random.Random()
     for n in range(n_retries):
         try:
             return blob.download_as_string()
         except Exception:
-            time.sleep(min(2 ** n + random.random(), max_backoff))
+            time.sleep(min(2 ** n + jitter.random(), max_backoff))
     raise Exception("Max retries exceeded for downloading blob.")
 
 
@@ -0,0 +1,4 @@
+"""
+Benchmarks print their measurements instead of asserting on them, since timings on shared CI
+machines are too noisy to compare; run them with `pytest -s --runslow tests/benchmarks`.
+"""
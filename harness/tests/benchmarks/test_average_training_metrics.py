@@ -0,0 +1,44 @@
+import timeit
+
+import numpy as np
+import pytest
+
+from determined.pytorch import _pytorch_trial
+from tests.experiment.utils import average_metrics_timeseries_per_batch
+
+NUM_METRICS = 8
+NUM_PROCESSES = 64
+NUM_BATCHES = 1000
+
+
+@pytest.mark.slow
+def test_benchmark_average_training_metrics() -> None:
+    rng = np.random.RandomState(0)
+    combined_timeseries = {
+        f"metric_{i}": [
+            [np.array(value, dtype=np.float32) for value in rng.rand(NUM_BATCHES)]
+            for _ in range(NUM_PROCESSES)
+        ]
+        for i in range(NUM_METRICS)
+    }
+    array_metrics = list(combined_timeseries)
+
+    per_batch = min(
+        timeit.repeat(
+            lambda: average_metrics_timeseries_per_batch(combined_timeseries, array_metrics),
+            number=1,
+            repeat=3,
+        )
+    )
+    vectorized = min(
+        timeit.repeat(
+            lambda: _pytorch_trial._average_metrics_timeseries(combined_timeseries, array_metrics),
+            number=1,
+            repeat=3,
+        )
+    )
+
+    print(
+        f"Averaging {NUM_METRICS} metrics x {NUM_PROCESSES} processes x {NUM_BATCHES} batches: "
+        f"per-batch {per_batch:.3f}s, vectorized {vectorized:.3f}s"
+    )
@@ -0,0 +1,99 @@
+import timeit
+from typing import Any, Dict, Iterator
+
+import jsonschema
+import pytest
+
+from determined.common.schemas import extensions, util
+from determined.common.schemas.expconf import _gen, _v0, _validate
+
+NUM_CALLS = 5
+EXPERIMENT = "http://determined.ai/schemas/expconf/v0/experiment.json"
+
+
+def full_union(
+    validator: jsonschema.Draft7Validator, det_one_of: Dict, instance: Any, schema: Dict
+) -> Iterator[jsonschema.ValidationError]:
+    """The previous implementation: collect every error of every union item."""
+    selected_errors = None
+    valid = []
+    for idx, item in enumerate(det_one_of["items"]):
+        errors = list(validator.descend(instance, schema=item, schema_path=idx))
+        if errors:
+            if not selected_errors and extensions._evaluate_unionKey(item["unionKey"], instance):
+                selected_errors = errors
+        else:
+            valid.append(item)
+    if len(valid) == 1:
+        return
+    if len(valid) > 1:
+        yield jsonschema.ValidationError(f"bug in validation! Multiple schemas matched: {valid}")
+        return
+    if selected_errors:
+        yield from selected_errors
+        return
+    yield jsonschema.ValidationError(det_one_of.get("defaultMessage", "union failed to validate"))
+
+
+def make_config(valid: bool) -> Dict[str, Any]:
+    """An experiment config with a large hyperparameter search space."""
+    hparams = {"global_batch_size": 32}  # type: Dict[str, Any]
+    hparams.update(
+        {f"double_{i}": {"type": "double", "minval": 0, "maxval": 1} for i in range(150)}
+    )
+    hparams.update({f"cat_{i}": {"type": "categorical", "vals": [1, 2, 3]} for i in range(50)})
+    hparams["nested"] = {f"int_{i}": {"type": "int", "minval": 0, "maxval": 9} for i in range(50)}
+    if not valid:
+        hparams["double_7"] = {"type": "double", "minval": 0}
+        hparams["nested"]["int_3"] = {"type": "bogus"}
+    return {
+        "name": "large",
+        "entrypoint": "model_def:Trial",
+        "searcher": {
+            "name": "random",
+            "metric": "loss",
+            "max_trials": 100,
+            "max_length": {"batches": 1000},
+        },
+        "hyperparameters": hparams,
+        "checkpoint_storage": {"type": "shared_fs", "host_path": "/tmp"},
+        "bind_mounts": [{"host_path": f"/h{i}", "container_path": f"/c{i}"} for i in range(20)],
+    }
+
+
+def validate_and_fill(config: Dict[str, Any]) -> None:
+    parsed = _v0.ExperimentConfigV0.from_dict(config)
+    parsed.fill_defaults()
+    parsed.assert_complete()
+
+
+@pytest.mark.slow
+def test_benchmark_expconf_validation() -> None:
+    schema = _gen.schemas[EXPERIMENT]
+    resolver = jsonschema.RefResolver(
+        base_uri=EXPERIMENT, referrer=schema, handlers={"http": lambda url: _gen.schemas[url]}
+    )
+    previous = jsonschema.validators.extend(
+        _validate._validator_class(False), {"union": full_union}
+    )(schema=schema, resolver=resolver)
+    current = _validate.make_validator(EXPERIMENT)
+
+    for valid in (True, False):
+        config = make_config(valid)
+        errors = util.format_validation_errors(current.iter_errors(config))
+        assert errors == util.format_validation_errors(previous.iter_errors(config))
+        assert bool(errors) != valid
+
+    config = make_config(True)
+    full = min(
+        timeit.repeat(lambda: list(previous.iter_errors(config)), number=NUM_CALLS, repeat=3)
+    )
+    short_circuit = min(
+        timeit.repeat(lambda: list(current.iter_errors(config)), number=NUM_CALLS, repeat=3)
+    )
+    fill = min(timeit.repeat(lambda: validate_and_fill(config), number=NUM_CALLS, repeat=3))
+    print(
+        f"experiment config validation: previous {full / NUM_CALLS * 1e3:.1f}ms, "
+        f"current {short_circuit / NUM_CALLS * 1e3:.1f}ms; "
+        f"from_dict + fill_defaults + assert_complete {fill / NUM_CALLS * 1e3:.1f}ms"
+    )
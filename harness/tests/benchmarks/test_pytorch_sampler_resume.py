@@ -0,0 +1,45 @@
+import time
+import typing
+
+import pytest
+import torch
+
+from determined import pytorch
+
+DATASET_SIZE = 100000
+BATCH_SIZE = 32
+NUM_REPLICAS = 8
+
+
+class OpaqueBatchSampler(torch.utils.data.BatchSampler):
+    """A BatchSampler subclass, which forces the samplers to skip batches one at a time."""
+
+    def __iter__(self) -> typing.Iterator[typing.List[int]]:
+        yield from super().__iter__()
+
+
+def resume_latency(skip: int, opaque: bool) -> float:
+    torch.manual_seed(0)
+    sampler = pytorch._data._SeededRandomSampler(range(DATASET_SIZE))
+    batch_sampler_cls = OpaqueBatchSampler if opaque else torch.utils.data.BatchSampler
+    batch_sampler = pytorch.adapt_batch_sampler(
+        batch_sampler_cls(sampler, BATCH_SIZE, drop_last=False),
+        repeat=True,
+        skip=skip,
+        num_replicas=NUM_REPLICAS,
+        rank=NUM_REPLICAS - 1,
+    )
+    start = time.perf_counter()
+    next(iter(batch_sampler))
+    return time.perf_counter() - start
+
+
+@pytest.mark.slow
+def test_benchmark_sampler_resume() -> None:
+    for skip in [1000, 10000, 100000]:
+        skipping = resume_latency(skip, opaque=True)
+        seeking = resume_latency(skip, opaque=False)
+        print(
+            f"resume after {skip} batches on {NUM_REPLICAS} replicas: "
+            f"skipping {skipping * 1e3:.1f}ms, seeking {seeking * 1e3:.2f}ms"
+        )
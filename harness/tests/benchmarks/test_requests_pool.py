@@ -0,0 +1,47 @@
+import timeit
+from typing import Any, Optional
+
+import pytest
+import urllib3
+
+from determined.common import requests
+from determined.common.api import certs, request
+from tests.keepalive_server import master_url, run_server
+
+NUM_CALLS = 200
+
+
+def unpooled_request(method: str, url: str, **kwargs: Any) -> Any:
+    """The previous implementation: a new Session, and connection, for every request."""
+    server_hostname = kwargs.pop("server_hostname", None)
+    with requests.Session(server_hostname) as session:
+        return session.request(method=method, url=url, **kwargs)
+
+
+def latency(url: str, cert: Optional[certs.Cert]) -> float:
+    seconds = min(
+        timeit.repeat(
+            lambda: request.get(url, "info", authenticated=False, cert=cert),
+            number=NUM_CALLS,
+            repeat=3,
+        )
+    )
+    return seconds / NUM_CALLS
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("use_tls", [False, True])
+def test_benchmark_pooled_requests(use_tls: bool, monkeypatch: Any) -> None:
+    urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+    cert = certs.Cert(noverify=True) if use_tls else None
+    with run_server(use_tls) as server:
+        url = master_url(server)
+        pooled = latency(url, cert)
+        with monkeypatch.context() as m:
+            m.setattr(requests, "request", unpooled_request)
+            unpooled = latency(url, cert)
+
+    print(
+        f"request latency ({'https' if use_tls else 'http'}): "
+        f"per-call sessions {unpooled * 1e3:.2f}ms, pooled {pooled * 1e3:.2f}ms"
+    )
@@ -1,4 +1,9 @@
+import hashlib
+import io
+import json
 import os
+import re
+import tarfile
 import tempfile
 from pathlib import Path
 
@@ -9,9 +14,11 @@ import requests_mock
 import determined.cli.cli as cli
 import determined.cli.command as command
 from determined.common import constants, context
+from tests.confdir import use_test_config_dir
 from tests.filetree import FileTree
 
 MINIMAL_CONFIG = '{"description": "test"}'
+MODEL_DEFINITIONS = re.compile("/model_definitions/")
 
 
 def test_parse_config() -> None:
@@ -49,7 +56,10 @@ def test_create_with_model_def(requests_mock: requests_mock.Mocker, tmp_path: Pa
 
     requests_mock.post("/login", status_code=200, json={"token": "fake-token"})
 
-    requests_mock.post(
+    requests_mock.head(MODEL_DEFINITIONS, status_code=requests.codes.not_found)
+    upload = requests_mock.put(MODEL_DEFINITIONS, status_code=requests.codes.ok)
+
+    create = requests_mock.post(
         "/experiments", status_code=requests.codes.created, headers={"Location": "/experiments/1"}
     )
 
@@ -57,11 +67,117 @@ def test_create_with_model_def(requests_mock: requests_mock.Mocker, tmp_path: Pa
     tempfile.mkstemp(dir=str(tmp_path))
     tempfile.mkstemp(dir=str(tmp_path))
 
-    with FileTree(tmp_path, {"config.yaml": MINIMAL_CONFIG}) as tree:
+    with use_test_config_dir(), FileTree(tmp_path, {"config.yaml": MINIMAL_CONFIG}) as tree:
         cli.main(
             ["experiment", "create", "--paused", str(tree.joinpath("config.yaml")), str(tmp_path)]
         )
 
+        # The model definition is streamed as a tarball and referenced by its hash.
+        content_hash = create.last_request.json()["model_definition_hash"]
+        assert content_hash == context.ArchiveContext(tmp_path).content_hash
+        assert "model_definition" not in create.last_request.json()
+        assert upload.last_request.path == "/model_definitions/{}".format(content_hash)
+        compressed = b"".join(upload.last_request.body)
+        with tarfile.open(fileobj=io.BytesIO(compressed), mode="r:gz") as tar:
+            assert "config.yaml" in [Path(name).name for name in tar.getnames()]
+
+
+def test_create_with_uploaded_model_def(
+    requests_mock: requests_mock.Mocker, tmp_path: Path
+) -> None:
+    requests_mock.get("/info", status_code=200, json={"version": "1.0"})
+    requests_mock.get(
+        "/users/me", status_code=200, json={"username": constants.DEFAULT_DETERMINED_USER}
+    )
+    requests_mock.post("/login", status_code=200, json={"token": "fake-token"})
+    requests_mock.head(MODEL_DEFINITIONS, status_code=requests.codes.ok)
+    upload = requests_mock.put(MODEL_DEFINITIONS, status_code=requests.codes.ok)
+    create = requests_mock.post(
+        "/experiments", status_code=requests.codes.created, headers={"Location": "/experiments/1"}
+    )
+
+    files = {"config.yaml": MINIMAL_CONFIG, "model/A.py": ""}
+    with use_test_config_dir(), FileTree(tmp_path, files) as tree:
+        cli.main(
+            [
+                "experiment",
+                "create",
+                "--paused",
+                str(tree.joinpath("config.yaml")),
+                str(tree.joinpath("model")),
+            ]
+        )
+
+    # The master already has the model definition, so it isn't uploaded again.
+    assert not upload.called
+    assert "model_definition_hash" in create.last_request.json()
+
+
+def test_create_with_expired_model_def(requests_mock: requests_mock.Mocker, tmp_path: Path) -> None:
+    requests_mock.get("/info", status_code=200, json={"version": "1.0"})
+    requests_mock.get(
+        "/users/me", status_code=200, json={"username": constants.DEFAULT_DETERMINED_USER}
+    )
+    requests_mock.post("/login", status_code=200, json={"token": "fake-token"})
+    requests_mock.head(MODEL_DEFINITIONS, status_code=requests.codes.ok)
+    upload = requests_mock.put(MODEL_DEFINITIONS, status_code=requests.codes.ok)
+    # The master evicts the model definition after it was found, before the experiment is created.
+    create = requests_mock.post(
+        "/experiments",
+        [
+            {"status_code": requests.codes.not_found},
+            {"status_code": requests.codes.created, "headers": {"Location": "/experiments/1"}},
+        ],
+    )
+
+    files = {"config.yaml": MINIMAL_CONFIG, "model/A.py": ""}
+    with use_test_config_dir(), FileTree(tmp_path, files) as tree:
+        cli.main(
+            [
+                "experiment",
+                "create",
+                "--paused",
+                str(tree.joinpath("config.yaml")),
+                str(tree.joinpath("model")),
+            ]
+        )
+
+    # The model definition is uploaded again, and the experiment created from it.
+    assert upload.call_count == 1
+    assert create.call_count == 2
+    assert "model_definition_hash" in create.last_request.json()
+
+
+def test_create_with_model_def_legacy_master(
+    requests_mock: requests_mock.Mocker, tmp_path: Path
+) -> None:
+    requests_mock.get("/info", status_code=200, json={"version": "1.0"})
+    requests_mock.get(
+        "/users/me", status_code=200, json={"username": constants.DEFAULT_DETERMINED_USER}
+    )
+    requests_mock.post("/login", status_code=200, json={"token": "fake-token"})
+    requests_mock.head(MODEL_DEFINITIONS, status_code=requests.codes.not_found)
+    requests_mock.put(MODEL_DEFINITIONS, status_code=requests.codes.not_found)
+    create = requests_mock.post(
+        "/experiments", status_code=requests.codes.created, headers={"Location": "/experiments/1"}
+    )
+
+    files = {"config.yaml": MINIMAL_CONFIG, "model/A.py": ""}
+    with use_test_config_dir(), FileTree(tmp_path, files) as tree:
+        cli.main(
+            [
+                "experiment",
+                "create",
+                "--paused",
+                str(tree.joinpath("config.yaml")),
+                str(tree.joinpath("model")),
+            ]
+        )
+
+    body = create.last_request.json()
+    assert "model_definition_hash" not in body
+    assert [f["path"] for f in body["model_definition"]] == ["A.py"]
+
 
 @pytest.mark.slow  # type: ignore
 def test_create_reject_large_model_def(requests_mock: requests_mock.Mocker, tmp_path: Path) -> None:
@@ -194,3 +310,100 @@ def test_read_context_ignore_pycaches(tmp_path: Path) -> None:
     ) as tree:
         model_def, _ = context.read_context(tree)
         assert {f["path"] for f in model_def} == {"A.py", "subdir", "subdir/A.py"}
+
+
+def test_archive_context(tmp_path: Path) -> None:
+    files = {
+        "A.py": "a",
+        "subdir/B.py": "b" * 3000,
+        "subdir/__pycache__/B.cpython-37.pyc": "",
+        "C.txt": "",
+        ".detignore": "*.txt\n",
+    }
+    with FileTree(tmp_path, files) as tree:
+        os.utime(str(tree.joinpath("subdir")), (0, 0))
+        os.utime(str(tree.joinpath("A.py")), (0, 1))
+        os.utime(str(tree.joinpath("subdir/B.py")), (0, 2))
+        archive = context.ArchiveContext(tree)
+        assert len(archive) == 3
+        assert archive.size == 3001
+
+        compressed = b"".join(archive.chunks())
+        with tarfile.open(fileobj=io.BytesIO(compressed), mode="r:gz") as tar:
+            assert tar.getnames() == ["subdir", "A.py", "subdir/B.py"]
+            assert tar.extractfile("subdir/B.py").read() == b"b" * 3000  # type: ignore
+
+        # The hash covers the path, type, mode, mtime, size and content digest of every entry.
+        manifest = "".join(
+            "{}\0{}\0{}\0{}\0{}\0{}\0".format(*record)
+            for record in [
+                ("subdir", 5, 0o755, 0, 0, hashlib.sha256().hexdigest()),
+                ("A.py", 0, 0o644, 1, 1, hashlib.sha256(b"a").hexdigest()),
+                ("subdir/B.py", 0, 0o644, 2, 3000, hashlib.sha256(b"b" * 3000).hexdigest()),
+            ]
+        )
+        os.chmod(str(tree.joinpath("subdir")), 0o755)
+        for name in ["A.py", "subdir/B.py"]:
+            os.chmod(str(tree.joinpath(name)), 0o644)
+        archive = context.ArchiveContext(tree)
+        assert archive.content_hash == hashlib.sha256(manifest.encode()).hexdigest()
+
+        tree.joinpath("A.py").write_text("b")
+        os.utime(str(tree.joinpath("A.py")), (0, 1))
+        assert context.ArchiveContext(tree).content_hash != archive.content_hash
+
+        with pytest.raises(ValueError, match="exceeds the maximum allowed size"):
+            context.ArchiveContext(tree, limit=3000)
+
+
+def test_digest_cache(tmp_path: Path) -> None:
+    cache_path = tmp_path.joinpath("config", "context_digests.json")
+    with FileTree(tmp_path, {"A.py": "a", "B.py": "b", "new.py": "new"}) as tree:
+        for name in ["A.py", "B.py"]:
+            os.utime(str(tree.joinpath(name)), (0, 1))
+        first = context.ArchiveContext(tree, digest_cache=context.DigestCache(cache_path))
+        assert first.content_hash == context.ArchiveContext(tree).content_hash
+
+        # Files which were just modified aren't cached, since their mtime may not change again.
+        cached = json.loads(cache_path.read_text())["files"]
+        assert sorted(Path(p).name for p in cached) == ["A.py", "B.py"]
+
+        # Unchanged files are not read again: a change which keeps the size and mtime of a file
+        # goes unnoticed, but changing the mtime is detected.
+        tree.joinpath("A.py").write_text("x")
+        os.utime(str(tree.joinpath("A.py")), (0, 1))
+        cache = context.DigestCache(cache_path)
+        assert context.ArchiveContext(tree, digest_cache=cache).content_hash == first.content_hash
+        os.utime(str(tree.joinpath("A.py")), (0, 2))
+        assert context.ArchiveContext(tree, digest_cache=cache).content_hash != first.content_hash
+
+        # Only the most recently used digests are kept.
+        context.ArchiveContext(tree, digest_cache=context.DigestCache(cache_path, max_entries=1))
+        assert len(json.loads(cache_path.read_text())["files"]) == 1
+
+    # A corrupt cache is ignored and replaced.
+    cache_path.write_text("{")
+    with FileTree(tmp_path, {"A.py": "a"}) as tree:
+        os.utime(str(tree.joinpath("A.py")), (0, 1))
+        context.ArchiveContext(tree, digest_cache=context.DigestCache(cache_path))
+        assert len(json.loads(cache_path.read_text())["files"]) == 1
+
+    # Malformed entries are ignored.
+    store = json.loads(cache_path.read_text())
+    with FileTree(tmp_path, {"A.py": "a"}) as tree:
+        os.utime(str(tree.joinpath("A.py")), (0, 1))
+        store["files"] = {str(tree.joinpath("A.py").resolve()): 5, "other": [1, 2, "3", None]}
+        cache_path.write_text(json.dumps(store))
+        context.ArchiveContext(tree, digest_cache=context.DigestCache(cache_path))
+        [entry] = json.loads(cache_path.read_text())["files"].values()
+        assert entry[2] == hashlib.sha256(b"a").hexdigest()
+
+
+def test_digest_cache_without_config_dir(tmp_path: Path) -> None:
+    # If the cache can't be created, digests are computed without it.
+    tmp_path.joinpath("config").write_text("")
+    cache = context.DigestCache(tmp_path.joinpath("config", "context_digests.json"))
+    with FileTree(tmp_path, {"A.py": "a"}) as tree:
+        os.utime(str(tree.joinpath("A.py")), (0, 1))
+        archive = context.ArchiveContext(tree, digest_cache=cache)
+        assert archive.content_hash == context.ArchiveContext(tree).content_hash
@@ -0,0 +1,94 @@
+import json
+import os
+import subprocess
+import sys
+from typing import List
+
+import determined.cli.cli as cli
+from determined.common.declarative_argparse import Cmd, resolve_cmd
+
+# Importing the CLI and building its parser, on top of `import determined`, must stay well under a
+# second, since it happens on every `det` call and every shell completion.
+IMPORT_BUDGET_SECONDS = 0.5
+
+# The modules that `det` needs before dispatching to a subcommand.
+CLI_MODULES = {
+    "determined.cli.cli",
+    "determined.cli.errors",
+    "determined.cli.render",
+    "determined.cli.version",
+}
+
+STARTUP_SCRIPT = """
+import json, sys, time
+import determined
+before = set(sys.modules)
+start = time.perf_counter()
+import determined.cli.cli
+determined.cli.cli.make_parser()
+elapsed = time.perf_counter() - start
+print(json.dumps({"elapsed": elapsed, "imported": sorted(set(sys.modules) - before)}))
+"""
+
+
+def test_cli_startup_imports() -> None:
+    out = subprocess.run(
+        [sys.executable, "-c", STARTUP_SCRIPT], check=True, stdout=subprocess.PIPE
+    ).stdout
+    result = json.loads(out)
+    imported = result["imported"]
+    # Subcommand modules, and the deploy stacks in particular, are only imported when used.
+    assert not [m for m in imported if m.startswith("determined.deploy")]
+    assert not [m for m in imported if m.startswith("determined.cli.") and m not in CLI_MODULES]
+    assert "OpenSSL" not in imported
+    assert result["elapsed"] < IMPORT_BUDGET_SECONDS, result
+
+
+def test_lazy_commands_match_their_modules() -> None:
+    lazy = [c for c in cli.args_description if isinstance(c, Cmd) and isinstance(c.subs, str)]
+    assert lazy
+    for cmd in lazy:
+        resolved = resolve_cmd(cmd)
+        assert resolved is not cmd
+        assert resolved.help_str == cmd.help_str
+        assert isinstance(resolved.subs, list)
+
+
+COMPLETE_SCRIPT = """
+import io, sys, argcomplete
+import determined.cli.cli
+output = io.StringIO()
+try:
+    argcomplete.autocomplete(
+        determined.cli.cli.make_parser(), exit_method=sys.exit, output_stream=output
+    )
+finally:
+    print(output.getvalue())
+"""
+
+
+def complete(line: str) -> List[str]:
+    env = {
+        **os.environ,
+        "_ARGCOMPLETE": "1",
+        "_ARGCOMPLETE_IFS": "\n",
+        "COMP_LINE": line,
+        "COMP_POINT": str(len(line)),
+    }
+    # argcomplete writes to, and closes, file descriptors of its own, so run it in a subprocess.
+    out = subprocess.run(
+        [sys.executable, "-c", COMPLETE_SCRIPT], env=env, stdout=subprocess.PIPE
+    ).stdout
+    return out.decode().split()
+
+
+def test_completion_of_lazy_commands() -> None:
+    assert "experiment" in complete("det exp")
+    # Completing the arguments of a lazy command loads it.
+    assert "list" in complete("det experiment li")
+
+
+def test_master_and_model_aliases() -> None:
+    parser = cli.make_parser()
+    assert parser.parse_args(["ma", "config"]).func.__module__ == "determined.cli.master"
+    assert parser.parse_args(["m", "list"]).func.__module__ == "determined.cli.model"
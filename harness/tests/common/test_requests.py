@@ -0,0 +1,72 @@
+import threading
+from typing import List
+
+import pytest
+from requests import exceptions
+
+from determined.common import requests
+from determined.common.api import certs, request
+from tests.keepalive_server import master_url, run_server
+
+
+@pytest.mark.parametrize("use_tls", [False, True])
+def test_pooled_requests_reuse_connections(use_tls: bool) -> None:
+    cert = certs.Cert(noverify=True) if use_tls else None
+    with run_server(use_tls) as server:
+        for _ in range(10):
+            r = request.get(master_url(server), "info", authenticated=False, cert=cert)
+            assert r.json() == {"ok": True}
+            # Cookies set by the master are not sent with later requests.
+            assert not requests._get_session(r.url, None, cert.bundle if cert else None).cookies
+        assert server.connections == 1
+
+
+def test_pooled_requests_are_thread_safe() -> None:
+    requests.configure_pool(pool_size=4)
+    try:
+        with run_server() as server:
+            errors = []  # type: List[BaseException]
+
+            def get_many() -> None:
+                try:
+                    for _ in range(20):
+                        r = requests.request("GET", master_url(server) + "/info")
+                        assert r.json() == {"ok": True}
+                except BaseException as e:
+                    errors.append(e)
+
+            threads = [threading.Thread(target=get_many) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            assert not errors
+            assert server.connections <= 4
+    finally:
+        requests.configure_pool()
+
+
+def test_pool_without_keep_alive() -> None:
+    requests.configure_pool(keep_alive=False)
+    try:
+        with run_server() as server:
+            for _ in range(3):
+                requests.request("GET", master_url(server) + "/info").raise_for_status()
+            assert server.connections == 3
+    finally:
+        requests.configure_pool()
+
+
+def test_pool_retries_only_reads_without_a_body() -> None:
+    with run_server() as server:
+        server.hang_up = True
+        url = master_url(server) + "/info"
+        with pytest.raises(exceptions.ConnectionError):
+            requests.request("GET", url)
+        assert server.requests == ["GET"] * 4
+
+        # A generator body can only be sent once, so resending it would send an empty body.
+        server.requests.clear()
+        with pytest.raises(exceptions.ConnectionError):
+            requests.request("PUT", url, data=iter([b"chunk"] * 3))
+        assert server.requests == ["PUT"]
@@ -6,7 +6,7 @@ import pytest
 
 from determined.common import schemas, yaml
 from determined.common.schemas import expconf
-from determined.common.schemas.expconf import _v0
+from determined.common.schemas.expconf import _gen, _v0
 
 
 def strip_runtime_defaultable(obj: Any, defaulted: Any) -> Any:
@@ -266,3 +266,35 @@ def lint_schema_subclasses(cls: type) -> None:
 
 def test_schema_class_definitons() -> None:
     lint_schema_subclasses(schemas.SchemaBase)
+
+
+def test_lazy_schemas_and_shared_validators() -> None:
+    schemas = _gen._Schemas()
+    assert len(schemas) == len(_gen._texts)
+    url = "http://determined.ai/schemas/expconf/v0/experiment.json"
+    assert not schemas._parsed
+    assert schemas[url]["title"] == "ExperimentConfig"
+    assert list(schemas._parsed) == [url]
+    assert schemas[url] is schemas[url]
+
+    # Validators for every schema share one validator class per kind of validation.
+    hparam = "http://determined.ai/schemas/expconf/v0/hyperparameter.json"
+    sanity = expconf._validate.make_validator(url)
+    assert sanity is expconf._validate.make_validator(url)
+    assert sanity.__class__ is expconf._validate.make_validator(hparam).__class__
+    assert sanity.__class__ is not expconf._validate.make_validator(url, complete=True).__class__
+
+
+def test_union_errors_with_nested_hyperparameters() -> None:
+    hparams = {
+        "global_batch_size": 32,
+        "nested": {"a": {"type": "int", "minval": 0, "maxval": 9}, "b": {"type": "bogus"}},
+        "lr": {"type": "double", "minval": 0.1},
+    }
+    errors = expconf.sanity_validation_errors(
+        hparams, "http://determined.ai/schemas/expconf/v0/hyperparameters.json"
+    )
+    # Errors come from the union member selected by the "type" of each hyperparameter.
+    assert any(e.startswith("<config>.lr: ") and "maxval" in e for e in errors), errors
+    assert any(e.startswith("<config>.nested.b") for e in errors), errors
+    assert not any(".nested.a" in e for e in errors), errors
@@ -108,6 +108,9 @@ class OneVarTrial(pytorch.PyTorchTrial):
         self.loss_fn = torch.nn.MSELoss()
 
         self.cls_reducer = context.wrap_reducer(TriangleLabelSum(), name="cls_reducer")
+
+        if "prefetch_depth" in context.get_hparams():
+            context.experimental.prefetch_to_device(context.get_hparam("prefetch_depth"))
         self.fn_reducer = context.wrap_reducer(triangle_label_sum, name="fn_reducer")
 
     def train_batch(
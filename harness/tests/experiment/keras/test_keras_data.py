@@ -1,3 +1,7 @@
+import pathlib
+import pickle
+from typing import Tuple
+
 import numpy as np
 import pytest
 from tensorflow.keras.utils import Sequence
@@ -40,6 +44,66 @@ def test_arraylike_data_adapter_drop_leftovers() -> None:
     assert np.array_equal(seq[3], (np.arange(48, 64), np.arange(148, 164)))
 
 
+def test_arraylike_data_adapter_memmap(tmp_path: pathlib.Path) -> None:
+    x = np.arange(6400, dtype=np.float32).reshape(100, 64)
+    y = {"a": np.arange(100), "b": np.arange(100, 200)}
+    np.save(tmp_path / "x.npy", x)
+    np.save(tmp_path / "b.npy", y["b"])
+
+    in_memory = keras.ArrayLikeAdapter(x, y, batch_size=16, prefetch=True)
+    mapped = keras.ArrayLikeAdapter(
+        str(tmp_path / "x.npy"),
+        {"a": y["a"], "b": tmp_path / "b.npy"},
+        batch_size=16,
+        prefetch=True,
+    )
+    assert isinstance(mapped.x, np.memmap)
+    assert len(mapped) == len(in_memory) == 7
+    for index in range(len(mapped)):
+        (mx, my), (ix, iy) = mapped[index], in_memory[index]
+        # Batches are read into memory, so they stay valid after the file is closed.
+        assert not isinstance(mx, np.memmap)
+        assert np.array_equal(mx, ix)
+        assert np.array_equal(my["a"], iy["a"]) and np.array_equal(my["b"], iy["b"])
+
+    # Worker processes reopen the files instead of receiving a copy of the data.
+    pickled = pickle.dumps(mapped)
+    assert len(pickled) < x.nbytes
+    unpickled = pickle.loads(pickled)
+    assert isinstance(unpickled.x, np.memmap)
+    assert np.array_equal(unpickled[3][0], x[48:64])
+
+
+def test_arraylike_data_adapter_shuffle(tmp_path: pathlib.Path) -> None:
+    np.save(tmp_path / "x.npy", np.arange(100))
+    seq = keras.ArrayLikeAdapter(
+        str(tmp_path / "x.npy"),
+        np.arange(100, 200),
+        batch_size=16,
+        sample_weights=np.arange(200, 300),
+        shuffle=True,
+        shuffle_seed=7,
+        prefetch=True,
+    )
+    assert len(seq) == 7
+    seen = []
+    for index in range(len(seq)):
+        x, y, weights = seq[index]
+        # Each batch is a gather of sorted rows, aligned across x, y and the sample weights.
+        assert np.all(np.diff(x) > 0)
+        assert np.array_equal(y, x + 100) and np.array_equal(weights, x + 200)
+        seen.extend(x)
+    assert sorted(seen) == list(range(100))
+    assert not np.array_equal(seq[0][0], np.arange(16))
+
+    same = keras.ArrayLikeAdapter(np.arange(100), np.arange(100), batch_size=16, shuffle_seed=7)
+    assert np.array_equal(same[0][0], np.arange(16))
+    same = keras.ArrayLikeAdapter(
+        np.arange(100), np.arange(100), batch_size=16, shuffle=True, shuffle_seed=7
+    )
+    assert np.array_equal(same[2][0], seq[2][0])
+
+
 def test_arraylike_data_adapter_with_unmatched_batch_size() -> None:
     with pytest.raises(check.CheckFailedError):
         keras._ArrayLikeAdapter(np.arange(0, 16), np.arange(0, 16), batch_size=32)
@@ -181,3 +245,69 @@ def test_enqueuer(shuffle, skip, rank_size, workers, use_multiprocessing) -> Non
         assert list(enqueuer.data()) == list(sampler.yield_epoch()), "first epoch was wrong"
         assert list(enqueuer.data()) == list(sampler.yield_epoch()), "second epoch was wrong"
         assert list(enqueuer.data()) == list(sampler.yield_epoch()), "third epoch was wrong"
+
+
+class ArraySequence(Sequence):
+    """Batches of (features, labels) whose values identify the batch; batch 7 is larger."""
+
+    def __len__(self) -> int:
+        return 20
+
+    def __getitem__(self, index: int) -> Tuple:
+        rows = 64 if index == 7 else 8
+        features = {
+            "image": np.full((rows, 4, 4), index, dtype=np.float32),
+            "mask": np.full(rows, index % 2, dtype=bool),
+        }
+        labels = [np.arange(rows, dtype=np.int64) + index, "label"]
+        return features, labels
+
+
+def check_array_batch(batch: Tuple, index: int) -> None:
+    features, labels = batch
+    rows = 64 if index == 7 else 8
+    assert features["image"].shape == (rows, 4, 4)
+    assert np.all(features["image"] == index)
+    assert np.all(features["mask"] == bool(index % 2))
+    assert np.array_equal(labels[0], np.arange(rows) + index)
+    assert labels[1] == "label"
+
+
+@pytest.mark.skipif(keras._enqueuer.shared_memory is None, reason="requires Python 3.8+")
+def test_enqueuer_shared_memory() -> None:
+    enqueuer = keras._build_enqueuer(
+        sequence=ArraySequence(),
+        workers=2,
+        use_multiprocessing=True,
+        max_queue_size=3,
+        shard_rank=0,
+        num_shards=1,
+        repeat=True,
+        shuffle=False,
+        shuffle_seed=0,
+        prior_batches_trained=0,
+    )
+    with enqueuer:
+        data = enqueuer.data()
+        # Hold on to some batches, which keeps their slots leased, while reading the rest.
+        held = [next(data) for _ in range(4)]
+        for index in range(4, 60):
+            check_array_batch(next(data), index % 20)
+        for index, batch in enumerate(held):
+            check_array_batch(batch, index)
+
+        assert isinstance(enqueuer, keras._enqueuer._MultiprocessingEnqueuer)
+        assert enqueuer.use_shared_memory
+        slots = len(enqueuer.slots)
+        assert slots == 3 + 2
+        names = [shm.name for shm in enqueuer.slots]
+        del held, batch
+        # Slots are free again once their batches are no longer referenced, except for the slot
+        # of the last batch, which the data() generator refers to until it is resumed.
+        assert len(enqueuer.free_slots) + len(enqueuer.slot_of_order) == slots - 1
+        del data
+        assert len(enqueuer.free_slots) + len(enqueuer.slot_of_order) == slots
+
+    for name in names:
+        with pytest.raises(FileNotFoundError):
+            keras._enqueuer.shared_memory.SharedMemory(name=name)
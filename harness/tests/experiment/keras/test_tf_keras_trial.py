@@ -1,13 +1,18 @@
 import subprocess
+import threading
+import types
 from pathlib import Path
-from typing import Any, Callable, Dict, Optional
+from typing import Any, Callable, Dict, List, Optional, cast
 
+import numpy as np
 import pytest
 import tensorflow as tf
+from _pytest.monkeypatch import MonkeyPatch
 from packaging import version
 
 import determined as det
 from determined import workload
+from determined.keras import _tf_keras_trial
 from tests.experiment import utils  # noqa: I100
 from tests.experiment.fixtures import tf_keras_one_var_model, tf_keras_xor_model  # noqa: I100
 
@@ -326,3 +331,57 @@ def test_surface_native_error():
 
 def test_create_trial_instance() -> None:
     utils.create_trial_instance(tf_keras_xor_model.XORTrial)
+
+
+def test_allreduce_logs(monkeypatch: MonkeyPatch) -> None:
+    num_workers = 3
+    barrier = threading.Barrier(num_workers)
+    sent = [None] * num_workers  # type: List[Any]
+
+    class FakeHorovod:
+        def __init__(self) -> None:
+            self.local = threading.local()
+
+        def rank(self) -> int:
+            return cast(int, self.local.rank)
+
+        def size(self) -> int:
+            return num_workers
+
+    fake_hvd = FakeHorovod()
+    monkeypatch.setattr(_tf_keras_trial, "hvd", fake_hvd)
+
+    def fake_allreduce(value: np.ndarray, average: bool, name: str) -> np.ndarray:
+        # Sum the values of every simulated worker, like hvd.Sum.
+        assert not average
+        sent[fake_hvd.rank()] = value
+        barrier.wait()
+        return cast(np.ndarray, np.sum(sent, axis=0))
+
+    def make_controller() -> Any:
+        controller = _tf_keras_trial.TFKerasTrialController.__new__(
+            _tf_keras_trial.TFKerasTrialController
+        )
+        controller.hvd_config = types.SimpleNamespace(use=True)
+        controller._hvd_allreduce = fake_allreduce
+        return controller
+
+    results = [None] * num_workers  # type: List[Any]
+
+    def worker(rank: int) -> None:
+        fake_hvd.local.rank = rank
+        logs = {"loss": float(rank), "accuracy": np.array([rank, 2 * rank], dtype=np.float32)}
+        results[rank] = make_controller()._allreduce_logs(logs, num_inputs=10 + rank, name="logs")
+
+    threads = [threading.Thread(target=worker, args=(rank,)) for rank in range(num_workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for logs, num_inputs in results:
+        assert num_inputs == 33
+        assert set(logs) == {"loss", "accuracy"}
+        assert logs["loss"] == pytest.approx(1.0)
+        assert logs["loss"].shape == ()
+        assert logs["accuracy"] == pytest.approx([1.0, 2.0])
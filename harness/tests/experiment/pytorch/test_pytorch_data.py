@@ -1,5 +1,6 @@
 import logging
 import queue
+import threading
 import typing
 from logging import handlers
 
@@ -12,9 +13,12 @@ from determined.pytorch import (
     DistributedBatchSampler,
     RepeatBatchSampler,
     SkipBatchSampler,
+    _DevicePrefetcher,
+    adapt_batch_sampler,
     data_length,
     to_device,
 )
+from determined.pytorch._data import _SeededRandomSampler, _seek
 
 
 def make_dataset() -> torch.utils.data.Dataset:
@@ -85,6 +89,62 @@ def test_distributed_batch_sampler():
         assert samples == expected_samples[rank]
 
 
+class OpaqueBatchSampler(torch.utils.data.BatchSampler):
+    """A BatchSampler subclass, which the Determined samplers cannot seek through."""
+
+    def __iter__(self) -> typing.Iterator[typing.List[int]]:
+        yield from super().__iter__()
+
+
+def make_sampler(
+    shuffle: bool, drop_last: bool, opaque: bool, seed: int = 7
+) -> torch.utils.data.BatchSampler:
+    if shuffle:
+        torch.manual_seed(seed)
+        sampler = _SeededRandomSampler(range(23))
+    else:
+        sampler = torch.utils.data.SequentialSampler(range(23))
+    batch_sampler_cls = OpaqueBatchSampler if opaque else torch.utils.data.BatchSampler
+    return batch_sampler_cls(sampler, batch_size=4, drop_last=drop_last)
+
+
+@pytest.mark.parametrize("shuffle", [False, True])
+@pytest.mark.parametrize("drop_last", [False, True])
+@pytest.mark.parametrize("num_replicas,rank", [(1, 0), (3, 0), (3, 2)])
+@pytest.mark.parametrize("skip", [0, 1, 5, 17])
+def test_seek_matches_skipping(
+    shuffle: bool, drop_last: bool, num_replicas: int, rank: int, skip: int
+) -> None:
+    def first_batches(opaque: bool) -> typing.List[typing.List[int]]:
+        batch_sampler = adapt_batch_sampler(
+            make_sampler(shuffle, drop_last, opaque),
+            repeat=True,
+            skip=skip,
+            num_replicas=num_replicas,
+            rank=rank,
+        )
+        iterator = iter(batch_sampler)
+        return [next(iterator) for _ in range(20)]
+
+    assert _seek(RepeatBatchSampler(make_sampler(shuffle, drop_last, opaque=False)), 0)
+    assert _seek(RepeatBatchSampler(make_sampler(shuffle, drop_last, opaque=True)), 0) is None
+    assert first_batches(opaque=False) == first_batches(opaque=True)
+
+
+def test_seeded_random_sampler() -> None:
+    torch.manual_seed(1)
+    sampler = _SeededRandomSampler(range(10))
+    epochs = [list(sampler) for _ in range(3)]
+    for epoch, indices in enumerate(epochs):
+        assert sorted(indices) == list(range(10))
+        assert sampler.epoch_indices(epoch) == indices
+    assert epochs[0] != epochs[1]
+
+    # The seed comes from the torch random number generator, so it is reproducible.
+    torch.manual_seed(1)
+    assert list(_SeededRandomSampler(range(10))) == epochs[0]
+
+
 def test_pytorch_adapt_batch_sampler():
     def check_equality(batch0, batch1):
         for a, b in zip(batch0, batch1):
@@ -185,3 +245,105 @@ def test_to_device_warnings(dedup_between_calls) -> None:
     finally:
         # Restore logging as it was before.
         logger.removeHandler(handler)
+
+
+def make_prefetcher(iterator: typing.Iterator, depth: int = 2) -> _DevicePrefetcher:
+    return _DevicePrefetcher(
+        iterator,
+        lambda batch, non_blocking: to_device(batch, torch.device("cpu"), None, non_blocking),
+        torch.device("cpu"),
+        depth,
+    )
+
+
+def test_device_prefetcher() -> None:
+    batches = [{"x": np.full(2, i, dtype=np.float32), "y": [torch.tensor(i)]} for i in range(5)]
+    prefetcher = make_prefetcher(iter(batches))
+    try:
+        for i, batch in enumerate(prefetcher):
+            assert isinstance(batch["x"], torch.Tensor)
+            assert torch.equal(batch["x"], torch.full((2,), float(i)))
+            assert batch["y"][0].item() == i
+        assert i == len(batches) - 1
+        with pytest.raises(StopIteration):
+            next(prefetcher)
+    finally:
+        prefetcher.close()
+
+
+def test_device_prefetcher_error() -> None:
+    def fail_after_one() -> typing.Iterator[torch.Tensor]:
+        yield torch.zeros(1)
+        raise ValueError("bad batch")
+
+    prefetcher = make_prefetcher(fail_after_one())
+    try:
+        assert torch.equal(next(prefetcher), torch.zeros(1))
+        with pytest.raises(ValueError, match="bad batch"):
+            next(prefetcher)
+        with pytest.raises(StopIteration):
+            next(prefetcher)
+    finally:
+        prefetcher.close()
+
+
+def test_device_prefetcher_depth_and_close() -> None:
+    loaded = []
+    more = threading.Event()
+
+    def count() -> typing.Iterator[int]:
+        i = 0
+        while True:
+            loaded.append(i)
+            if len(loaded) == 4:
+                more.set()
+            yield i
+            i += 1
+
+    prefetcher = make_prefetcher(count(), depth=2)
+    try:
+        assert next(prefetcher) == 0
+        # One batch was consumed; the queue holds two and the thread holds a third.
+        assert more.wait(timeout=10)
+    finally:
+        prefetcher.close()
+    assert not prefetcher._thread.is_alive()
+    assert len(loaded) == 4
+    with pytest.raises(StopIteration):
+        next(prefetcher)
+
+
+def test_to_device_coalesces_small_tensors() -> None:
+    # The meta device stands in for a GPU: tensors moved there keep their shapes and dtypes.
+    big = torch.zeros(1 << 19)
+    batch = {
+        "input_ids": torch.arange(6).reshape(2, 3),
+        "attention_mask": np.ones((2, 3), dtype=np.int64),
+        "labels": [torch.tensor(1), torch.tensor([0.5, 1.5])],
+        "pixels": (big, "str"),
+    }
+    moved = to_device(batch, torch.device("meta"))
+
+    assert set(moved) == set(batch)
+    assert moved["input_ids"].shape == (2, 3) and moved["input_ids"].dtype == torch.int64
+    assert moved["attention_mask"].shape == (2, 3)
+    assert moved["labels"][0].shape == () and moved["labels"][1].shape == (2,)
+    assert moved["labels"][1].dtype == torch.float32
+    assert moved["pixels"][0].shape == big.shape
+    assert moved["pixels"][1] == "str"
+    for t in [moved["input_ids"], moved["attention_mask"], *moved["labels"], moved["pixels"][0]]:
+        assert t.device.type == "meta"
+
+    # Small tensors of one dtype are views of a single device buffer; large ones are not.
+    assert moved["input_ids"]._base is moved["attention_mask"]._base is moved["labels"][0]._base
+    assert moved["input_ids"]._base is not None
+    assert moved["pixels"][0]._base is None
+
+
+def test_to_device_does_not_coalesce_sparse_tensors() -> None:
+    sparse = torch.eye(3).to_sparse()
+    moved = to_device({"sparse": sparse, "dense": torch.ones(3)}, torch.device("meta"))
+    assert moved["sparse"].layout == torch.sparse_coo
+    assert moved["sparse"].device.type == "meta"
+    assert moved["sparse"].shape == (3, 3)
+    assert moved["dense"].device.type == "meta"
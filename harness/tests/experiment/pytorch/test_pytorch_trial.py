@@ -4,11 +4,13 @@ import subprocess
 import sys
 import typing
 
+import numpy as np
 import pytest
 import torch
 
 import determined as det
 from determined import pytorch, workload
+from determined.pytorch import _pytorch_trial
 from tests.experiment import utils  # noqa: I100
 from tests.experiment.fixtures import pytorch_onevar_model, pytorch_xor_model
 
@@ -76,6 +78,29 @@ class TestPyTorchTrial:
         )
         controller.run()
 
+    def test_onevar_prefetch_to_device(self) -> None:
+        def make_workloads() -> workload.Stream:
+            trainer = utils.TrainAndValidate()
+
+            yield from trainer.send(steps=10, validation_freq=5, scheduling_unit=7)
+            training_metrics, _ = trainer.result()
+
+            # Prefetched batches must arrive in order, with none skipped or repeated.
+            for idx, batch_metrics in enumerate(training_metrics):
+                pytorch_onevar_model.OneVarTrial.check_batch_metrics(batch_metrics, idx)
+
+            yield workload.terminate_workload(), [], workload.ignore_workload_response
+
+        controller = utils.make_trial_controller_from_trial_implementation(
+            trial_class=pytorch_onevar_model.OneVarTrial,
+            hparams={**self.hparams, "prefetch_depth": 3},
+            workloads=make_workloads(),
+            trial_seed=self.trial_seed,
+        )
+        controller.run()
+        assert controller.prefetcher is not None
+        assert not controller.prefetcher._thread.is_alive()
+
     def test_xor_multi_validation(self) -> None:
         def make_workloads() -> workload.Stream:
             trainer = utils.TrainAndValidate()
@@ -504,6 +529,55 @@ class TestPyTorchTrial:
             controller.run()
 
 
+def test_convert_batch_metrics_to_numpy() -> None:
+    per_batch_metrics = [
+        {"loss": torch.tensor(float(i)), "acc": torch.tensor([i, i + 1]), "lr": 0.1}
+        for i in range(3)
+    ]
+    # Conversion one tensor at a time is the reference behavior.
+    expected = [
+        {
+            name: metric.cpu().detach().numpy() if isinstance(metric, torch.Tensor) else metric
+            for name, metric in batch_metrics.items()
+        }
+        for batch_metrics in per_batch_metrics
+    ]
+
+    converted = pytorch.PyTorchTrialController._convert_batch_metrics_to_numpy(per_batch_metrics)
+
+    assert len(converted) == len(expected)
+    for actual_metrics, expected_metrics in zip(converted, expected):
+        assert actual_metrics.keys() == expected_metrics.keys()
+        for name, value in expected_metrics.items():
+            assert type(actual_metrics[name]) is type(value)
+            if isinstance(value, np.ndarray):
+                assert actual_metrics[name].dtype == value.dtype
+                assert actual_metrics[name].shape == value.shape
+                assert np.array_equal(actual_metrics[name], value)
+            else:
+                assert actual_metrics[name] == value
+
+
+def test_average_metrics_timeseries() -> None:
+    combined_timeseries = {
+        "loss": [[1.0, 2.0, None], [3.0, None, None]],
+        "acc": [[np.array(0.5), np.array(0.25), np.array(1.0)]] * 2,
+        "nan": [[float("nan"), 1, 2], [1, 2, 3]],
+        "vector": [[np.array([1.0, 2.0])] * 3, [np.array([3.0, 4.0])] * 3],
+    }
+
+    with pytest.warns(RuntimeWarning, match="empty slice"):
+        expected = utils.average_metrics_timeseries_per_batch(combined_timeseries, ["acc"])
+    actual = _pytorch_trial._average_metrics_timeseries(combined_timeseries, ["acc"])
+
+    assert list(actual) == list(expected)
+    for metric_name, averages in expected.items():
+        assert len(actual[metric_name]) == len(averages)
+        for actual_avg, expected_avg in zip(actual[metric_name], averages):
+            assert type(actual_avg) is type(expected_avg)
+            np.testing.assert_equal(actual_avg, expected_avg)
+
+
 def test_create_trial_instance() -> None:
     utils.create_trial_instance(pytorch_xor_model.XORTrial)
 
@@ -1,5 +1,8 @@
+from typing import Any, List
+
 import numpy as np
 
+from determined import pytorch
 from determined.pytorch import Reducer, _reduce_metrics
 
 
@@ -12,3 +15,85 @@ def test_reducer() -> None:
 
     batches_per_process = [1, 2, 5, 4, 5, 6]
     assert np.around(_reduce_metrics(Reducer.AVG, metrics, batches_per_process), decimals=2) == 6.43
+
+
+def test_mergeable_reducers() -> None:
+    rng = np.random.RandomState(0)
+    batches = [rng.normal(size=(8, 3)) for _ in range(40)]
+    values = np.stack(batches)
+
+    cases = [
+        (pytorch.MeanMetricReducer, {}, np.mean(values)),
+        (pytorch.SumMetricReducer, {}, np.sum(values)),
+        (pytorch.MinMetricReducer, {}, np.min(values)),
+        (pytorch.MaxMetricReducer, {}, np.max(values)),
+        (
+            pytorch.HistogramMetricReducer,
+            {"bins": 10, "range": (-2, 2)},
+            np.histogram(values, bins=10, range=(-2, 2))[0],
+        ),
+    ]
+    for reducer_cls, kwargs, expected in cases:
+        # Split the batches across three "slots" and merge them with cross_slot_reduce().
+        slots = [reducer_cls(**kwargs) for _ in range(3)]  # type: ignore
+        for i, batch in enumerate(batches):
+            slots[i % 3].update(batch)
+        per_slot_results = [slot.result() for slot in slots]
+        result = slots[0].cross_slot_reduce([slot.per_slot_reduce() for slot in slots])
+        assert np.allclose(result, expected), reducer_cls.__name__
+
+        # Merging does not modify the per-slot reducers.
+        for slot, per_slot_result in zip(slots, per_slot_results):
+            assert np.allclose(slot.result(), per_slot_result)
+
+
+class ListMetricReducer(pytorch.MergeableMetricReducer):
+    """A reducer which clears its state in place on reset()."""
+
+    def __init__(self) -> None:
+        self.values = []  # type: List[Any]
+
+    def reset(self) -> None:
+        self.values.clear()
+
+    def update(self, value: Any) -> None:
+        self.values.append(value)
+
+    def merge(self, other: "ListMetricReducer") -> None:
+        self.values.extend(other.values)
+
+    def result(self) -> Any:
+        return sorted(self.values)
+
+
+def test_merge_reducers_with_in_place_reset() -> None:
+    slots = [ListMetricReducer() for _ in range(3)]
+    for i, slot in enumerate(slots):
+        slot.update(i)
+
+    assert slots[0].cross_slot_reduce(slots) == [0, 1, 2]
+    assert [slot.values for slot in slots] == [[0], [1], [2]]
+
+
+def test_quantile_reducer() -> None:
+    rng = np.random.RandomState(0)
+    quantiles = [0.01, 0.25, 0.5, 0.75, 0.99]
+    slots = [pytorch.QuantileMetricReducer(quantiles, max_centroids=200) for _ in range(4)]
+    values = rng.uniform(0, 1, size=(4, 100, 256))
+    for slot, slot_values in zip(slots, values):
+        for batch in slot_values:
+            slot.update(batch)
+        # The summary stays bounded no matter how many values were added.
+        assert len(slot.means) <= 400
+
+    estimates = slots[0].cross_slot_reduce(slots)
+    assert np.allclose(estimates, np.quantile(values, quantiles), atol=0.01)
+
+
+def test_make_mergeable_reducer() -> None:
+    metrics = np.array([0.25, 0.5, 0.75, 1, 25.5, 1.9])
+    for reducer in Reducer:
+        mergeable = pytorch._make_mergeable_reducer(reducer)
+        for metric in metrics:
+            mergeable.update(metric)
+        assert np.isclose(mergeable.result(), _reduce_metrics(reducer, metrics))
@@ -425,3 +425,19 @@ def create_trial_instance(trial_def: Type[det.Trial]) -> None:
             checkpoint_dir=td,
         )
     check.check_isinstance(trial_instance, det.Trial)
+
+
+def average_metrics_timeseries_per_batch(
+    combined_timeseries: Dict[str, List[List[Any]]], array_metrics: List[str]
+) -> Dict[str, List[Any]]:
+    """The original batch-at-a-time averaging of PyTorch training metrics, used as a reference."""
+    averaged = {}  # type: Dict[str, List[Any]]
+    for metric_name, timeseries in combined_timeseries.items():
+        averaged[metric_name] = []
+        for batch_idx in range(len(timeseries[0])):
+            np_batch = np.array([process[batch_idx] for process in timeseries])
+            batch_avg = np.mean(np_batch[np_batch != None])  # noqa: E711
+            if metric_name in array_metrics:
+                batch_avg = np.array(batch_avg)
+            averaged[metric_name].append(batch_avg)
+    return averaged
@@ -0,0 +1,90 @@
+import contextlib
+import http.server
+import socketserver
+import ssl
+import threading
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+from determined.common import requests
+
+CERTS_DIR = Path(__file__).parent / "common" / "multimaster-certs"
+
+
+class KeepAliveServer(socketserver.ThreadingMixIn, http.server.HTTPServer):
+    daemon_threads = True
+
+    def __init__(self, ssl_context: Optional[ssl.SSLContext]) -> None:
+        self.connections = 0
+        self.ssl_context = ssl_context
+        # If set, requests are counted, then the connection is closed without a response.
+        self.hang_up = False
+        self.requests = []  # type: List[str]
+
+        server = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Like the master, don't delay the body of a response behind its headers.
+            disable_nagle_algorithm = True
+
+            def setup(self) -> None:
+                with lock:
+                    server.connections += 1
+                super().setup()
+
+            def hung_up(self) -> bool:
+                with lock:
+                    server.requests.append(self.command)
+                if server.hang_up:
+                    self.close_connection = True
+                return server.hang_up
+
+            def do_PUT(self) -> None:
+                self.hung_up()
+
+            def do_GET(self) -> None:
+                if self.hung_up():
+                    return
+                body = b'{"ok": true}'
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("Set-Cookie", "session=abc")
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args: object) -> None:
+                pass
+
+        lock = threading.Lock()
+        super().__init__(("localhost", 0), Handler)
+
+    def get_request(self):  # type: ignore
+        sock, address = super().get_request()
+        if self.ssl_context is not None:
+            sock = self.ssl_context.wrap_socket(sock, server_side=True)
+        return sock, address
+
+
+@contextlib.contextmanager
+def run_server(use_tls: bool = False) -> Iterator[KeepAliveServer]:
+    ssl_context = None
+    if use_tls:
+        ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        ssl_context.load_cert_chain(CERTS_DIR / "cert1.pem", CERTS_DIR / "key1.pem")
+    server = KeepAliveServer(ssl_context)
+    thread = threading.Thread(target=server.serve_forever, args=[0.1])
+    thread.start()
+    try:
+        yield server
+    finally:
+        requests.close_pool()
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+
+def master_url(server: KeepAliveServer) -> str:
+    scheme = "https" if server.ssl_context is not None else "http"
+    return "{}://localhost:{}".format(scheme, server.server_address[1])
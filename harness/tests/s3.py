@@ -1,26 +1,57 @@
-from typing import Any, Dict, List, Tuple
+import io
+from typing import Any, Dict, List, Tuple, Union
 
 import boto3.exceptions
+import botocore.exceptions
 
 
 class MockS3Client:
-    def __init__(self, faulty: bool = False) -> None:
-        self.objects = {}  # type: Dict[Tuple[str, str], str]
+    def __init__(self, faulty: bool = False, can_list_bucket: bool = True) -> None:
+        self.objects = {}  # type: Dict[Tuple[str, str], Union[str, bytes]]
         self.faulty = faulty
+        self.can_list_bucket = can_list_bucket
 
     def put_object(self, **kwargs: str) -> None:
         if self.faulty:
             raise boto3.exceptions.S3UploadFailedError()
         self.objects[(kwargs["Bucket"], kwargs["Key"])] = kwargs["Body"]
 
-    def upload_file(self, path: str, bucket: str, key: str) -> None:
+    def upload_file(self, path: str, bucket: str, key: str, Config: Any = None) -> None:
         with open(path, "r") as fp:
             self.put_object(Bucket=bucket, Key=key, Body=fp.read())
 
-    def download_file(self, bucket: str, key: str, path: str) -> None:
+    def download_file(self, bucket: str, key: str, path: str, Config: Any = None) -> None:
         with open(path, "w") as fp:
             fp.write(self.objects[(bucket, key)])
 
+    def _get(self, bucket: str, key: str, operation: str) -> Union[str, bytes]:
+        if (bucket, key) not in self.objects:
+            # S3 hides whether a key exists from clients which cannot list the bucket.
+            if not self.can_list_bucket:
+                raise botocore.exceptions.ClientError(
+                    {"Error": {"Code": "AccessDenied", "Message": "Access Denied"}}, operation
+                )
+            raise botocore.exceptions.ClientError(
+                {"Error": {"Code": "NoSuchKey", "Message": "Not Found"}}, operation
+            )
+        return self.objects[(bucket, key)]
+
+    def get_object(self, Bucket: str, Key: str) -> Dict[str, Any]:
+        body = self._get(Bucket, Key, "GetObject")
+        return {"Body": io.BytesIO(body.encode() if isinstance(body, str) else body)}
+
+    def head_object(self, Bucket: str, Key: str) -> Dict[str, Any]:
+        self._get(Bucket, Key, "HeadObject")
+        return {}
+
+    def list_objects_v2(self, Bucket: str, Prefix: str, MaxKeys: int = 1000) -> Dict[str, Any]:
+        keys = sorted(k for b, k in self.objects if b == Bucket and k.startswith(Prefix))
+        contents = [{"Key": k} for k in keys[:MaxKeys]]
+        return {"Contents": contents, "KeyCount": len(contents)}
+
+    def delete_object(self, Bucket: str, Key: str) -> None:
+        self.objects.pop((Bucket, Key), None)
+
     # kwargs are capital to match the signature of the boto3 s3 client
     def delete_objects(self, Bucket: str, Delete: Dict[str, List[Dict[str, str]]]) -> None:
         assert "Objects" in Delete
@@ -1,12 +1,15 @@
 import os
 import tempfile
 from pathlib import Path
+from typing import Any, Dict, List, cast
 
+import botocore.exceptions
 import pytest
 from _pytest.monkeypatch import MonkeyPatch
 from boto3.exceptions import S3UploadFailedError
 
 from determined.common import storage
+from determined.common.storage import s3 as s3_storage
 from tests import s3
 from tests.storage import util
 
@@ -62,3 +65,132 @@ def test_verify_s3_upload_error(tmp_path: Path, monkeypatch: MonkeyPatch) -> Non
     with pytest.raises(S3UploadFailedError):
         storage.validate_config(config, container_path=None)
     assert len(os.listdir(tmpdir_s)) == 0
+
+
+def test_s3_concurrent_transfers(manager: storage.S3StorageManager) -> None:
+    manager.max_concurrency = 4
+
+    files = {"file{}.txt".format(i): "content {}".format(i) for i in range(32)}
+    with manager.store_path() as (storage_id, path):
+        os.makedirs(path)
+        for name, content in files.items():
+            with open(os.path.join(path, name), "w") as f:
+                f.write(content)
+        metadata = storage.StorageMetadata(storage_id, manager._list_directory(path))
+
+    with manager.restore_path(metadata) as path:
+        assert set(os.listdir(path)) == set(files)
+        for name, content in files.items():
+            with open(os.path.join(path, name)) as f:
+                assert f.read() == content
+
+
+def test_s3_retries_transient_errors(
+    manager: storage.S3StorageManager, monkeypatch: MonkeyPatch
+) -> None:
+    upload_file = manager.client.upload_file
+    failed = set()
+
+    def flaky_upload_file(path: str, bucket: str, key: str, **kwargs: Any) -> None:
+        # Fail the first attempt of every file.
+        if key not in failed:
+            failed.add(key)
+            raise botocore.exceptions.EndpointConnectionError(endpoint_url="s3://bucket")
+        upload_file(path, bucket, key, **kwargs)
+
+    monkeypatch.setattr(manager.client, "upload_file", flaky_upload_file)
+
+    with manager.store_path() as (storage_id, path):
+        util.create_checkpoint(path)
+        metadata = storage.StorageMetadata(storage_id, manager._list_directory(path))
+
+    assert len(failed) == 2
+    with manager.restore_path(metadata) as path:
+        util.validate_checkpoint(path)
+
+
+def test_s3_deduplicated_lifecycle(manager: storage.S3StorageManager) -> None:
+    manager.deduplicate = True
+    client = cast(s3.MockS3Client, manager.client)
+
+    def store(contents: Dict[str, str]) -> storage.StorageMetadata:
+        with manager.store_path() as (storage_id, path):
+            util.create_checkpoint(path)
+            for name, content in contents.items():
+                with open(os.path.join(path, name), "w") as f:
+                    f.write(content)
+            return storage.StorageMetadata(storage_id, manager._list_directory(path))
+
+    def blobs() -> List[str]:
+        return [key for _, key in client.objects if key.startswith(s3_storage.BLOB_PREFIX)]
+
+    first = store({"weights.bin": "frozen", "head.bin": "head v1"})
+    assert len(blobs()) == 4
+
+    # Only the changed file is uploaded for the second checkpoint.
+    second = store({"weights.bin": "frozen", "head.bin": "head v2"})
+    assert len(blobs()) == 5
+
+    for metadata in (first, second):
+        with manager.restore_path(metadata) as path:
+            assert set(manager._list_directory(path)) == set(metadata.resources)
+            with open(os.path.join(path, "subdir", "file.txt")) as f:
+                assert f.read() == util.EXPECTED_FILES["subdir/file.txt"]
+
+    # Blobs shared with the second checkpoint survive deleting the first one.
+    manager.delete(first)
+    assert len(blobs()) == 4
+    with manager.restore_path(second) as path:
+        with open(os.path.join(path, "head.bin")) as f:
+            assert f.read() == "head v2"
+
+    manager.delete(second)
+    assert client.objects == {}
+
+
+def test_s3_deduplicated_concurrent_delete(
+    manager: storage.S3StorageManager, monkeypatch: MonkeyPatch
+) -> None:
+    manager.deduplicate = True
+    client = cast(s3.MockS3Client, manager.client)
+
+    with manager.store_path() as (storage_id, path):
+        util.create_checkpoint(path)
+        first = storage.StorageMetadata(storage_id, manager._list_directory(path))
+
+    # Simulate deleting the first checkpoint just after the second one finds its blobs exist.
+    blob_exists = manager._blob_exists
+    deleted = []
+
+    def racing_blob_exists(digest: str) -> bool:
+        exists = blob_exists(digest)
+        if exists and digest not in deleted:
+            deleted.append(digest)
+            client.delete_object(Bucket="bucket", Key=s3_storage.BLOB_PREFIX + digest)
+        return exists
+
+    monkeypatch.setattr(manager, "_blob_exists", racing_blob_exists)
+    with manager.store_path() as (storage_id, path):
+        util.create_checkpoint(path)
+        second = storage.StorageMetadata(storage_id, manager._list_directory(path))
+    monkeypatch.undo()
+
+    assert deleted
+    manager.delete(first)
+    with manager.restore_path(second) as path:
+        util.validate_checkpoint(path)
+
+
+def test_s3_without_list_bucket(tmp_path: Path, monkeypatch: MonkeyPatch) -> None:
+    monkeypatch.setattr("boto3.client", lambda *_, **__: s3.MockS3Client(can_list_bucket=False))
+    manager = storage.S3StorageManager(
+        bucket="bucket", access_key="key", secret_key="secret", temp_dir=str(tmp_path)
+    )
+    with manager.store_path() as (storage_id, path):
+        util.create_checkpoint(path)
+        metadata = storage.StorageMetadata(storage_id, manager._list_directory(path))
+
+    with manager.restore_path(metadata) as path:
+        util.validate_checkpoint(path)
+    manager.delete(metadata)
+    assert cast(s3.MockS3Client, manager.client).objects == {}
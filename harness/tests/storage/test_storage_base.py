@@ -1,4 +1,6 @@
 import os
+import pathlib
+import shutil
 
 import pytest
 
@@ -55,3 +57,17 @@ def test_list_nonexistent_directory() -> None:
     assert not os.path.exists(root)
     with pytest.raises(CheckFailedError, match="must be an extant directory"):
         StorageManager._list_directory(root)
+
+
+def test_verify_restored_path(tmp_path: pathlib.Path) -> None:
+    root = os.path.join(os.path.dirname(__file__), "fixtures")
+    metadata = storage.StorageMetadata("id", StorageManager._list_directory(root))
+    StorageManager.verify_restored_path(root, metadata)
+
+    shutil.copytree(root, str(tmp_path / "incomplete"))
+    (tmp_path / "incomplete" / "nested" / "nested.txt").unlink()
+    (tmp_path / "incomplete" / "root.txt").write_text("changed" * 100)
+    with pytest.raises(CheckFailedError, match="incomplete") as e:
+        StorageManager.verify_restored_path(str(tmp_path / "incomplete"), metadata)
+    assert "root.txt" in str(e.value) and "nested/nested.txt" in str(e.value)
+    assert "nested/another.txt" not in str(e.value)
@@ -4,7 +4,7 @@ import numpy as np
 
 import determined as det
 import determined.common.types
-from determined import constants, workload
+from determined import constants, tensorboard, workload
 from determined.tensorboard import SharedFSTensorboardManager, get_base_path, get_sync_path
 from determined.tensorboard.metric_writers import util as metric_writers_util
 
@@ -98,3 +98,45 @@ def test_list_tb_files_nonexistent_directory(tmp_path: pathlib.Path) -> None:
 
     assert not pathlib.Path(base_path).exists()
     assert manager.list_tb_files(0) == []
+
+
+def test_tb_file_index(tmp_path: pathlib.Path) -> None:
+    index = tensorboard.util.TBFileIndex(tmp_path)
+    events = tmp_path.joinpath("events.out.tfevents.1")
+    events.write_bytes(b"abc")
+    tmp_path.joinpath("ignored.txt").write_bytes(b"abc")
+    assert index.changes() == [(events, 0)]
+
+    # Nothing changed, so nothing is reported.
+    assert index.changes() == []
+
+    # Appends are reported along with the bytes that were already reported.
+    with events.open("ab") as f:
+        f.write(b"defg")
+    assert index.changes() == [(events, 3)]
+
+    # Files in new subdirectories are found.
+    trace = tmp_path.joinpath("plugins", "profile", "host.trace.json.gz")
+    trace.parent.mkdir(parents=True)
+    trace.write_bytes(b"trace")
+    assert index.changes() == [(trace, 0)]
+
+    # A truncated file is reported from the start.
+    events.write_bytes(b"x")
+    assert index.changes() == [(events, 0)]
+
+
+def test_sync_appends_to_shared_fs(tmp_path: pathlib.Path) -> None:
+    base_path = tmp_path.joinpath("tensorboard")
+    base_path.mkdir()
+    storage_path = tmp_path.joinpath("storage")
+    manager = SharedFSTensorboardManager(str(storage_path), base_path, pathlib.Path("sync"))
+
+    events = base_path.joinpath("events.out.tfevents.1")
+    events.write_bytes(b"abc")
+    manager.sync()
+    with events.open("ab") as f:
+        f.write(b"def")
+    manager.sync()
+
+    assert storage_path.joinpath("sync", "events.out.tfevents.1").read_bytes() == b"abcdef"
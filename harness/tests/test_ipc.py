@@ -7,7 +7,9 @@ import threading
 import traceback
 from typing import Any, Callable, List, Optional, cast
 
+import numpy as np
 import pytest
+import zmq
 
 import determined as det
 from determined import ipc, layers, workload
@@ -124,6 +126,46 @@ def test_broadcast_server_client() -> None:
                 assert all(g == 2 * msg for g in gathered)
 
 
+def test_send_recv_obj_zero_copy() -> None:
+    context = zmq.Context()
+    sender = context.socket(zmq.PAIR)
+    receiver = context.socket(zmq.PAIR)
+    port = sender.bind_to_random_port("tcp://127.0.0.1")
+    receiver.connect(f"tcp://127.0.0.1:{port}")
+
+    big = np.arange(100000, dtype=np.float32).reshape(1000, 100)
+    obj = {
+        "big": big,
+        "strided": big[:, ::2],
+        "small": np.arange(3),
+        "objects": np.array([{"a": 1}, None], dtype=object),
+        "nested": [(big * 2, "label")],
+    }
+    try:
+        ipc._send_obj(sender, obj)
+        frames = receiver.recv_multipart(copy=False)
+        # Only the two large contiguous arrays get their own frames.
+        assert len(frames) == 3
+
+        ipc._send_obj(sender, obj)
+        received = ipc._recv_obj(receiver)
+    finally:
+        sender.close()
+        receiver.close()
+
+    assert received.keys() == obj.keys()
+    for key in ["big", "strided", "small"]:
+        assert received[key].dtype == obj[key].dtype
+        assert np.array_equal(received[key], obj[key])
+    assert list(received["objects"]) == list(obj["objects"])
+    assert np.array_equal(received["nested"][0][0], big * 2)
+    assert received["nested"][0][1] == "label"
+
+    # Arrays backed by received frames can be modified like unpickled arrays.
+    received["big"][0, 0] = -1
+    assert received["big"][0, 0] == -1
+
+
 def test_subprocess_launcher_receiver() -> None:
     env = utils.make_default_env_context(hparams={"global_batch_size": 1})
     rendezvous_info = utils.make_default_rendezvous_info()
@@ -266,6 +308,22 @@ def test_distributed_context(cross_size: int, local_size: int, force_tcp: bool)
     ]
     assert results == expect, "not all threads ran allgather_local correctly"
 
+    # Perform a hierarchical gather.
+    results = do_parallel(
+        lambda rank, _, __: set(contexts[rank]._zmq_gather_hierarchical(rank) or [])
+    )
+    assert results == [chief] + [set()] * (size - 1), "not all threads ran gather correctly"
+
+    # Perform a hierarchical gather with a reduction at each level.
+    results = do_parallel(lambda rank, _, __: contexts[rank]._zmq_gather_hierarchical(rank, sum))
+    assert results == [sum(range(size))] + [None] * (size - 1), "hierarchical reduce failed"
+
+    # Perform a hierarchical allgather with a reduction.
+    results = do_parallel(
+        lambda rank, _, __: contexts[rank]._zmq_allgather_hierarchical(rank + 1, max)
+    )
+    assert results == [size] * size, "not all threads ran hierarchical allgather correctly"
+
     # Close all contexts.
     for context in contexts:
         context.close()
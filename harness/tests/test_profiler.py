@@ -0,0 +1,312 @@
+import argparse
+import base64
+import logging
+import pathlib
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, List
+
+import numpy as np
+import pytest
+import requests
+import simplejson
+
+from determined import profiler
+from determined.cli import profiler as cli_profiler
+from determined.common import api
+from determined.common.api import TrialProfilerMetricsBatch, TrialProfilerMetricsColumns
+
+
+def test_timing_recorder_drains_in_bulk() -> None:
+    recorder = profiler.TimingRecorder(capacity=4)
+    forward = recorder.name_id("forward")
+    backward = recorder.name_id("backward")
+    assert recorder.name_id("forward") == forward
+
+    # Wrap around the ring buffer a few times.
+    for i in range(10):
+        recorder.record(forward if i % 2 == 0 else backward, 1000 * i, 10 * i, i)
+        if i % 3 == 2:
+            drained = recorder.drain()
+            assert sum(len(starts) for starts, _, _ in drained.values()) == 3
+    drained = recorder.drain()
+    starts, batch_idxs, durations = drained["backward"]
+    assert starts.tolist() == [9000]
+    assert batch_idxs.tolist() == [9]
+    assert durations.tolist() == [90]
+    assert recorder.drain() == {}
+    assert recorder.dropped == 0
+
+    # A full buffer drops new timings rather than overwriting undrained ones.
+    for i in range(6):
+        recorder.record(forward, i, 1, i)
+    assert recorder.dropped == 2
+    assert recorder.drain()["forward"][0].tolist() == [0, 1, 2, 3]
+
+
+def test_timing_recorder_buffers_per_thread() -> None:
+    recorder = profiler.TimingRecorder(capacity=100)
+    name_id = recorder.name_id("step")
+
+    def record(offset: int) -> None:
+        for i in range(50):
+            recorder.record(name_id, offset + i, 1, i)
+
+    threads = [threading.Thread(target=record, args=(1000 * t,)) for t in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    starts, _, _ = recorder.drain()["step"]
+    assert sorted(starts.tolist()) == sorted(1000 * t + i for t in range(4) for i in range(50))
+
+
+def test_metric_batch_timestamps() -> None:
+    timestamp = datetime(2021, 6, 1, 12, 30, 15, 123456, tzinfo=timezone.utc)
+    batch = profiler.MetricBatch("1", "agent")
+    batch.append(
+        profiler.MetricType.SYSTEM,
+        profiler.SysMetricName.FREE_MEM_METRIC,
+        profiler.Measurement(timestamp, 3, 1.5),
+    )
+    timestamp_ns = profiler.MetricBatch.convert_to_ns(timestamp)
+    batch.extend(
+        profiler.MetricType.TIMING,
+        "forward",
+        np.array([timestamp_ns, timestamp_ns + 1500], dtype=np.int64),
+        np.array([4, 5]),
+        np.array([0.25, 0.5]),
+    )
+
+    posted = {c.labels["name"]: profiler.MetricBatch.to_post_format(c) for c in batch.consume()}
+    assert posted["free_memory"].timestamps == [timestamp.isoformat()]
+    assert posted["free_memory"].batches == [3]
+    assert posted["free_memory"].values == [1.5]
+    assert posted["forward"].timestamps == [
+        timestamp.isoformat(),
+        "2021-06-01T12:30:15.123457+00:00",
+    ]
+    assert posted["forward"].batches == [4, 5]
+    assert posted["forward"].values == [0.25, 0.5]
+    assert posted["forward"].labels["metricType"] == profiler.MetricType.TIMING.value
+    assert batch.consume() == []
+
+
+def test_profiler_agent_records_timings(caplog: pytest.LogCaptureFixture) -> None:
+    caplog.set_level(logging.INFO)
+    sent = []  # type: List[TrialProfilerMetricsBatch]
+
+    agent = profiler.ProfilerAgent(
+        trial_id="1",
+        agent_id="agent",
+        master_url="",
+        profiling_is_enabled=True,
+        global_rank=0,
+        # Only collect timings; system metrics are collected by local rank 0.
+        local_rank=1,
+        begin_on_batch=1,
+        send_batch_fn=lambda _, batches: sent.extend(batches),
+        check_data_exists_fn=lambda *_: False,
+    )
+    with agent:
+        # Not recorded: collection has not begun yet.
+        with agent.record_timing("dataloader_next"):
+            pass
+        for batch_idx in range(1, 4):
+            agent.update_batch_idx(batch_idx)
+            with agent.record_timing("dataloader_next"):
+                pass
+            with agent.record_timing("train_batch"):
+                pass
+        agent.record_metric("loss", 0.5)
+
+    posted = {b.labels["name"]: b for b in sent}
+    assert set(posted) == {"dataloader_next", "train_batch", "loss"}
+    assert posted["dataloader_next"].batches == [1, 2, 3]
+    assert posted["train_batch"].batches == [1, 2, 3]
+    assert all(v >= 0 for v in posted["dataloader_next"].values)
+    assert posted["loss"].values == [0.5]
+    assert posted["loss"].labels["metricType"] == profiler.MetricType.MISC.value
+    assert "bottleneck report" in caplog.text
+    assert all(ts.endswith("+00:00") for ts in posted["dataloader_next"].timestamps)
+
+    # Once the agent has finished, record_timing is a no-op.
+    with agent.record_timing("dataloader_next"):
+        pass
+    assert agent.timing_recorder.drain() == {}
+
+
+def test_encode_trial_profiler_metrics_columns() -> None:
+    timestamps_ns = np.array([1634567890123456789, 1634567890223456789, 1634567890323457000])
+    columns = TrialProfilerMetricsColumns(
+        timestamps_ns,
+        np.array([1, 2, 3]),
+        np.array([0.5, 1.25, 3.0]),
+        {"trialId": "1", "name": "forward"},
+    )
+    (series,) = simplejson.loads(api.profiler.encode_trial_profiler_metrics_columns([columns]))
+
+    assert series["labels"] == columns.labels
+    deltas = np.frombuffer(base64.b64decode(series["timestamp_deltas"]), dtype="<i8")
+    assert (series["timestamp_base"] + np.cumsum(deltas)).tolist() == timestamps_ns.tolist()
+    batches = np.frombuffer(base64.b64decode(series["batches"]), dtype="<i4")
+    assert batches.tolist() == [1, 2, 3]
+    values = np.frombuffer(base64.b64decode(series["values"]), dtype="<f4")
+    assert values.tolist() == [0.5, 1.25, 3.0]
+
+
+@pytest.mark.parametrize("status_code", [404, 500])
+def test_sender_falls_back_to_json(status_code: int) -> None:
+    sent_batches = []  # type: List[Any]
+    sent_columns = []  # type: List[Any]
+
+    def send_columns(_: str, series: List[TrialProfilerMetricsColumns]) -> None:
+        sent_columns.append(series)
+        response = requests.Response()
+        response.status_code = status_code
+        raise api.errors.APIException(response)
+
+    series = [
+        TrialProfilerMetricsColumns(
+            np.array([1000]), np.array([1]), np.array([0.5]), {"name": "forward"}
+        )
+    ]
+    q = queue.Queue()  # type: queue.Queue
+    sender = profiler.ProfilerSenderThread(
+        q, "", 1, lambda _, batches: sent_batches.append(batches), send_columns
+    )
+
+    if status_code >= 500:
+        with pytest.raises(api.errors.APIException):
+            sender.send(series)
+        return
+
+    sender.send(series)
+    sender.send(series)
+    # The columnar format is only attempted once.
+    assert len(sent_columns) == 1
+    assert len(sent_batches) == 2
+    assert sent_batches[0][0].values == [0.5]
+    assert sent_batches[0][0].timestamps == ["1970-01-01T00:00:00.000001+00:00"]
+
+
+def test_offline_profiler_file(tmp_path: pathlib.Path, capsys: pytest.CaptureFixture) -> None:
+    path = str(tmp_path / "out" / f"trial_1_rank_0{profiler.PROFILER_FILE_SUFFIX}")
+
+    agent = profiler.ProfilerAgent(
+        trial_id="1",
+        agent_id="agent",
+        master_url="",
+        profiling_is_enabled=True,
+        global_rank=0,
+        local_rank=1,
+        begin_on_batch=0,
+        check_data_exists_fn=lambda *_: pytest.fail("offline profiling must not query the master"),
+        output_path=path,
+    )
+    with agent:
+        for batch_idx in range(1, 4):
+            agent.update_batch_idx(batch_idx)
+            with agent.record_timing("dataloader_next"):
+                pass
+            with agent.record_timing("train_batch"):
+                time.sleep(0.01)
+    # The offline sink has no collection time limit.
+    assert agent.shutdown_timer.duration is None
+
+    # A crash in the middle of a write leaves a truncated record, which is ignored.
+    with open(path, "ab") as f:
+        f.write(b"\x10\x00")
+
+    series = {s.labels["name"]: s for s in profiler.read_profiler_file(path)}
+    assert set(series) == {"dataloader_next", "train_batch"}
+    assert series["train_batch"].batches.tolist() == [1, 2, 3]
+    assert all(series["train_batch"].values >= 0.01)
+
+    breakdown = profiler.timing_breakdown(list(series.values()))
+    assert [row["name"] for row in breakdown] == ["train_batch", "dataloader_next"]
+    assert breakdown[0]["count"] == 3
+    assert breakdown[0]["mean_ms"] >= 10
+    assert 0 < breakdown[0]["percent"] <= 100
+
+    cli_profiler.summarize(argparse.Namespace(files=[path], csv=True))
+    assert "train_batch,3," in capsys.readouterr().out
+
+    cli_profiler.report(argparse.Namespace(files=[path]))
+    assert "the trial is compute-bound" in capsys.readouterr().out
+
+
+def make_series(
+    metric_type: profiler.MetricType, name: str, values: List[float]
+) -> TrialProfilerMetricsColumns:
+    return TrialProfilerMetricsColumns(
+        np.arange(len(values), dtype=np.int64),
+        np.arange(len(values)),
+        np.array(values, dtype=np.float64),
+        profiler.MetricBatch.make_labels(name, "1", "agent", metric_type.value, ""),
+    )
+
+
+def test_timing_breakdown_combines_ranks() -> None:
+    timing = profiler.MetricType.TIMING
+    # Two ranks spend the whole span (timestamps 0 to 4s) in train_batch; one loads data.
+    series = [
+        make_series(timing, "train_batch", [1.0] * 4),
+        make_series(timing, "train_batch", [1.0] * 4),
+        make_series(timing, "dataloader_next", [0.5] * 4),
+    ]
+    for s in series:
+        s.timestamps_ns = np.arange(4, dtype=np.int64) * 10**9
+    series[1].labels["agentId"] = "other-agent"
+
+    breakdown = profiler.timing_breakdown(series)
+    assert [row["name"] for row in breakdown] == ["train_batch", "dataloader_next"]
+    assert breakdown[0]["count"] == 8
+    assert breakdown[0]["total_s"] == 8
+    assert breakdown[0]["percent"] == pytest.approx(100)
+    assert breakdown[1]["percent"] == pytest.approx(50)
+
+
+@pytest.mark.parametrize(
+    "slowest,classification,suggestion",
+    [
+        ("dataloader_next", "input-pipeline-bound", "num_workers"),
+        ("to_device", "host-device-transfer-bound", "pin_memory"),
+        ("train_batch", "compute-bound", "increase global_batch_size"),
+        ("reduce_metrics", "sync-bound", "average_training_metrics"),
+    ],
+)
+def test_bottleneck_report(slowest: str, classification: str, suggestion: str) -> None:
+    timing = profiler.MetricType.TIMING
+    analyzer = profiler.BottleneckAnalyzer()
+    # Flushes are added one at a time, as the sender thread does.
+    for _ in range(3):
+        analyzer.add(
+            [
+                make_series(timing, name, [1.0 if name == slowest else 0.1] * 10)
+                for name in ["dataloader_next", "to_device", "train_batch", "reduce_metrics"]
+            ]
+            + [
+                make_series(
+                    profiler.MetricType.SYSTEM, profiler.SysMetricName.GPU_UTIL_METRIC, [40]
+                ),
+                make_series(profiler.MetricType.MISC, "samples_per_second", [100, 300]),
+            ]
+        )
+
+    report = analyzer.report()
+    assert report is not None
+    assert report.classification == classification
+    assert report.breakdown[classification] == pytest.approx(1.0 / 1.3)
+    assert report.gpu_util == 40
+    assert report.samples_per_second == 200
+    assert any(suggestion in s for s in report.suggestions)
+    assert classification in str(report)
+
+
+def test_bottleneck_report_without_timings() -> None:
+    series = [make_series(profiler.MetricType.SYSTEM, profiler.SysMetricName.GPU_UTIL_METRIC, [1])]
+    assert profiler.bottleneck_report(series) is None
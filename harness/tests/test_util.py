@@ -1,4 +1,7 @@
-from determined.common.util import sizeof_fmt
+import random
+import threading
+
+from determined.common.util import preserve_random_state, sizeof_fmt
 from determined.util import _dict_to_list, _list_to_dict
 
 
@@ -15,3 +18,32 @@ def test_dict_to_list() -> None:
 def test_sizeof_fmt() -> None:
     assert sizeof_fmt(1024) == "1.0KB"
     assert sizeof_fmt(36) == "36.0B"
+
+
+def test_preserve_random_state_on_background_thread() -> None:
+    in_background = threading.Event()
+    finish_background = threading.Event()
+
+    @preserve_random_state
+    def background() -> None:
+        in_background.set()
+        finish_background.wait()
+
+    @preserve_random_state
+    def foreground() -> float:
+        return random.random()
+
+    random.seed(1)
+    expected = [random.random() for _ in range(2)]
+
+    # A decorated call on a background thread neither blocks decorated calls on the main thread
+    # nor rewinds the randomness the main thread draws while it runs.
+    random.seed(1)
+    thread = threading.Thread(target=background)
+    thread.start()
+    in_background.wait()
+    foreground()
+    assert random.random() == expected[0]
+    finish_background.set()
+    thread.join()
+    assert random.random() == expected[1]
@@ -1,7 +1,8 @@
 import contextlib
 import os
 import pathlib
-from typing import Any, Dict, Iterator, Optional, cast
+import threading
+from typing import Any, Dict, Iterator, List, Optional, cast
 
 import numpy as np
 import pytest
@@ -23,6 +24,21 @@ class NoopTensorboardManager(tensorboard.TensorboardManager):
         pass
 
 
+class BlockingTensorboardManager(tensorboard.TensorboardManager):
+    """Syncs only complete once allow_sync is set, counting the completed syncs."""
+
+    def __init__(self) -> None:
+        self.allow_sync = threading.Event()
+        self.num_syncs = 0
+
+    def sync(self) -> None:
+        self.allow_sync.wait()
+        self.num_syncs += 1
+
+    def delete(self) -> None:
+        pass
+
+
 class NoopBatchMetricWriter(tensorboard.BatchMetricWriter):
     def __init__(self) -> None:
         pass
@@ -51,6 +67,25 @@ class FailOnUploadStorageManager(storage.StorageManager):
         raise NotImplementedError()
 
 
+class BlockingUploadStorageManager(storage.StorageManager):
+    """Uploads only complete once allow_upload is set, recording the uploaded storage IDs."""
+
+    def __init__(self, base_path: str) -> None:
+        super().__init__(base_path)
+        self.allow_upload = threading.Event()
+        self.uploaded = []  # type: List[str]
+
+    def post_store_path(
+        self, storage_id: str, storage_dir: str, metadata: storage.StorageMetadata
+    ) -> None:
+        self.allow_upload.wait()
+        self.uploaded.append(storage_id)
+
+    @contextlib.contextmanager
+    def restore_path(self, metadata: storage.StorageMetadata) -> Iterator[str]:
+        raise NotImplementedError()
+
+
 class NoopTrialController(det.TrialController):
     def __init__(
         self, workloads: workload.Stream, validation_metrics: Optional[Dict[str, Any]] = None
@@ -87,7 +122,8 @@ class NoopTrialController(det.TrialController):
                     f.write("yup")
                 response_func({})
             elif w.kind == workload.Workload.Kind.TERMINATE:
-                raise NotImplementedError()
+                response_func({})
+                break
 
 
 def test_checkpoint_upload_failure(tmp_path: pathlib.Path) -> None:
@@ -121,6 +157,138 @@ def test_checkpoint_upload_failure(tmp_path: pathlib.Path) -> None:
         trial_controller.run()
 
 
+def make_async_upload_env(max_uploads: int) -> det.EnvContext:
+    hparams = {"global_batch_size": 64}
+    experiment_config = utils.make_default_exp_config(hparams, 1)
+    experiment_config["optimizations"]["async_checkpoint_uploads"] = max_uploads
+    return utils.make_default_env_context(hparams=hparams, experiment_config=experiment_config)
+
+
+def test_async_checkpoint_upload(tmp_path: pathlib.Path) -> None:
+    env = make_async_upload_env(1)
+    storage_manager = BlockingUploadStorageManager(str(tmp_path))
+    checkpoints = []  # type: List[str]
+
+    def checkpoint_response_func(message: workload.Response) -> None:
+        # The master hears about the checkpoint before its upload has finished.
+        assert storage_manager.uploaded == []
+        message = cast(Dict[str, Any], message)
+        assert message["checkpoint_upload_pending"]
+        assert message["uploaded_checkpoints"] == []
+        checkpoints.append(message["metrics"].storage_id)
+
+    def train_response_func(message: workload.Response) -> None:
+        # The next response tells the master that the upload finished.
+        assert cast(Dict[str, Any], message)["uploaded_checkpoints"] == checkpoints
+
+    def terminate_response_func(_: workload.Response) -> None:
+        # Terminating waits for outstanding uploads.
+        assert storage_manager.uploaded == checkpoints
+
+    def make_workloads() -> workload.Stream:
+        yield workload.train_workload(1, num_batches=100), [], workload.ignore_workload_response
+        yield workload.checkpoint_workload(), [], checkpoint_response_func
+        storage_manager.allow_upload.set()
+        cast(Any, workload_manager).checkpoint_uploader.flush()
+        yield workload.train_workload(2, num_batches=100), [], train_response_func
+        yield workload.terminate_workload(2), [], terminate_response_func
+
+    workload_manager = layers.build_workload_manager(
+        env,
+        make_workloads(),
+        utils.make_default_rendezvous_info(),
+        storage_manager,
+        NoopTensorboardManager(),
+        NoopBatchMetricWriter(),
+    )
+
+    NoopTrialController(iter(workload_manager)).run()
+    assert len(checkpoints) == 1
+    assert storage_manager.uploaded == checkpoints
+
+
+def test_async_checkpoint_upload_failure(tmp_path: pathlib.Path) -> None:
+    env = make_async_upload_env(2)
+    storage_manager = FailOnUploadStorageManager(str(tmp_path))
+
+    def terminate_response_func(_: workload.Response) -> None:
+        raise ValueError("response_func should not be called if the upload fails")
+
+    def make_workloads() -> workload.Stream:
+        yield workload.train_workload(1, num_batches=100), [], workload.ignore_workload_response
+        yield workload.checkpoint_workload(), [], workload.ignore_workload_response
+        yield workload.terminate_workload(), [], terminate_response_func
+
+    workload_manager = layers.build_workload_manager(
+        env,
+        make_workloads(),
+        utils.make_default_rendezvous_info(),
+        storage_manager,
+        NoopTensorboardManager(),
+        NoopBatchMetricWriter(),
+    )
+
+    with pytest.raises(ValueError, match="upload error"):
+        NoopTrialController(iter(workload_manager)).run()
+
+
+def test_async_checkpoint_upload_failure_without_terminate(tmp_path: pathlib.Path) -> None:
+    env = make_async_upload_env(1)
+    storage_manager = FailOnUploadStorageManager(str(tmp_path))
+
+    def make_workloads() -> workload.Stream:
+        # Training may end without a TERMINATE workload, e.g. if the controller raises.
+        yield workload.train_workload(1, num_batches=100), [], workload.ignore_workload_response
+        yield workload.checkpoint_workload(), [], workload.ignore_workload_response
+
+    workload_manager = layers.build_workload_manager(
+        env,
+        make_workloads(),
+        utils.make_default_rendezvous_info(),
+        storage_manager,
+        NoopTensorboardManager(),
+        NoopBatchMetricWriter(),
+    )
+
+    NoopTrialController(iter(workload_manager)).run()
+    with pytest.raises(ValueError, match="upload error"):
+        workload_manager.close()
+    # The failure is only reported once.
+    workload_manager.close()
+
+
+def test_background_tensorboard_sync(tmp_path: pathlib.Path) -> None:
+    hparams = {"global_batch_size": 64}
+    tensorboard_manager = BlockingTensorboardManager()
+    terminated = False
+
+    def terminate_response_func(_: workload.Response) -> None:
+        nonlocal terminated
+        # Terminating waits for every sync; the queued train step syncs were coalesced.
+        assert 1 <= tensorboard_manager.num_syncs <= 3
+        terminated = True
+
+    def make_workloads() -> workload.Stream:
+        # Steps complete while the first sync is still blocked.
+        for step_id in range(1, 4):
+            yield workload.train_workload(step_id), [], workload.ignore_workload_response
+        assert tensorboard_manager.num_syncs == 0
+        tensorboard_manager.allow_sync.set()
+        yield workload.terminate_workload(step_id=3), [], terminate_response_func
+
+    workload_manager = layers.build_workload_manager(
+        utils.make_default_env_context(hparams),
+        make_workloads(),
+        utils.make_default_rendezvous_info(),
+        NoopStorageManager(str(tmp_path)),
+        tensorboard_manager,
+        NoopBatchMetricWriter(),
+    )
+
+    NoopTrialController(iter(workload_manager)).run()
+    assert terminated
+
+
 def test_reject_nonscalar_searcher_metric() -> None:
     metric_name = "validation_error"
 
@@ -80,16 +80,18 @@ type Master struct {
 	trialLogger     *actor.Ref
 	trialLogBackend TrialLogBackend
 	hpImportance    *actor.Ref
+	modelDefs       *modelDefinitionCache
 }
 
 // New creates an instance of the Determined master.
 func New(version string, logStore *logger.LogBuffer, config *Config) *Master {
 	logger.SetLogrus(config.Log)
 	return &Master{
-		MasterID: uuid.New().String(),
-		Version:  version,
-		logs:     logStore,
-		config:   config,
+		MasterID:  uuid.New().String(),
+		Version:   version,
+		logs:      logStore,
+		config:    config,
+		modelDefs: newModelDefinitionCache(maxModelDefinitionCacheSize),
 	}
 }
 
@@ -792,6 +794,10 @@ func (m *Master) Run(ctx context.Context) error {
 	experimentsGroup.POST("", api.Route(m.postExperiment))
 	experimentsGroup.POST("/:experiment_id/kill", api.Route(m.postExperimentKill))
 
+	modelDefsGroup := m.echo.Group("/model_definitions", authFuncs...)
+	modelDefsGroup.HEAD("/:hash", m.headModelDefinition)
+	modelDefsGroup.PUT("/:hash", api.Route(m.putModelDefinition))
+
 	searcherGroup := m.echo.Group("/searcher", authFuncs...)
 	searcherGroup.POST("/preview", api.Route(m.getSearcherPreview))
 
@@ -812,6 +818,8 @@ func (m *Master) Run(ctx context.Context) error {
 	resourcesGroup.GET("/allocation/aggregated", m.getAggregatedResourceAllocation)
 
 	m.echo.POST("/trial_logs", api.Route(m.postTrialLogs))
+	m.echo.POST("/trial_profiler_metrics", api.Route(m.postTrialProfilerMetrics),
+		userService.ProcessTaskOrUserAuthentication)
 
 	m.echo.GET("/ws/trial/:experiment_id/:trial_id/:container_id",
 		api.WebSocketRoute(m.trialWebSocket))
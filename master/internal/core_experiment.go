@@ -355,6 +355,7 @@ type CreateExperimentParams struct {
 	ConfigBytes   string          `json:"experiment_config"`
 	Template      *string         `json:"template"`
 	ModelDef      archive.Archive `json:"model_definition"`
+	ModelDefHash  *string         `json:"model_definition_hash"`
 	ParentID      *int            `json:"parent_id"`
 	Archived      bool            `json:"archived"`
 	GitRemote     *string         `json:"git_remote"`
@@ -418,6 +419,11 @@ func (m *Master) parseCreateExperiment(params *CreateExperimentParams) (
 			return nil, false, nil, errors.Wrapf(
 				dbErr, "unable to find parent experiment %v", *params.ParentID)
 		}
+	} else if params.ModelDefHash != nil {
+		var ok bool
+		if modelBytes, ok = m.modelDefs.get(*params.ModelDefHash); !ok {
+			return nil, false, nil, errors.Wrap(errModelDefinitionNotFound, *params.ModelDefHash)
+		}
 	} else {
 		var compressErr error
 		modelBytes, compressErr = archive.ToTarGz(params.ModelDef)
@@ -447,7 +453,10 @@ func (m *Master) postExperiment(c echo.Context) (interface{}, error) {
 	}
 
 	dbExp, validateOnly, taskSpec, err := m.parseCreateExperiment(&params)
-	if err != nil {
+	switch {
+	case errors.Is(err, errModelDefinitionNotFound):
+		return nil, echo.NewHTTPError(http.StatusNotFound, err.Error())
+	case err != nil:
 		return nil, echo.NewHTTPError(
 			http.StatusBadRequest,
 			errors.Wrap(err, "invalid experiment"))
@@ -0,0 +1,170 @@
+package internal
+
+import (
+	"compress/gzip"
+	"container/list"
+	"crypto/sha256"
+	"encoding/hex"
+	"fmt"
+	"io"
+	"net/http"
+	"sync"
+
+	"github.com/labstack/echo/v4"
+	"github.com/pkg/errors"
+
+	"github.com/determined-ai/determined/master/internal/api"
+	"github.com/determined-ai/determined/master/pkg/archive"
+)
+
+const (
+	// maxModelDefinitionSize is the maximum size of an uncompressed model definition tarball.
+	maxModelDefinitionSize = 128 * 1024 * 1024
+	// maxModelDefinitionCacheSize is the maximum total size of the compressed model definitions
+	// that are kept in memory for experiments to be created from.
+	maxModelDefinitionCacheSize = 512 * 1024 * 1024
+)
+
+// errModelDefinitionNotFound is returned when an experiment is created from a model definition
+// hash that is not in the cache, e.g. because it was evicted, so that clients upload the model
+// definition again.
+var errModelDefinitionNotFound = errors.New("model definition was not uploaded or has expired")
+
+// modelDefinitionCache holds uploaded model definitions as gzipped tarballs, keyed by their
+// content hash (see modelDefinitionHash), until experiments are created from them. The least
+// recently used model definitions are evicted first once the cache is full.
+type modelDefinitionCache struct {
+	mu      sync.Mutex
+	maxSize int
+	size    int
+	lru     *list.List
+	entries map[string]*list.Element
+}
+
+type modelDefinitionCacheEntry struct {
+	hash  string
+	tarGz []byte
+}
+
+func newModelDefinitionCache(maxSize int) *modelDefinitionCache {
+	return &modelDefinitionCache{
+		maxSize: maxSize,
+		lru:     list.New(),
+		entries: map[string]*list.Element{},
+	}
+}
+
+func (c *modelDefinitionCache) get(hash string) ([]byte, bool) {
+	c.mu.Lock()
+	defer c.mu.Unlock()
+
+	elem, ok := c.entries[hash]
+	if !ok {
+		return nil, false
+	}
+	c.lru.MoveToFront(elem)
+	return elem.Value.(*modelDefinitionCacheEntry).tarGz, true
+}
+
+func (c *modelDefinitionCache) put(hash string, tarGz []byte) {
+	c.mu.Lock()
+	defer c.mu.Unlock()
+
+	if elem, ok := c.entries[hash]; ok {
+		c.lru.MoveToFront(elem)
+		return
+	}
+	c.entries[hash] = c.lru.PushFront(&modelDefinitionCacheEntry{hash: hash, tarGz: tarGz})
+	c.size += len(tarGz)
+
+	// Always keep the newest model definition, which an experiment is about to be created from.
+	for c.size > c.maxSize && c.lru.Len() > 1 {
+		entry := c.lru.Remove(c.lru.Back()).(*modelDefinitionCacheEntry)
+		delete(c.entries, entry.hash)
+		c.size -= len(entry.tarGz)
+	}
+}
+
+// readModelDefinition reads a gzipped tarball into an Archive and returns it along with its
+// content hash.
+func readModelDefinition(r io.Reader) (archive.Archive, string, error) {
+	gz, err := gzip.NewReader(r)
+	if err != nil {
+		return nil, "", err
+	}
+	defer gz.Close()
+
+	// The uncompressed tarball may be much larger than the request; read at most one byte more
+	// than the limit to detect tarballs which exceed it.
+	limited := &io.LimitedReader{R: gz, N: maxModelDefinitionSize + 1}
+	ar, err := archive.FromTar(limited)
+	if err != nil {
+		return nil, "", err
+	}
+	if limited.N == 0 {
+		return nil, "", errors.Errorf(
+			"model definition exceeds the maximum size of %d bytes", maxModelDefinitionSize)
+	}
+	return ar, modelDefinitionHash(ar), nil
+}
+
+// modelDefinitionHash returns the hex SHA-256 of a manifest with a record for every item of the
+// model definition: its path, type, mode, modification time, size and the SHA-256 of its content,
+// each followed by a NUL byte. Clients compute the same hash from cached digests of the files
+// they upload, so that they don't have to read unchanged files to find out whether the master
+// already has a model definition.
+func modelDefinitionHash(ar archive.Archive) string {
+	hash := sha256.New()
+	for _, item := range ar {
+		fmt.Fprintf(hash, "%s\x00%c\x00%d\x00%d\x00%d\x00%x\x00",
+			item.Path, item.Type, uint32(item.FileMode), item.ModifiedTime.Unix(),
+			len(item.Content), sha256.Sum256(item.Content))
+	}
+	return hex.EncodeToString(hash.Sum(nil))
+}
+
+// headModelDefinition reports whether a model definition with the given content hash has been
+// uploaded, so that clients can skip uploading it again.
+func (m *Master) headModelDefinition(c echo.Context) error {
+	args := struct {
+		Hash string `path:"hash"`
+	}{}
+	if err := api.BindArgs(&args, c); err != nil {
+		return err
+	}
+
+	if _, ok := m.modelDefs.get(args.Hash); !ok {
+		return echo.NewHTTPError(http.StatusNotFound)
+	}
+	return c.NoContent(http.StatusOK)
+}
+
+// putModelDefinition accepts a model definition streamed as a gzipped tarball. Experiments may
+// then be created from it by passing its hash as model_definition_hash instead of sending the
+// model definition itself.
+func (m *Master) putModelDefinition(c echo.Context) (interface{}, error) {
+	args := struct {
+		Hash string `path:"hash"`
+	}{}
+	if err := api.BindArgs(&args, c); err != nil {
+		return nil, err
+	}
+
+	ar, hash, err := readModelDefinition(c.Request().Body)
+	if err != nil {
+		return nil, echo.NewHTTPError(
+			http.StatusBadRequest, errors.Wrap(err, "invalid model definition").Error())
+	}
+	if hash != args.Hash {
+		return nil, echo.NewHTTPError(http.StatusBadRequest, errors.Errorf(
+			"model definition hash %s does not match its content (%s)", args.Hash, hash).Error())
+	}
+
+	// Store the model definition exactly as model definitions sent in JSON are stored.
+	tarGz, err := archive.ToTarGz(ar)
+	if err != nil {
+		return nil, errors.Wrap(err, "unable to compress model definition")
+	}
+	m.modelDefs.put(hash, tarGz)
+	return nil, nil
+}
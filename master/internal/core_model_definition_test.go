@@ -0,0 +1,74 @@
+package internal
+
+import (
+	"archive/tar"
+	"bytes"
+	"compress/gzip"
+	"crypto/sha256"
+	"encoding/hex"
+	"fmt"
+	"testing"
+
+	"gotest.tools/assert"
+)
+
+func TestReadModelDefinition(t *testing.T) {
+	// Write a tarball the way other tools do, with a '/' at the end of directory names.
+	var tarball bytes.Buffer
+	w := tar.NewWriter(&tarball)
+	assert.NilError(t, w.WriteHeader(&tar.Header{Typeflag: tar.TypeDir, Name: "dir/", Mode: 0755}))
+	content := []byte("print('a')")
+	assert.NilError(t, w.WriteHeader(&tar.Header{
+		Typeflag: tar.TypeReg, Name: "dir/a.py", Mode: 0644, Size: int64(len(content)),
+	}))
+	_, err := w.Write(content)
+	assert.NilError(t, err)
+	assert.NilError(t, w.Close())
+
+	// The manifest of the tarball: path, type, mode, mtime, size and content digest of each item.
+	emptyDigest := sha256.Sum256(nil)
+	contentDigest := sha256.Sum256(content)
+	manifest := fmt.Sprintf("dir\x005\x00493\x000\x000\x00%x\x00", emptyDigest) +
+		fmt.Sprintf("dir/a.py\x000\x00420\x000\x0010\x00%x\x00", contentDigest)
+	expectedHash := sha256.Sum256([]byte(manifest))
+
+	var tarGz bytes.Buffer
+	gz := gzip.NewWriter(&tarGz)
+	_, err = gz.Write(tarball.Bytes())
+	assert.NilError(t, err)
+	assert.NilError(t, gz.Close())
+
+	ar, hash, err := readModelDefinition(&tarGz)
+	assert.NilError(t, err)
+	assert.Equal(t, hash, hex.EncodeToString(expectedHash[:]))
+	assert.Equal(t, len(ar), 2)
+	assert.Equal(t, ar[0].Path, "dir")
+	assert.Assert(t, ar[0].IsDir())
+	assert.DeepEqual(t, []byte(ar[1].Content), content)
+
+	_, _, err = readModelDefinition(bytes.NewReader(tarball.Bytes()))
+	assert.ErrorContains(t, err, "gzip")
+}
+
+func TestModelDefinitionCache(t *testing.T) {
+	cache := newModelDefinitionCache(10)
+	cache.put("a", []byte("aaaa"))
+	cache.put("b", []byte("bbbb"))
+	_, ok := cache.get("a")
+	assert.Assert(t, ok)
+
+	// "b" is the least recently used model definition.
+	cache.put("c", []byte("cccc"))
+	_, ok = cache.get("b")
+	assert.Assert(t, !ok)
+	tarGz, ok := cache.get("a")
+	assert.Assert(t, ok)
+	assert.DeepEqual(t, tarGz, []byte("aaaa"))
+
+	// The newest model definition is kept even if it is larger than the cache.
+	cache.put("d", make([]byte, 20))
+	_, ok = cache.get("d")
+	assert.Assert(t, ok)
+	assert.Equal(t, cache.lru.Len(), 1)
+	assert.Equal(t, cache.size, 20)
+}
@@ -0,0 +1,116 @@
+package internal
+
+import (
+	"compress/gzip"
+	"encoding/binary"
+	"encoding/json"
+	"io"
+	"math"
+	"net/http"
+	"time"
+
+	"github.com/labstack/echo/v4"
+	"github.com/pkg/errors"
+	"google.golang.org/protobuf/encoding/protojson"
+	"google.golang.org/protobuf/types/known/timestamppb"
+
+	"github.com/determined-ai/determined/proto/pkg/apiv1"
+	"github.com/determined-ai/determined/proto/pkg/trialv1"
+)
+
+// maxProfilerMetricsSize is the maximum size of a posted profiler metrics body, both as sent and
+// after decompression. It matches the maximum gRPC message size.
+const maxProfilerMetricsSize = 1 << 26
+
+// columnarProfilerMetricsSeries is one series of trial profiler metrics in the columnar format
+// posted by the harness. Timestamps are a base in nanoseconds since the epoch plus little-endian
+// int64 deltas (the first delta is relative to the base); batches are little-endian int32s and
+// values are little-endian float32s. Each column is base64-encoded in the JSON body, which
+// encoding/json decodes into the byte slices.
+type columnarProfilerMetricsSeries struct {
+	Labels          json.RawMessage `json:"labels"`
+	TimestampBase   int64           `json:"timestamp_base"`
+	TimestampDeltas []byte          `json:"timestamp_deltas"`
+	Batches         []byte          `json:"batches"`
+	Values          []byte          `json:"values"`
+}
+
+func (s columnarProfilerMetricsSeries) toProto() (*trialv1.TrialProfilerMetricsBatch, error) {
+	n := len(s.Values) / 4
+	if len(s.Values) != 4*n || len(s.Batches) != 4*n || len(s.TimestampDeltas) != 8*n {
+		return nil, errors.New("values, batches and timestamp_deltas should be equal sized arrays")
+	}
+
+	labels := &trialv1.TrialProfilerMetricLabels{}
+	if err := protojson.Unmarshal(s.Labels, labels); err != nil {
+		return nil, errors.Wrap(err, "failed to unmarshal labels")
+	}
+
+	batch := &trialv1.TrialProfilerMetricsBatch{
+		Values:     make([]float32, n),
+		Batches:    make([]int32, n),
+		Timestamps: make([]*timestamppb.Timestamp, n),
+		Labels:     labels,
+	}
+	ts := s.TimestampBase
+	for i := 0; i < n; i++ {
+		batch.Values[i] = math.Float32frombits(binary.LittleEndian.Uint32(s.Values[4*i:]))
+		batch.Batches[i] = int32(binary.LittleEndian.Uint32(s.Batches[4*i:]))
+		ts += int64(binary.LittleEndian.Uint64(s.TimestampDeltas[8*i:]))
+		batch.Timestamps[i] = timestamppb.New(time.Unix(0, ts))
+	}
+	return batch, nil
+}
+
+// readProfilerMetricsColumns decodes the series of a columnar profiler metrics body, which may be
+// gzip-compressed. Bodies larger than maxProfilerMetricsSize are rejected, before or after
+// decompression.
+func readProfilerMetricsColumns(
+	r io.Reader, compressed bool,
+) ([]columnarProfilerMetricsSeries, error) {
+	if compressed {
+		gz, err := gzip.NewReader(r)
+		if err != nil {
+			return nil, err
+		}
+		defer gz.Close()
+		r = gz
+	}
+
+	// Read at most one byte more than the limit to detect bodies which exceed it.
+	limited := &io.LimitedReader{R: r, N: maxProfilerMetricsSize + 1}
+	var series []columnarProfilerMetricsSeries
+	err := json.NewDecoder(limited).Decode(&series)
+	if limited.N == 0 {
+		return nil, errors.Errorf(
+			"profiler metrics exceed the maximum size of %d bytes", maxProfilerMetricsSize)
+	}
+	return series, err
+}
+
+// postTrialProfilerMetrics persists trial profiler metrics posted in the columnar format,
+// optionally gzip-compressed. It is equivalent to the PostTrialProfilerMetricsBatch API with every
+// series of a flush sent in a single, much smaller request.
+func (m *Master) postTrialProfilerMetrics(c echo.Context) (interface{}, error) {
+	body := http.MaxBytesReader(c.Response(), c.Request().Body, maxProfilerMetricsSize)
+	series, err := readProfilerMetricsColumns(
+		body, c.Request().Header.Get(echo.HeaderContentEncoding) == "gzip")
+	if err != nil {
+		return nil, echo.NewHTTPError(http.StatusBadRequest, err.Error())
+	}
+
+	req := &apiv1.PostTrialProfilerMetricsBatchRequest{}
+	for _, s := range series {
+		batch, err := s.toProto()
+		if err != nil {
+			return nil, echo.NewHTTPError(http.StatusBadRequest, err.Error())
+		}
+		req.Batches = append(req.Batches, batch)
+	}
+
+	a := &apiServer{m: m}
+	if _, err := a.PostTrialProfilerMetricsBatch(c.Request().Context(), req); err != nil {
+		return nil, err
+	}
+	return nil, nil
+}
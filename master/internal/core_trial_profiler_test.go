@@ -0,0 +1,74 @@
+package internal
+
+import (
+	"bytes"
+	"compress/gzip"
+	"encoding/json"
+	"strings"
+	"testing"
+	"time"
+
+	"gotest.tools/assert"
+
+	"github.com/determined-ai/determined/proto/pkg/trialv1"
+)
+
+func TestColumnarProfilerMetricsSeriesToProto(t *testing.T) {
+	// Encoded by determined.common.api.profiler.encode_trial_profiler_metrics_columns.
+	raw := `[{
+		"labels": {"trialId": "1", "name": "x", "agentId": "a", "gpuUuid": "",
+		           "metricType": "PROFILER_METRIC_TYPE_TIMING"},
+		"timestamp_base": 1634567890123456789,
+		"timestamp_deltas": "AAAAAAAAAAAA4fUFAAAAANPh9QUAAAAA",
+		"batches": "AQAAAAIAAAADAAAA",
+		"values": "AAAAPwAAoD8AAEBA"
+	}]`
+	var series []columnarProfilerMetricsSeries
+	assert.NilError(t, json.Unmarshal([]byte(raw), &series))
+	assert.Equal(t, len(series), 1)
+
+	batch, err := series[0].toProto()
+	assert.NilError(t, err)
+	assert.DeepEqual(t, batch.Values, []float32{0.5, 1.25, 3})
+	assert.DeepEqual(t, batch.Batches, []int32{1, 2, 3})
+	assert.Equal(t, len(batch.Timestamps), 3)
+	assert.Assert(t, batch.Timestamps[0].AsTime().Equal(time.Unix(0, 1634567890123456789)))
+	assert.Assert(t, batch.Timestamps[1].AsTime().Equal(time.Unix(0, 1634567890223456789)))
+	assert.Assert(t, batch.Timestamps[2].AsTime().Equal(time.Unix(0, 1634567890323457000)))
+	assert.Equal(t, batch.Labels.TrialId, int32(1))
+	assert.Equal(t, batch.Labels.MetricType,
+		trialv1.TrialProfilerMetricLabels_PROFILER_METRIC_TYPE_TIMING)
+
+	series[0].Batches = series[0].Batches[:4]
+	_, err = series[0].toProto()
+	assert.ErrorContains(t, err, "equal sized arrays")
+}
+
+func TestReadProfilerMetricsColumns(t *testing.T) {
+	raw := `[{"labels": {}, "timestamp_base": 0, "timestamp_deltas": "", "batches": "",
+		"values": ""}]`
+	series, err := readProfilerMetricsColumns(strings.NewReader(raw), false)
+	assert.NilError(t, err)
+	assert.Equal(t, len(series), 1)
+
+	var compressed bytes.Buffer
+	gz := gzip.NewWriter(&compressed)
+	_, err = gz.Write([]byte(raw))
+	assert.NilError(t, err)
+	assert.NilError(t, gz.Close())
+	series, err = readProfilerMetricsColumns(&compressed, true)
+	assert.NilError(t, err)
+	assert.Equal(t, len(series), 1)
+
+	// A small gzipped body may decompress to far more than the limit.
+	compressed.Reset()
+	gz = gzip.NewWriter(&compressed)
+	_, err = gz.Write([]byte(`[{"labels": {}, "values": "`))
+	assert.NilError(t, err)
+	_, err = gz.Write(bytes.Repeat([]byte("A"), maxProfilerMetricsSize))
+	assert.NilError(t, err)
+	assert.NilError(t, gz.Close())
+	assert.Assert(t, compressed.Len() < maxProfilerMetricsSize/100)
+	_, err = readProfilerMetricsColumns(&compressed, true)
+	assert.ErrorContains(t, err, "maximum size")
+}
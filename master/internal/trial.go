@@ -1197,6 +1197,8 @@ func (t *trial) terminated(ctx *actor.Context) {
 	switch {
 	case status.Failure == nil:
 		ctx.Log().Info("trial runner stopped successfully")
+		// The trial runner only exits successfully after its checkpoints are uploaded.
+		t.sequencer.AllCheckpointsUploaded()
 		return
 	case terminationSent:
 		ctx.Log().WithField("failure", status.Failure).Info(
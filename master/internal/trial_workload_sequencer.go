@@ -7,6 +7,7 @@ import (
 
 	"github.com/determined-ai/determined/master/pkg/workload"
 
+	"github.com/google/uuid"
 	"github.com/pkg/errors"
 
 	"github.com/determined-ai/determined/master/pkg/model"
@@ -32,6 +33,9 @@ type (
 
 		LatestCheckpoint *model.Checkpoint            `json:"latest_checkpoint"`
 		LatestSnapshot   *trialWorkloadSequencerState `json:"latest_snapshot"`
+		// PendingSnapshots are the snapshots taken at checkpoints which are still being uploaded,
+		// oldest first. Each replaces LatestSnapshot once its checkpoint is reported as uploaded.
+		PendingSnapshots []*trialWorkloadSequencerState `json:"pending_snapshots"`
 	}
 
 	// trialWorkloadSequencer manages transforming the work requested by the searcher into Workloads
@@ -141,6 +145,8 @@ func (s *trialWorkloadSequencer) WorkloadCompleted(
 		}
 	}
 
+	s.checkpointsUploaded(msg.UploadedCheckpoints)
+
 	switch msg.Workload.Kind {
 	case workload.RunStep:
 		s.runStepCompleted(msg)
@@ -232,11 +238,43 @@ func (s *trialWorkloadSequencer) computeValidationMetricsCompleted(
 // checkpointModelCompleted updates the internal state of the sequencer to account for a completed
 // CHECKPOINT_MODEL workload.
 func (s *trialWorkloadSequencer) checkpointModelCompleted(msg workload.CompletedMessage) {
-	defer s.snapshotState()
 	checkpoint := checkpointFromCheckpointMetrics(*msg.CheckpointMetrics)
 	s.BatchesSinceLastCkpt = 0
 	s.NeedPostValidationCkpt = false
 	s.LatestCheckpoint = &checkpoint
+	if msg.CheckpointUploadPending {
+		s.PendingSnapshots = append(s.PendingSnapshots, s.stateSnapshot())
+		return
+	}
+	// A checkpoint that is already uploaded supersedes the older ones still being uploaded.
+	s.PendingSnapshots = nil
+	s.snapshotState()
+}
+
+// checkpointsUploaded moves the snapshot of the newest of the given checkpoints which is still
+// pending, if any, to LatestSnapshot, along with the snapshots of older checkpoints. Uploads finish
+// in the order their checkpoints were taken.
+func (s *trialWorkloadSequencer) checkpointsUploaded(uuids []uuid.UUID) {
+	uploaded := map[string]bool{}
+	for _, id := range uuids {
+		uploaded[id.String()] = true
+	}
+	for i := len(s.PendingSnapshots) - 1; i >= 0; i-- {
+		if uploaded[*s.PendingSnapshots[i].LatestCheckpoint.UUID] {
+			s.LatestSnapshot = s.PendingSnapshots[i]
+			s.PendingSnapshots = s.PendingSnapshots[i+1:]
+			return
+		}
+	}
+}
+
+// AllCheckpointsUploaded marks every checkpoint as uploaded, e.g. once the trial has exited
+// successfully, which it only does after its background uploads have finished.
+func (s *trialWorkloadSequencer) AllCheckpointsUploaded() {
+	if n := len(s.PendingSnapshots); n > 0 {
+		s.LatestSnapshot = s.PendingSnapshots[n-1]
+		s.PendingSnapshots = nil
+	}
 }
 
 // Workload introspects the current state of the trialWorkloadSequencer, without altering it, and
@@ -313,8 +351,19 @@ func (s trialWorkloadSequencer) TerminateWorkload() *workload.Workload {
 // snapshotState sets the current state to the latest snapshot and clears out the previous snapshot
 // to reduce memory usage (we'll only ever restore to the latest one.
 func (s *trialWorkloadSequencer) snapshotState() {
-	s.LatestSnapshot = s.trialWorkloadSequencerState.deepCopy()
-	s.LatestSnapshot.LatestSnapshot = nil
+	// Until the latest checkpoint is uploaded, update its pending snapshot instead.
+	if n := len(s.PendingSnapshots); n > 0 {
+		s.PendingSnapshots[n-1] = s.stateSnapshot()
+		return
+	}
+	s.LatestSnapshot = s.stateSnapshot()
+}
+
+func (s *trialWorkloadSequencer) stateSnapshot() *trialWorkloadSequencerState {
+	snapshot := s.trialWorkloadSequencerState.deepCopy()
+	snapshot.LatestSnapshot = nil
+	snapshot.PendingSnapshots = nil
+	return snapshot
 }
 
 // RollBackSequencer rolls back the sequencer to the latest checkpoint and sets the latest
@@ -339,6 +339,81 @@ func TestTrialWorkloadSequencerFailedWorkloads(t *testing.T) {
 	assert.Equal(t, immediateExit, true, "should have been exiting early, immediately")
 }
 
+func TestTrialWorkloadSequencerPendingCheckpointUploads(t *testing.T) {
+	expConfig, err := defaultExperimentConfig()
+	assert.NilError(t, err)
+
+	rand := nprand.New(0)
+	create := searcher.NewCreate(rand, map[string]interface{}{
+		model.GlobalBatchSize: 64,
+	}, model.TrialWorkloadSequencerType)
+
+	s := newTrialWorkloadSequencer(1, expConfig, create, nil)
+	s.SetTrialID(1)
+	s.OperationRequested(
+		searcher.NewValidateAfter(create.RequestID, expconf.NewLength(expconf.Batches, 500)))
+
+	schedulingUnit := expConfig.SchedulingUnit()
+	train := func(stepID int) workload.CompletedMessage {
+		return workload.CompletedMessage{Workload: workload.Workload{
+			Kind:                  workload.RunStep,
+			ExperimentID:          1,
+			TrialID:               1,
+			StepID:                stepID,
+			NumBatches:            schedulingUnit,
+			PriorBatchesProcessed: (stepID - 1) * schedulingUnit,
+		}}
+	}
+	checkpoint := func(id uuid.UUID) workload.CompletedMessage {
+		return workload.CompletedMessage{
+			Workload: workload.Workload{
+				Kind:                  workload.CheckpointModel,
+				ExperimentID:          1,
+				TrialID:               1,
+				StepID:                1,
+				PriorBatchesProcessed: schedulingUnit,
+			},
+			CheckpointMetrics:       &workload.CheckpointMetrics{UUID: id},
+			CheckpointUploadPending: true,
+		}
+	}
+	complete := func(msg workload.CompletedMessage) {
+		_, err := s.WorkloadCompleted(msg, nil)
+		assert.NilError(t, err)
+	}
+
+	// A trial is not restored from a checkpoint until its upload is reported to be done.
+	first := uuid.New()
+	complete(train(1))
+	complete(checkpoint(first))
+	complete(train(2))
+	totalBatches, err := s.RollBackSequencer()
+	assert.NilError(t, err)
+	assert.Equal(t, totalBatches, 0)
+	assert.Assert(t, s.LatestCheckpoint == nil)
+
+	second := uuid.New()
+	complete(train(1))
+	complete(checkpoint(second))
+	msg := train(2)
+	msg.UploadedCheckpoints = []uuid.UUID{second}
+	complete(msg)
+	totalBatches, err = s.RollBackSequencer()
+	assert.NilError(t, err)
+	assert.Equal(t, totalBatches, schedulingUnit)
+	assert.Equal(t, *s.LatestCheckpoint.UUID, second.String())
+
+	// A successful exit means that every checkpoint was uploaded.
+	third := uuid.New()
+	complete(train(2))
+	complete(checkpoint(third))
+	s.AllCheckpointsUploaded()
+	totalBatches, err = s.RollBackSequencer()
+	assert.NilError(t, err)
+	assert.Equal(t, totalBatches, 2*schedulingUnit)
+	assert.Equal(t, *s.LatestCheckpoint.UUID, third.String())
+}
+
 func TestTrialWorkloadSequencerOperationLessThanBatchSize(t *testing.T) {
 	expConfig, err := defaultExperimentConfig()
 	assert.NilError(t, err)
@@ -19,6 +19,9 @@ import (
 	"github.com/determined-ai/determined/master/pkg/model"
 )
 
+// taskTokenHeader is the header in which tasks send their token, as gRPC gateway metadata.
+const taskTokenHeader = "Grpc-Metadata-X-Task-Token"
+
 type agentUserGroup struct {
 	UID   *int   `json:"uid,omitempty"`
 	GID   *int   `json:"gid,omitempty"`
@@ -100,6 +103,31 @@ func (s *Service) ProcessAuthentication(next echo.HandlerFunc) echo.HandlerFunc
 	}
 }
 
+// ProcessTaskOrUserAuthentication is a middleware processing function like ProcessAuthentication,
+// except that it also accepts the task token which tasks use to authenticate to the gRPC API, for
+// HTTP endpoints that tasks call.
+func (s *Service) ProcessTaskOrUserAuthentication(next echo.HandlerFunc) echo.HandlerFunc {
+	processUser := s.ProcessAuthentication(next)
+	return func(c echo.Context) error {
+		authRaw := c.Request().Header.Get(taskTokenHeader)
+		if authRaw == "" {
+			return processUser(c)
+		}
+		if !strings.HasPrefix(authRaw, "Bearer ") {
+			return echo.ErrUnauthorized
+		}
+
+		switch _, err := s.db.TaskSessionByToken(strings.TrimPrefix(authRaw, "Bearer ")); err {
+		case nil:
+			return next(c)
+		case db.ErrNotFound:
+			return echo.NewHTTPError(http.StatusUnauthorized)
+		default:
+			return err
+		}
+	}
+}
+
 func (s *Service) postLogout(c echo.Context) (interface{}, error) {
 	// Delete the cookie if one is set.
 	if cookie, err := c.Cookie("auth"); err == nil {
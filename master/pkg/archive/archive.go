@@ -10,6 +10,7 @@ import (
 	"io/ioutil"
 	"os"
 	"path"
+	"strings"
 	"time"
 
 	"github.com/determined-ai/determined/master/pkg"
@@ -189,7 +190,12 @@ func FromTarGz(zippedTarfile []byte) (Archive, error) {
 		return nil, err
 	}
 
-	tarReader := tar.NewReader(gzipReader)
+	return FromTar(gzipReader)
+}
+
+// FromTar converts a tar stream to an Archive. It stops reading at the end of the archive.
+func FromTar(reader io.Reader) (Archive, error) {
+	tarReader := tar.NewReader(reader)
 
 	var ar Archive
 	for {
@@ -204,7 +210,8 @@ func FromTarGz(zippedTarfile []byte) (Archive, error) {
 		}
 
 		item := Item{
-			Path:     header.Name,
+			// Tarballs which were not written by Archive usually end directory names in a '/'.
+			Path:     strings.TrimSuffix(header.Name, "/"),
 			Type:     header.Typeflag,
 			FileMode: os.FileMode(header.Mode),
 			ModifiedTime: UnixTime{
@@ -203,6 +203,7 @@ type ResourcesConfigV0 struct {
 // OptimizationsConfigV0 is a legacy config value.
 type OptimizationsConfigV0 struct {
 	RawAggregationFrequency       *int    `json:"aggregation_frequency"`
+	RawAsyncCheckpointUploads     *int    `json:"async_checkpoint_uploads"`
 	RawAverageAggregatedGradients *bool   `json:"average_aggregated_gradients"`
 	RawAverageTrainingMetrics     *bool   `json:"average_training_metrics"`
 	RawGradientCompression        *bool   `json:"gradient_compression"`
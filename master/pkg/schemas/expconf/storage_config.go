@@ -131,6 +131,10 @@ type S3ConfigV0 struct {
 	RawAccessKey   *string `json:"access_key"`
 	RawSecretKey   *string `json:"secret_key"`
 	RawEndpointURL *string `json:"endpoint_url"`
+
+	RawMaxConcurrency     *int  `json:"max_concurrency"`
+	RawMultipartChunksize *int  `json:"multipart_chunksize"`
+	RawDeduplicate        *bool `json:"deduplicate"`
 }
 
 //go:generate ../gen.sh
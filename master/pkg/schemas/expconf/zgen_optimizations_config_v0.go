@@ -19,6 +19,17 @@ func (o *OptimizationsConfigV0) SetAggregationFrequency(val int) {
 	o.RawAggregationFrequency = &val
 }
 
+func (o OptimizationsConfigV0) AsyncCheckpointUploads() int {
+	if o.RawAsyncCheckpointUploads == nil {
+		panic("You must call WithDefaults on OptimizationsConfigV0 before .AsyncCheckpointUploads")
+	}
+	return *o.RawAsyncCheckpointUploads
+}
+
+func (o *OptimizationsConfigV0) SetAsyncCheckpointUploads(val int) {
+	o.RawAsyncCheckpointUploads = &val
+}
+
 func (o OptimizationsConfigV0) AverageAggregatedGradients() bool {
 	if o.RawAverageAggregatedGradients == nil {
 		panic("You must call WithDefaults on OptimizationsConfigV0 before .AverageAggregatedGradients")
@@ -38,6 +38,14 @@ func (p *ProfilingConfigV0) SetEndAfterBatch(val *int) {
 	p.RawEndAfterBatch = val
 }
 
+func (p ProfilingConfigV0) OutputDir() *string {
+	return p.RawOutputDir
+}
+
+func (p *ProfilingConfigV0) SetOutputDir(val *string) {
+	p.RawOutputDir = val
+}
+
 func (p ProfilingConfigV0) ParsedSchema() interface{} {
 	return schemas.ParsedProfilingConfigV0()
 }
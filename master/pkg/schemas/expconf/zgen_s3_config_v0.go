@@ -43,6 +43,33 @@ func (s *S3ConfigV0) SetEndpointURL(val *string) {
 	s.RawEndpointURL = val
 }
 
+func (s S3ConfigV0) MaxConcurrency() *int {
+	return s.RawMaxConcurrency
+}
+
+func (s *S3ConfigV0) SetMaxConcurrency(val *int) {
+	s.RawMaxConcurrency = val
+}
+
+func (s S3ConfigV0) MultipartChunksize() *int {
+	return s.RawMultipartChunksize
+}
+
+func (s *S3ConfigV0) SetMultipartChunksize(val *int) {
+	s.RawMultipartChunksize = val
+}
+
+func (s S3ConfigV0) Deduplicate() bool {
+	if s.RawDeduplicate == nil {
+		panic("You must call WithDefaults on S3ConfigV0 before .Deduplicate")
+	}
+	return *s.RawDeduplicate
+}
+
+func (s *S3ConfigV0) SetDeduplicate(val bool) {
+	s.RawDeduplicate = &val
+}
+
 func (s S3ConfigV0) ParsedSchema() interface{} {
 	return schemas.ParsedS3ConfigV0()
 }
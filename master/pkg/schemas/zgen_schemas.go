@@ -444,10 +444,13 @@ var (
         "container": true,
         "container_path": true,
         "credential": true,
+        "deduplicate": true,
         "endpoint_url": true,
         "hdfs_path": true,
         "hdfs_url": true,
         "host_path": true,
+        "max_concurrency": true,
+        "multipart_chunksize": true,
         "propagation": true,
         "secret_key": true,
         "storage_path": true,
@@ -1736,6 +1739,14 @@ var (
             "minimum": 1,
             "default": 1
         },
+        "async_checkpoint_uploads": {
+            "type": [
+                "integer",
+                "null"
+            ],
+            "minimum": 0,
+            "default": 0
+        },
         "auto_tune_tensor_fusion": {
             "type": [
                 "boolean",
@@ -1835,6 +1846,13 @@ var (
             ],
             "default": null,
             "minimum": 0
+        },
+        "output_dir": {
+            "type": [
+                "string",
+                "null"
+            ],
+            "default": null
         }
     },
     "compareProperties": {
@@ -2054,6 +2072,29 @@ var (
             ],
             "default": null
         },
+        "max_concurrency": {
+            "type": [
+                "integer",
+                "null"
+            ],
+            "default": null,
+            "minimum": 1
+        },
+        "multipart_chunksize": {
+            "type": [
+                "integer",
+                "null"
+            ],
+            "default": null,
+            "minimum": 5242880
+        },
+        "deduplicate": {
+            "type": [
+                "boolean",
+                "null"
+            ],
+            "default": false
+        },
         "save_experiment_best": {
             "type": [
                 "integer",
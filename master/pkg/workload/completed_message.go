@@ -23,6 +23,12 @@ type CompletedMessage struct {
 	CheckpointMetrics *CheckpointMetrics
 	ValidationMetrics *ValidationMetrics
 	RunMetrics        map[string]interface{}
+	// CheckpointUploadPending is set on checkpoints which are still being uploaded in the
+	// background; trials are not restored from them until their uploads are reported to be done.
+	CheckpointUploadPending bool `json:"checkpoint_upload_pending"`
+	// UploadedCheckpoints holds the UUIDs of the checkpoints whose background uploads finished
+	// since the previous message.
+	UploadedCheckpoints []uuid.UUID `json:"uploaded_checkpoints"`
 }
 
 // UnmarshalJSON unmarshals the provided bytes into a workload.CompletedMessage. An error is
@@ -455,13 +455,37 @@ def gen_python(schemas: List[Schema]) -> List[str]:
     lines.append("# This is a generated file.  Editing it will make you sad.")
     lines.append("")
     lines.append("import json")
+    lines.append("from typing import Any, Dict, Iterator, Mapping")
     lines.append("")
-    lines.append("schemas = {")
+    lines.append("_texts = {")
     for schema in schemas:
-        lines.append(f'    "{schema.url}": json.loads(')
-        lines.append(f'        r"""\n{schema.text}\n"""')
-        lines.append("    ),")
+        lines.append(f'    "{schema.url}": r"""')
+        lines.append(f'{schema.text}\n""",')
     lines.append("}")
+    lines.append("")
+    lines.append("")
+    lines.append("class _Schemas(Mapping[str, Any]):")
+    lines.append(
+        '    """Parses each schema when it is first looked up, not at import time."""'
+    )
+    lines.append("")
+    lines.append("    def __init__(self) -> None:")
+    lines.append("        self._parsed = {}  # type: Dict[str, Any]")
+    lines.append("")
+    lines.append("    def __getitem__(self, url: str) -> Any:")
+    lines.append("        schema = self._parsed.get(url)")
+    lines.append("        if schema is None:")
+    lines.append("            schema = self._parsed[url] = json.loads(_texts[url])")
+    lines.append("        return schema")
+    lines.append("")
+    lines.append("    def __iter__(self) -> Iterator[str]:")
+    lines.append("        return iter(_texts)")
+    lines.append("")
+    lines.append("    def __len__(self) -> int:")
+    lines.append("        return len(_texts)")
+    lines.append("")
+    lines.append("")
+    lines.append("schemas = _Schemas()")
 
     return lines
 